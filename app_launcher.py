@@ -0,0 +1,163 @@
+#!/usr/bin/env python3
+"""
+Lançador paralelo de aplicativos (usado pelo comando "trabalho").
+
+Todos os processos sobem de uma vez; apps que já estão abertos são pulados
+(tabela de processos em cache + lista de janelas do wmctrl) e o lançador
+acompanha o wmctrl até a janela de cada app aparecer, registrando o tempo.
+O workspace fica pronto no tempo do app mais lento, não na soma de todos.
+"""
+
+import os
+import time
+import shutil
+import logging
+import subprocess
+from dataclasses import dataclass
+from typing import Callable, Dict, List, Optional, Set
+
+logger = logging.getLogger("Launcher")
+
+PROCESS_TABLE_TTL = 2.0   # segundos de validade do cache de /proc
+WINDOW_POLL       = 0.2   # intervalo entre consultas ao wmctrl
+WINDOW_TIMEOUT    = 20.0  # desiste de esperar a janela depois disso
+
+
+@dataclass
+class App:
+    name: str
+    command: List[str]
+    window_class: str  # instância ou classe do WM_CLASS (coluna 3 do `wmctrl -lx`)
+    process: str       # nome em /proc/<pid>/comm (máx. 15 caracteres)
+
+
+WORK_APPS = [
+    App("Slack",     ["slack"],         "slack",         "slack"),
+    App("Spotify",   ["spotify"],       "spotify",       "spotify"),
+    App("Cursor",    ["cursor"],        "cursor",        "cursor"),
+    App("Navegador", ["google-chrome"], "google-chrome", "chrome"),
+]
+
+
+class ProcessTable:
+    """Snapshot de /proc/*/comm reaproveitado por alguns segundos"""
+
+    def __init__(self, ttl: float = PROCESS_TABLE_TTL):
+        self.ttl = ttl
+        self._names = set()
+        self._taken = 0.0
+
+    def names(self) -> set:
+        now = time.monotonic()
+        if now - self._taken > self.ttl:
+            names = set()
+            for pid in os.listdir("/proc"):
+                if not pid.isdigit():
+                    continue
+                try:
+                    with open(f"/proc/{pid}/comm") as f:
+                        names.add(f.read().strip().lower())
+                except OSError:
+                    continue
+            self._names, self._taken = names, now
+        return self._names
+
+    def running(self, process: str) -> bool:
+        return process.lower() in self.names()
+
+
+def split_wm_class(value: str) -> Set[str]:
+    """Instância e classe de um WM_CLASS do wmctrl ("slack.Slack"), em minúsculas
+
+    O wmctrl junta as duas partes com um ponto, mas cada parte pode ter
+    pontos ("web.whatsapp.com.Google-chrome", "org.gnome.Nautilus.Org.gnome.Nautilus"):
+    vale o ponto que separa duas metades iguais; senão, o último.
+    """
+    value = value.lower()
+    dots = [i for i, ch in enumerate(value) if ch == "."]
+    if not dots:
+        return {value} if value else set()
+    cut = next((i for i in dots if value[:i] == value[i + 1:]), dots[-1])
+    return {part for part in (value[:cut], value[cut + 1:]) if part}
+
+
+def parse_window_classes(output: str) -> Set[str]:
+    """Instâncias e classes do WM_CLASS de cada linha do `wmctrl -lx`
+
+    Só a terceira coluna conta: o título da janela ("Spotify – Web Player"
+    numa aba do navegador) não pode marcar um app como aberto. Linhas que não
+    começam com o id da janela (0x...) são ignoradas.
+    """
+    classes = set()
+    for line in output.splitlines():
+        fields = line.split(None, 4)
+        if len(fields) >= 3 and fields[0].startswith("0x") and fields[2] != "N/A":
+            classes |= split_wm_class(fields[2])
+    return classes
+
+
+def list_window_classes() -> Optional[Set[str]]:
+    """WM_CLASS das janelas abertas, em minúsculas (None se o wmctrl não existir)"""
+    if shutil.which("wmctrl") is None:
+        return None
+    result = subprocess.run(["wmctrl", "-lx"], capture_output=True, text=True)
+    return parse_window_classes(result.stdout) if result.returncode == 0 else None
+
+
+class AppLauncher:
+    """Abre vários apps em paralelo e informa quando cada janela aparece"""
+
+    def __init__(self, process_table: ProcessTable = None):
+        self.process_table = process_table or ProcessTable()
+
+    def is_running(self, app: App, windows: Optional[Set[str]]) -> bool:
+        if windows is not None and app.window_class in windows:
+            return True
+        return self.process_table.running(app.process)
+
+    def launch(self, apps: List[App], sleep: Callable[[float], bool] = None,
+               timeout: float = WINDOW_TIMEOUT) -> Dict[str, str]:
+        """Lança os apps e retorna {nome: status}
+
+        `sleep` deve retornar False para abortar a espera (ex.: executor.sleep).
+        """
+        sleep = sleep or (lambda s: time.sleep(s) or True)
+        windows = list_window_classes()
+        status: Dict[str, str] = {}
+        pending: Dict[str, App] = {}
+        t0 = time.monotonic()
+
+        for app in apps:
+            if self.is_running(app, windows):
+                status[app.name] = "já aberto"
+                logger.info(f"⏭️  {app.name} já está aberto")
+                continue
+            try:
+                subprocess.Popen(app.command, stdout=subprocess.DEVNULL,
+                                 stderr=subprocess.DEVNULL, start_new_session=True)
+                status[app.name] = "lançado"
+                pending[app.name] = app
+                logger.info(f"🚀 Abrindo {app.name}...")
+            except Exception as e:
+                status[app.name] = "falhou"
+                logger.warning(f"⚠️  Erro ao abrir {app.name}: {e}")
+
+        if windows is None:
+            if pending:
+                logger.info("💡 wmctrl não encontrado, sem acompanhamento de janelas")
+            return status
+
+        while pending and time.monotonic() - t0 < timeout:
+            if not sleep(WINDOW_POLL):
+                break
+            windows = list_window_classes() or set()
+            for name, app in list(pending.items()):
+                if app.window_class in windows:
+                    status[name] = "pronto"
+                    del pending[name]
+                    logger.info(f"🪟 {name} pronto em {time.monotonic() - t0:.1f}s")
+
+        for name in pending:
+            status[name] = "sem janela"
+            logger.warning(f"⌛ Janela do {name} não apareceu em {timeout:.0f}s")
+        return status
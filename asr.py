@@ -0,0 +1,296 @@
+#!/usr/bin/env python3
+"""
+Backends de reconhecimento de fala (ASR) intercambiáveis.
+
+Engines disponíveis:
+  - whisper         → openai-whisper (PyTorch)
+  - faster-whisper  → CTranslate2 com quantização int8 na CPU
+  - vosk            → Kaldi/Vosk (o mesmo do jarvis_test_only.py)
+
+Seleção pela configuração (.jarvis_config / variáveis de ambiente):
+  JARVIS_ASR_BACKEND   nome do backend (padrão: whisper)
+  JARVIS_ASR_MODEL     modelo/tamanho (padrão: base)
+  JARVIS_ASR_THREADS   threads de CPU (padrão: 0 = automático)
+  JARVIS_VOSK_MODEL    diretório do modelo Vosk
+"""
+
+import os
+import json
+import logging
+from dataclasses import dataclass
+from typing import List, Sequence
+import numpy as np
+
+logger = logging.getLogger("ASR")
+
+DEFAULT_BACKEND  = "whisper"
+DEFAULT_MODEL    = "base"
+DEFAULT_LANGUAGE = "pt"
+VOSK_MODEL_PATH  = os.path.expanduser("~/vosk-models/vosk-model-small-pt-0.3")
+
+
+@dataclass
+class ASRResult:
+    text: str
+    no_speech_prob: float = 0.0
+    confidence: float = 1.0
+
+
+def normalize_text(text: str) -> str:
+    """Minúsculas, sem pontuação e sem espaços nas pontas"""
+    text = text.strip().lower()
+    for ch in ".,!?;:":
+        text = text.replace(ch, "")
+    return text
+
+
+class ASRBackend:
+    """Interface comum dos engines de reconhecimento"""
+
+    name = "base"
+
+    def __init__(self, model: str = DEFAULT_MODEL, language: str = DEFAULT_LANGUAGE,
+                 threads: int = 0, sample_rate: int = 16000):
+        self.model_name  = model
+        self.language    = language
+        self.threads     = threads
+        self.sample_rate = sample_rate
+
+    def load(self):
+        """Carrega o modelo (pode ser lento; chamado uma única vez)"""
+        raise NotImplementedError
+
+    def transcribe(self, audio_float32: np.ndarray) -> ASRResult:
+        """Transcreve áudio mono float32 em [-1, 1] na taxa self.sample_rate"""
+        raise NotImplementedError
+
+    def transcribe_batch(self, audios: Sequence[np.ndarray], batch_size: int = 16) -> List[ASRResult]:
+        """Transcreve vários clipes (padrão: um de cada vez; engines podem agrupar)"""
+        return [self.transcribe(audio) for audio in audios]
+
+    def describe(self) -> str:
+        return f"{self.name} ({self.model_name})"
+
+    def close(self):
+        """Libera recursos do engine (no-op para engines em processo)"""
+
+
+class WhisperBackend(ASRBackend):
+    """openai-whisper rodando em PyTorch"""
+
+    name = "whisper"
+
+    def load(self):
+        import whisper
+        if self.threads:
+            import torch
+            torch.set_num_threads(self.threads)
+        self.model = whisper.load_model(self.model_name)
+
+    def transcribe(self, audio_float32: np.ndarray) -> ASRResult:
+        result = self.model.transcribe(
+            audio_float32,
+            language=self.language,
+            fp16=False,
+            no_speech_threshold=0.6,
+            condition_on_previous_text=False,
+            temperature=0.0
+        )
+        segments = result.get("segments", [])
+        no_speech = segments[0].get("no_speech_prob", 0.0) if segments else 0.0
+        return ASRResult(result.get("text", ""), no_speech_prob=no_speech)
+
+    def transcribe_batch(self, audios: Sequence[np.ndarray], batch_size: int = 16) -> List[ASRResult]:
+        """Clipes curtos (< 30 s) em lotes: um log-mel e um decode por lote"""
+        import whisper
+        options = whisper.DecodingOptions(language=self.language, fp16=False, temperature=0.0,
+                                          without_timestamps=True)
+        n_mels = self.model.dims.n_mels
+        results = []
+        for i in range(0, len(audios), batch_size):
+            mel = log_mel_batch(audios[i:i + batch_size], n_mels).to(self.model.device)
+            for decoded in whisper.decode(self.model, mel, options):
+                results.append(ASRResult(decoded.text, no_speech_prob=decoded.no_speech_prob))
+        return results
+
+
+def log_mel_batch(audios: Sequence[np.ndarray], n_mels: int = 80):
+    """Front end do Whisper para um lote: cada clipe preenchido a 30 s, uma STFT para todos
+
+    Igual ao whisper.log_mel_spectrogram(pad_or_trim(clipe)), mas com o piso
+    de -8 dB calculado por clipe, não sobre o lote inteiro.
+    """
+    import torch
+    from whisper.audio import N_FFT, N_SAMPLES, HOP_LENGTH, mel_filters
+
+    batch = np.zeros((len(audios), N_SAMPLES), dtype=np.float32)
+    for i, audio in enumerate(audios):
+        audio = audio[:N_SAMPLES]
+        batch[i, :len(audio)] = audio
+    x = torch.from_numpy(batch)
+    stft = torch.stft(x, N_FFT, HOP_LENGTH, window=torch.hann_window(N_FFT), return_complex=True)
+    magnitudes = stft[..., :-1].abs() ** 2
+    log_spec = torch.clamp(mel_filters(x.device, n_mels) @ magnitudes, min=1e-10).log10()
+    peak = log_spec.amax(dim=(1, 2), keepdim=True)
+    log_spec = torch.maximum(log_spec, peak - 8.0)
+    return (log_spec + 4.0) / 4.0
+
+
+class FasterWhisperBackend(ASRBackend):
+    """faster-whisper (CTranslate2) quantizado em int8 para CPU"""
+
+    name = "faster-whisper"
+
+    def __init__(self, *args, compute_type: str = "int8", **kwargs):
+        super().__init__(*args, **kwargs)
+        self.compute_type = compute_type
+
+    def load(self):
+        from faster_whisper import WhisperModel
+        self.model = WhisperModel(
+            self.model_name,
+            device="cpu",
+            compute_type=self.compute_type,
+            cpu_threads=self.threads
+        )
+
+    def transcribe(self, audio_float32: np.ndarray) -> ASRResult:
+        segments, _info = self.model.transcribe(
+            audio_float32,
+            language=self.language,
+            beam_size=1,
+            temperature=0.0,
+            condition_on_previous_text=False,
+            without_timestamps=True
+        )
+        segments = list(segments)
+        text = " ".join(s.text.strip() for s in segments)
+        no_speech = segments[0].no_speech_prob if segments else 1.0
+        confidence = float(np.exp(np.mean([s.avg_logprob for s in segments]))) if segments else 0.0
+        return ASRResult(text, no_speech_prob=no_speech, confidence=confidence)
+
+    def describe(self) -> str:
+        return f"{self.name} ({self.model_name}, {self.compute_type})"
+
+
+def _word_confidence(result: dict) -> float:
+    """Média das confianças por palavra de um Result()/FinalResult() com SetWords"""
+    words = result.get("result", [])
+    return float(np.mean([w.get("conf", 0.0) for w in words])) if words else 0.0
+
+
+class VoskStream:
+    """Reconhecimento incremental: alimenta blocos e devolve a hipótese parcial
+
+    Só os resultados finais de cada trecho (Result/FinalResult) trazem
+    confiança por palavra; hipóteses parciais ficam com confiança 0. Uma
+    parcial com "[unk]" (fala fora da gramática) zera a hipótese.
+    """
+
+    def __init__(self, recognizer):
+        self.recognizer = recognizer
+        self.recognizer.SetWords(True)
+        self.text = ""
+        self.confidence = 0.0
+
+    def _update(self, text: str, confidence: float):
+        if "[unk]" in text:
+            self.text, self.confidence = "", 0.0
+            return
+        text = text.strip()
+        if text:
+            self.text, self.confidence = text, confidence
+
+    def feed(self, pcm_int16: np.ndarray) -> str:
+        """Consome um bloco int16 e retorna a melhor hipótese até agora"""
+        if self.recognizer.AcceptWaveform(pcm_int16.tobytes()):
+            result = json.loads(self.recognizer.Result())
+            self._update(result.get("text", ""), _word_confidence(result))
+        else:
+            self._update(json.loads(self.recognizer.PartialResult()).get("partial", ""), 0.0)
+        return self.text
+
+    def finish(self) -> ASRResult:
+        """Fecha o reconhecimento do áudio já alimentado (sem decodificar de novo)"""
+        result = json.loads(self.recognizer.FinalResult())
+        self._update(result.get("text", ""), _word_confidence(result))
+        return ASRResult(self.text, confidence=self.confidence)
+
+
+class VoskBackend(ASRBackend):
+    """Vosk/Kaldi — leve e rápido, menos preciso que o Whisper"""
+
+    name = "vosk"
+
+    def __init__(self, *args, model_path: str = None, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.model_path = model_path or os.getenv("JARVIS_VOSK_MODEL", VOSK_MODEL_PATH)
+        self.model_name = os.path.basename(self.model_path)
+
+    def load(self):
+        import vosk
+        if not os.path.exists(self.model_path):
+            raise Exception(f"Modelo Vosk não encontrado: {self.model_path}")
+        vosk.SetLogLevel(-1)
+        self.vosk = vosk
+        self.model = vosk.Model(self.model_path)
+
+    def _make_recognizer(self):
+        return self.vosk.KaldiRecognizer(self.model, self.sample_rate)
+
+    def stream(self) -> VoskStream:
+        """Abre um reconhecimento incremental (PartialResult) para um comando"""
+        return VoskStream(self._make_recognizer())
+
+    def transcribe(self, audio_float32: np.ndarray) -> ASRResult:
+        recognizer = self._make_recognizer()
+        recognizer.SetWords(True)
+        pcm = (np.clip(audio_float32, -1.0, 1.0) * 32767).astype(np.int16)
+        recognizer.AcceptWaveform(pcm.tobytes())
+        result = json.loads(recognizer.FinalResult())
+        return ASRResult(result.get("text", ""), confidence=_word_confidence(result))
+
+
+class VoskGrammarBackend(VoskBackend):
+    """Vosk restrito a uma lista fechada de frases (caminho rápido dos comandos)
+
+    O decodificador só considera as frases informadas mais "[unk]", então
+    reconhecer um comando curto leva poucos milissegundos. Falas fora da
+    gramática saem como "[unk]" ou com confiança baixa.
+    """
+
+    name = "vosk-grammar"
+
+    def __init__(self, *args, phrases=(), **kwargs):
+        super().__init__(*args, **kwargs)
+        self.set_phrases(phrases)
+
+    def set_phrases(self, phrases):
+        self.phrases = sorted(set(phrases))
+        self._grammar = json.dumps(self.phrases + ["[unk]"], ensure_ascii=False)
+
+    def _make_recognizer(self):
+        return self.vosk.KaldiRecognizer(self.model, self.sample_rate, self._grammar)
+
+    def transcribe(self, audio_float32: np.ndarray) -> ASRResult:
+        result = super().transcribe(audio_float32)
+        if "[unk]" in result.text:
+            return ASRResult(result.text.replace("[unk]", "").strip(), confidence=0.0)
+        return result
+
+
+BACKENDS = {
+    WhisperBackend.name: WhisperBackend,
+    FasterWhisperBackend.name: FasterWhisperBackend,
+    VoskBackend.name: VoskBackend,
+}
+
+
+def create_backend(name: str = None, **options) -> ASRBackend:
+    """Instancia o backend pelo nome (ou pela configuração do ambiente)"""
+    name = (name or os.getenv("JARVIS_ASR_BACKEND", DEFAULT_BACKEND)).lower()
+    if name not in BACKENDS:
+        raise ValueError(f"Backend ASR desconhecido: '{name}' (opções: {', '.join(BACKENDS)})")
+    options.setdefault("model", os.getenv("JARVIS_ASR_MODEL", DEFAULT_MODEL))
+    options.setdefault("threads", int(os.getenv("JARVIS_ASR_THREADS", "0")))
+    return BACKENDS[name](**options)
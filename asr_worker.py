@@ -0,0 +1,187 @@
+#!/usr/bin/env python3
+"""
+Processo dedicado de ASR com modelo sempre carregado.
+
+A inferência roda fora do processo principal, então picos de CPU do Whisper
+não disputam o GIL com o callback de áudio, a hotword, os gestos e o Tk.
+O áudio vai por memória compartilhada (sem serializar o array) e a fila leva
+apenas (id, número de amostras).
+
+Configuração (.jarvis_config / variáveis de ambiente):
+  JARVIS_ASR_WORKER   1 = usa o processo dedicado (padrão), 0 = inferência local
+  JARVIS_ASR_CPUS     núcleos para fixar o worker, ex.: "2,3" (padrão: todos)
+"""
+
+import os
+import time
+import queue
+import logging
+import threading
+import itertools
+import multiprocessing as mp
+from multiprocessing import shared_memory
+import numpy as np
+
+from asr import ASRBackend, ASRResult
+
+logger = logging.getLogger("ASRWorker")
+
+MAX_SECONDS      = 30   # capacidade do buffer compartilhado
+START_TIMEOUT    = 300  # carregar o modelo pode demorar na primeira vez
+REQUEST_TIMEOUT  = 60
+
+
+def parse_cpus(value: str):
+    """Converte "2,3" ou "2-5" em lista de núcleos"""
+    cpus = []
+    for part in filter(None, (p.strip() for p in value.split(","))):
+        if "-" in part:
+            a, b = part.split("-")
+            cpus.extend(range(int(a), int(b) + 1))
+        else:
+            cpus.append(int(part))
+    return cpus
+
+
+def _attach_shared_memory(name: str):
+    try:
+        return shared_memory.SharedMemory(name=name, track=False)
+    except TypeError:
+        # Python < 3.13: o filho usa o mesmo resource_tracker do pai (spawn),
+        # que já registrou o segmento — quem faz unlink é sempre o pai
+        return shared_memory.SharedMemory(name=name)
+
+
+def _worker_main(backend: ASRBackend, shm_name: str, capacity: int,
+                 requests, responses, cpus):
+    """Loop do processo filho: carrega o modelo uma vez e atende pedidos"""
+    if cpus:
+        try:
+            os.sched_setaffinity(0, cpus)
+        except (AttributeError, OSError):
+            pass
+    if backend.threads:
+        for var in ("OMP_NUM_THREADS", "MKL_NUM_THREADS"):
+            os.environ[var] = str(backend.threads)
+
+    shm = _attach_shared_memory(shm_name)
+    audio = np.ndarray((capacity,), dtype=np.float32, buffer=shm.buf)
+    try:
+        backend.load()
+        responses.put(("ready", None))
+    except Exception as e:
+        responses.put(("error", str(e)))
+        shm.close()
+        return
+
+    while True:
+        request = requests.get()
+        if request is None:
+            break
+        request_id, n = request
+        t0 = time.perf_counter()
+        try:
+            result = backend.transcribe(audio[:n])
+            responses.put((request_id, (result, time.perf_counter() - t0)))
+        except Exception as e:
+            responses.put((request_id, e))
+
+    del audio
+    shm.close()
+
+
+class ASRWorker(ASRBackend):
+    """Proxy de um ASRBackend que roda num processo separado e persistente"""
+
+    def __init__(self, backend: ASRBackend, cpus=None, max_seconds: int = MAX_SECONDS):
+        super().__init__(backend.model_name, backend.language, backend.threads, backend.sample_rate)
+        self.backend  = backend
+        self.name     = backend.name
+        self.cpus     = list(cpus or [])
+        self.capacity = max_seconds * backend.sample_rate
+        self.last_inference_s = 0.0
+        self._ctx     = mp.get_context("spawn")
+        self._lock    = threading.Lock()
+        self._ids     = itertools.count()
+        self._process = None
+        self._shm     = None
+
+    def describe(self) -> str:
+        cpus = f", cpus={','.join(map(str, self.cpus))}" if self.cpus else ""
+        return f"{self.backend.describe()} [worker{cpus}]"
+
+    def load(self):
+        """Cria a memória compartilhada, sobe o processo e espera o modelo carregar"""
+        if self._shm is None:
+            self._shm = shared_memory.SharedMemory(create=True, size=self.capacity * 4)
+            self._audio = np.ndarray((self.capacity,), dtype=np.float32, buffer=self._shm.buf)
+        self._requests  = self._ctx.Queue()
+        self._responses = self._ctx.Queue()
+        self._process = self._ctx.Process(
+            target=_worker_main,
+            args=(self.backend, self._shm.name, self.capacity,
+                  self._requests, self._responses, self.cpus),
+            name="jarvis-asr",
+            daemon=True
+        )
+        self._process.start()
+        status, detail = self._responses.get(timeout=START_TIMEOUT)
+        if status != "ready":
+            self._process.join(timeout=1)
+            raise Exception(f"Worker ASR falhou ao carregar: {detail}")
+        logger.info(f"✅ Worker ASR pronto (pid {self._process.pid})")
+
+    def transcribe(self, audio_float32: np.ndarray) -> ASRResult:
+        with self._lock:
+            if self._process is None or not self._process.is_alive():
+                logger.warning("⚠️  Worker ASR não está rodando, reiniciando...")
+                self.load()
+
+            if len(audio_float32) > self.capacity:
+                # Cortar o início perderia o começo do comando
+                raise ValueError(f"Áudio de {len(audio_float32) / self.sample_rate:.1f}s excede o "
+                                 f"buffer do worker ASR ({self.capacity / self.sample_rate:.0f}s)")
+            n = len(audio_float32)
+            self._audio[:n] = audio_float32
+
+            request_id = next(self._ids)
+            self._requests.put((request_id, n))
+            deadline = time.monotonic() + REQUEST_TIMEOUT
+            while True:
+                try:
+                    response_id, payload = self._responses.get(
+                        timeout=max(0.0, deadline - time.monotonic()))
+                except queue.Empty:
+                    # O filho ainda pode estar lendo self._audio: o próximo pedido
+                    # sobrescreveria o áudio em uso e receberia a resposta atrasada
+                    self._stop_process()
+                    raise TimeoutError(f"Worker ASR sem resposta em {REQUEST_TIMEOUT}s; "
+                                       f"será reiniciado no próximo pedido")
+                if response_id == request_id:
+                    break
+                logger.warning(f"⚠️  Descartando resposta atrasada do pedido {response_id}")
+
+        if isinstance(payload, Exception):
+            raise payload
+        result, self.last_inference_s = payload
+        return result
+
+    def _stop_process(self, graceful: bool = False):
+        """Encerra o filho; load() cria filas novas, sem respostas antigas"""
+        if self._process is not None and self._process.is_alive():
+            if graceful:
+                self._requests.put(None)
+                self._process.join(timeout=2)
+            if self._process.is_alive():
+                self._process.terminate()
+                self._process.join(timeout=2)
+        self._process = None
+
+    def close(self):
+        """Encerra o processo e libera a memória compartilhada"""
+        self._stop_process(graceful=True)
+        if self._shm is not None:
+            del self._audio
+            self._shm.close()
+            self._shm.unlink()
+            self._shm = None
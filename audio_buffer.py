@@ -0,0 +1,167 @@
+#!/usr/bin/env python3
+"""
+Buffer circular de áudio alimentado pelo callback do sounddevice.
+
+Cada amostra recebe uma posição absoluta (contador desde o início do stream),
+o que permite recortar a janela do comando a partir do frame exato em que o
+Porcupine detectou a hotword, sem abrir uma segunda gravação.
+"""
+
+import queue
+import threading
+from collections import deque
+from dataclasses import dataclass, asdict
+import numpy as np
+
+
+class AudioRingBuffer:
+    """Buffer circular pré-alocado com posições absolutas de amostra"""
+
+    def __init__(self, capacity: int, dtype=np.float32):
+        self.capacity = int(capacity)
+        self._buf     = np.zeros(self.capacity, dtype=dtype)
+        self._written = 0
+        self._cond    = threading.Condition()
+
+    @property
+    def position(self) -> int:
+        """Posição absoluta logo após a última amostra escrita"""
+        return self._written
+
+    def write(self, samples: np.ndarray):
+        """Copia um bloco para o buffer (chamado pelo callback de áudio)"""
+        n = len(samples)
+        if n > self.capacity:
+            samples = samples[-self.capacity:]
+            skipped = n - self.capacity
+        else:
+            skipped = 0
+
+        count = len(samples)
+        start = (self._written + skipped) % self.capacity
+        first = min(count, self.capacity - start)
+        self._buf[start:start + first] = samples[:first]
+        if count > first:
+            self._buf[:count - first] = samples[first:]
+
+        with self._cond:
+            self._written += n
+            self._cond.notify_all()
+
+    def read(self, start: int, end: int) -> np.ndarray:
+        """Retorna uma cópia das amostras no intervalo absoluto [start, end)"""
+        oldest = max(0, self._written - self.capacity)
+        start  = max(start, oldest)
+        end    = min(end, self._written)
+        if end <= start:
+            return np.zeros(0, dtype=self._buf.dtype)
+
+        i = start % self.capacity
+        j = end % self.capacity
+        if i < j:
+            return self._buf[i:j].copy()
+        return np.concatenate((self._buf[i:], self._buf[:j]))
+
+    def view(self, start: int, end: int) -> np.ndarray:
+        """Retorna uma view (sem cópia) de [start, end) quando não cruza o fim do buffer"""
+        i = start % self.capacity
+        if (start >= self._written - self.capacity and end <= self._written
+                and i + (end - start) <= self.capacity):
+            return self._buf[i:i + (end - start)]
+        return self.read(start, end)
+
+    def wait_for(self, position: int, timeout: float = None) -> bool:
+        """Bloqueia até o buffer alcançar a posição absoluta informada"""
+        with self._cond:
+            return self._cond.wait_for(lambda: self._written >= position, timeout)
+
+
+class FrameAligner:
+    """Lê frames contíguos de tamanho fixo do buffer circular
+
+    Mantém um cursor de leitura próprio: as amostras que sobram de um bloco
+    simplesmente ficam no buffer até o próximo bloco completar o frame, então
+    nenhum trecho do stream deixa de chegar ao Porcupine. Com a capacidade do
+    buffer múltipla de frame_length, cada frame é uma view sem cópia.
+    """
+
+    def __init__(self, ring: AudioRingBuffer, frame_length: int):
+        self.ring         = ring
+        self.frame_length = frame_length
+        self.cursor       = ring.position
+        self.skipped      = 0  # amostras descartadas por atraso do consumidor
+
+    def frames(self):
+        """Gera (view do frame, posição absoluta do fim do frame) até alcançar o escritor"""
+        n = self.frame_length
+        written = self.ring.position
+
+        # Consumidor ficou para trás a ponto do escritor sobrescrever o cursor
+        lag = written - self.cursor
+        if lag > self.ring.capacity // 2:
+            jump = (lag - self.ring.capacity // 4) // n * n
+            self.cursor  += jump
+            self.skipped += jump
+
+        while written - self.cursor >= n:
+            end = self.cursor + n
+            yield self.ring.view(self.cursor, end), end
+            self.cursor = end
+
+
+class BlockQueue:
+    """Fila limitada de blocos do callback com descarte do mais antigo
+
+    O callback de áudio nunca bloqueia: com a fila cheia, o item mais antigo
+    sai e `dropped` é incrementado. Como o áudio em si fica no buffer
+    circular, a fila só carrega (posição, instante) e perder um item custa
+    apenas a marca de tempo daquele bloco.
+    """
+
+    def __init__(self, maxsize: int = 32):
+        self.maxsize   = maxsize
+        self.dropped   = 0
+        self.max_depth = 0
+        self._items    = deque()
+        self._cond     = threading.Condition()
+
+    def qsize(self) -> int:
+        return len(self._items)
+
+    def put(self, item):
+        with self._cond:
+            if len(self._items) >= self.maxsize:
+                self._items.popleft()
+                self.dropped += 1
+            self._items.append(item)
+            self.max_depth = max(self.max_depth, len(self._items))
+            self._cond.notify()
+
+    def get(self, timeout: float = None):
+        with self._cond:
+            if not self._cond.wait_for(lambda: self._items, timeout):
+                raise queue.Empty
+            return self._items.popleft()
+
+    def drain(self, timeout: float = None) -> list:
+        """Espera ao menos um item e retorna todos os pendentes de uma vez"""
+        with self._cond:
+            if not self._cond.wait_for(lambda: self._items, timeout):
+                raise queue.Empty
+            items = list(self._items)
+            self._items.clear()
+            return items
+
+
+@dataclass
+class AudioStats:
+    """Contadores de saúde do stream de entrada"""
+    input_overflows: int  = 0  # status do PortAudio: o driver perdeu amostras
+    input_underflows: int = 0
+    dropped_blocks: int   = 0  # blocos descartados da BlockQueue
+    skipped_samples: int  = 0  # amostras puladas pelo FrameAligner
+    max_depth: int        = 0  # maior profundidade da fila observada
+    throttle_events: int  = 0  # vezes que os gestos foram desacelerados
+
+    def as_dict(self) -> dict:
+        return asdict(self)
@@ -0,0 +1,168 @@
+#!/usr/bin/env python3
+"""
+Serviço de reprodução de áudio assíncrono sobre o pygame.mixer.
+
+Os sons fixos (listen/ligar/muhehe/fechar) são lidos e decodificados para a
+memória uma única vez. Toda chamada ao pygame acontece na thread do player;
+quem toca um som só enfileira o pedido e recebe um Future que completa
+quando o som termina — nada de load() do disco nem get_busy() em loop no
+caminho da hotword. A mixagem entre canais é feita pelo SDL.
+"""
+
+import os
+import queue
+import logging
+import threading
+from concurrent.futures import Future
+from typing import Dict, Iterable
+import numpy as np
+
+logger = logging.getLogger("AudioPlayer")
+
+DEFAULT_SOUNDS = ("listen.mp3", "ligar.mp3", "muhehe.mp3", "fechar.mp3")
+NUM_CHANNELS   = 8
+POLL_INTERVAL  = 0.02  # s entre verificações de canais terminados
+
+
+class AudioPlayer:
+    """Player com sons pré-decodificados, thread própria e Futures"""
+
+    def __init__(self, base_dir: str = None, sounds: Iterable[str] = DEFAULT_SOUNDS):
+        self.base_dir = base_dir or os.getcwd()
+        self.initial_sounds = list(sounds)
+        self.sounds: Dict[str, object] = {}
+        self._requests = queue.Queue()
+        self._playing = []  # [(canal, som, future)]
+        self._thread = None
+        self._ready = threading.Event()
+        self._error = None
+
+    # ── Ciclo de vida ────────────────────────────────────────────────────────
+
+    def start(self, timeout: float = 10.0):
+        """Inicializa o mixer e pré-carrega os sons na thread do player"""
+        self._thread = threading.Thread(target=self._run, name="jarvis-audio", daemon=True)
+        self._thread.start()
+        if not self._ready.wait(timeout):
+            raise Exception("Player de áudio não inicializou a tempo")
+        if self._error:
+            raise self._error
+
+    def stop(self):
+        self._requests.put(("quit", None, None))
+
+    # ── API (thread-safe, não bloqueia) ──────────────────────────────────────
+
+    def play(self, name: str) -> Future:
+        """Toca um som pré-carregado; o Future completa ao fim da reprodução"""
+        future = Future()
+        self._requests.put(("play", name, future))
+        return future
+
+    def play_file(self, path: str) -> Future:
+        """Carrega e toca um arquivo avulso (o load acontece na thread do player)"""
+        future = Future()
+        self._requests.put(("play_file", path, future))
+        return future
+
+    def play_pcm(self, pcm: np.ndarray, sample_rate: int, key: str = None) -> Future:
+        """Toca PCM int16 mono (ex.: voz sintetizada); com key, o Sound convertido fica em memória"""
+        future = Future()
+        self._requests.put(("play_pcm", (pcm, sample_rate, key), future))
+        return future
+
+    def preload(self, name: str, path: str = None) -> Future:
+        """Decodifica um arquivo para a memória sob o nome informado"""
+        future = Future()
+        self._requests.put(("preload", (name, path or os.path.join(self.base_dir, name)), future))
+        return future
+
+    def stop_all(self):
+        self._requests.put(("stop_all", None, None))
+
+    # ── Thread do player ─────────────────────────────────────────────────────
+
+    def _run(self):
+        try:
+            import pygame
+            self.pygame = pygame
+            if not pygame.mixer.get_init():
+                pygame.mixer.init()
+            pygame.mixer.set_num_channels(NUM_CHANNELS)
+            for name in self.initial_sounds:
+                self._load(name, os.path.join(self.base_dir, name))
+        except Exception as e:
+            self._error = e
+            self._ready.set()
+            return
+        self._ready.set()
+
+        while True:
+            try:
+                action, arg, future = self._requests.get(timeout=POLL_INTERVAL)
+            except queue.Empty:
+                self._reap()
+                continue
+
+            if action == "quit":
+                break
+            try:
+                if action == "play":
+                    sound = self.sounds.get(arg)
+                    if sound is None:
+                        raise KeyError(f"Som não carregado: {arg}")
+                    self._start(sound, future)
+                elif action == "play_pcm":
+                    self._start(self._pcm_sound(*arg), future)
+                elif action == "play_file":
+                    self._start(self.pygame.mixer.Sound(arg), future)
+                elif action == "preload":
+                    self._load(*arg)
+                    future.set_result(True)
+                elif action == "stop_all":
+                    self.pygame.mixer.stop()
+            except Exception as e:
+                if future is not None and not future.done():
+                    future.set_exception(e)
+            self._reap()
+
+        self.pygame.mixer.stop()
+        for _, _, future in self._playing:
+            future.set_result(False)
+
+    def _load(self, name: str, path: str):
+        if not os.path.exists(path):
+            logger.warning(f"⚠️  Arquivo de som não encontrado: {path}")
+            return
+        self.sounds[name] = self.pygame.mixer.Sound(path)
+
+    def _pcm_sound(self, pcm: np.ndarray, sample_rate: int, key: str = None):
+        """Converte PCM mono para o formato do mixer (taxa e canais) e cria o Sound"""
+        if key is not None and key in self.sounds:
+            return self.sounds[key]
+        freq, _fmt, channels = self.pygame.mixer.get_init()
+        if sample_rate != freq and len(pcm):
+            n = int(round(len(pcm) * freq / sample_rate))
+            pcm = np.interp(np.linspace(0, len(pcm) - 1, n), np.arange(len(pcm)), pcm)
+        pcm = np.asarray(pcm, dtype=np.int16)
+        if channels > 1:
+            pcm = np.repeat(pcm[:, None], channels, axis=1)
+        sound = self.pygame.mixer.Sound(buffer=np.ascontiguousarray(pcm).tobytes())
+        if key is not None:
+            self.sounds[key] = sound
+        return sound
+
+    def _start(self, sound, future: Future):
+        channel = self.pygame.mixer.find_channel(True)
+        channel.play(sound)
+        self._playing.append((channel, sound, future))
+
+    def _reap(self):
+        """Completa os Futures dos sons que terminaram"""
+        still = []
+        for channel, sound, future in self._playing:
+            if channel.get_busy() and channel.get_sound() is sound:
+                still.append((channel, sound, future))
+            elif not future.done():
+                future.set_result(True)
+        self._playing = still
@@ -0,0 +1,132 @@
+#!/usr/bin/env python3
+"""
+Compara latência e precisão dos backends ASR em comandos gravados.
+
+Uso (a partir da raiz do projeto):
+  python -m benchmarks.asr_backends gravacoes/ --backends whisper faster-whisper vosk
+
+O diretório deve conter WAVs mono 16 kHz. O texto esperado vem de
+labels.json ({"arquivo.wav": "hora", ...}) ou, na falta dele, do nome do
+arquivo até o primeiro "_" (ex.: "hora_03.wav" → "hora").
+"""
+
+import os
+import sys
+import json
+import time
+import wave
+import argparse
+import numpy as np
+
+from asr import BACKENDS, create_backend, normalize_text
+
+
+def load_wav(path: str, sample_rate: int = 16000) -> np.ndarray:
+    """Lê um WAV PCM 16-bit mono como float32 em [-1, 1]"""
+    with wave.open(path, "rb") as w:
+        if w.getsampwidth() != 2 or w.getnchannels() != 1:
+            raise ValueError(f"{path}: esperado PCM 16-bit mono")
+        if w.getframerate() != sample_rate:
+            raise ValueError(f"{path}: taxa {w.getframerate()} Hz, esperado {sample_rate} Hz")
+        pcm = np.frombuffer(w.readframes(w.getnframes()), dtype=np.int16)
+    return pcm.astype(np.float32) / 32768.0
+
+
+def load_dataset(directory: str):
+    """Retorna [(nome, áudio float32, texto esperado), ...]"""
+    labels = {}
+    labels_path = os.path.join(directory, "labels.json")
+    if os.path.exists(labels_path):
+        with open(labels_path) as f:
+            labels = json.load(f)
+
+    items = []
+    for name in sorted(os.listdir(directory)):
+        if not name.endswith(".wav"):
+            continue
+        expected = labels.get(name, name[:-4].split("_")[0])
+        items.append((name, load_wav(os.path.join(directory, name)), normalize_text(expected)))
+    return items
+
+
+def word_error_rate(reference: str, hypothesis: str) -> float:
+    """WER por distância de edição entre palavras"""
+    ref, hyp = reference.split(), hypothesis.split()
+    if not ref:
+        return 0.0 if not hyp else 1.0
+    d = list(range(len(hyp) + 1))
+    for i, r in enumerate(ref, 1):
+        prev, d[0] = d[0], i
+        for j, h in enumerate(hyp, 1):
+            prev, d[j] = d[j], min(d[j] + 1, d[j - 1] + 1, prev + (r != h))
+    return d[-1] / len(ref)
+
+
+def run_backend(name: str, items, model: str, threads: int, warmup: int = 1):
+    backend = create_backend(name, model=model, threads=threads)
+    t0 = time.perf_counter()
+    backend.load()
+    load_s = time.perf_counter() - t0
+
+    for _, audio, _ in items[:warmup]:
+        backend.transcribe(audio)
+
+    latencies, wers, hits, audio_s = [], [], 0, 0.0
+    for file_name, audio, expected in items:
+        t0 = time.perf_counter()
+        text = normalize_text(backend.transcribe(audio).text)
+        latencies.append(time.perf_counter() - t0)
+        audio_s += len(audio) / backend.sample_rate
+        wers.append(word_error_rate(expected, text))
+        hits += expected in text
+        print(f"  [{name}] {file_name}: '{text}' (esperado '{expected}') "
+              f"{latencies[-1] * 1000:.0f} ms")
+
+    lat = np.array(latencies) * 1000
+    return {
+        "backend": backend.describe(),
+        "load_s": round(load_s, 3),
+        "clips": len(items),
+        "latency_ms_p50": round(float(np.percentile(lat, 50)), 1),
+        "latency_ms_p95": round(float(np.percentile(lat, 95)), 1),
+        "latency_ms_mean": round(float(lat.mean()), 1),
+        "rtf": round(float(lat.sum() / 1000 / audio_s), 4),
+        "wer": round(float(np.mean(wers)), 4),
+        "command_accuracy": round(hits / len(items), 4),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark dos backends ASR")
+    parser.add_argument("directory", help="diretório com os WAVs gravados")
+    parser.add_argument("--backends", nargs="+", default=list(BACKENDS), choices=list(BACKENDS))
+    parser.add_argument("--model", default="base")
+    parser.add_argument("--threads", type=int, default=0)
+    parser.add_argument("--json", help="grava os resultados neste arquivo")
+    args = parser.parse_args()
+
+    items = load_dataset(args.directory)
+    if not items:
+        print(f"❌ Nenhum WAV em {args.directory}")
+        sys.exit(1)
+
+    results = []
+    for name in args.backends:
+        try:
+            results.append(run_backend(name, items, args.model, args.threads))
+        except Exception as e:
+            print(f"⚠️  {name} indisponível: {e}")
+
+    print()
+    print(f"{'backend':<36} {'p50 ms':>8} {'p95 ms':>8} {'RTF':>7} {'WER':>6} {'acerto':>7}")
+    for r in results:
+        print(f"{r['backend']:<36} {r['latency_ms_p50']:>8} {r['latency_ms_p95']:>8} "
+              f"{r['rtf']:>7} {r['wer']:>6} {r['command_accuracy']:>7.0%}")
+
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(results, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
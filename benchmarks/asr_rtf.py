@@ -0,0 +1,75 @@
+#!/usr/bin/env python3
+"""
+Fator de tempo real (RTF) do _recognize_speech por tamanho de modelo Whisper
+e número de threads.
+
+Uso:
+  python -m benchmarks.asr_rtf gravacoes/ --models tiny base small --threads 1 2 4
+
+RTF = tempo de processamento / duração do áudio (abaixo de 1 é mais rápido
+que o tempo real). Mede o caminho completo do _recognize_speech (checagem de
+energia, transcrição e normalização), sem a gramática.
+"""
+
+import time
+import logging
+import argparse
+
+from benchmarks.asr_backends import load_dataset
+from benchmarks.common import environment, timing_stats, write_json
+from asr import create_backend
+
+MODELS  = ("tiny", "base", "small")
+THREADS = (1, 2, 4)
+
+
+def run(items, models=MODELS, threads=THREADS, backend: str = "whisper", warmup: int = 1) -> list:
+    from replay import ReplayJarvis
+    jarvis = ReplayJarvis()
+    jarvis.logger.setLevel(logging.WARNING)
+    audio_s = sum(len(audio) for _, audio, _ in items) / jarvis.sample_rate
+    results = []
+    for model in models:
+        for n in threads:
+            jarvis.asr = create_backend(backend, model=model, threads=n,
+                                        sample_rate=jarvis.sample_rate)
+            t0 = time.perf_counter()
+            jarvis.asr.load()
+            load_s = time.perf_counter() - t0
+            for _, audio, _ in items[:warmup]:
+                jarvis._recognize_speech(audio)
+
+            latencies, hits = [], 0
+            for _, audio, expected in items:
+                t = time.perf_counter()
+                text = jarvis._recognize_speech(audio)
+                latencies.append(time.perf_counter() - t)
+                hits += expected in text
+            jarvis.asr.close()
+
+            row = {"backend": backend, "model": model, "threads": n,
+                   "load_s": round(load_s, 3), "audio_s": round(audio_s, 2),
+                   "rtf": round(sum(latencies) / audio_s, 4),
+                   "accuracy": round(hits / len(items), 4),
+                   **timing_stats(latencies, scale=1000, unit="ms")}
+            results.append(row)
+            print(f"  {backend} {model:<8} {n} threads: RTF {row['rtf']:.3f} "
+                  f"(p50 {row['p50_ms']:.0f} ms, acerto {row['accuracy']:.0%})")
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="RTF do _recognize_speech por modelo e threads")
+    parser.add_argument("directory", help="diretório com os WAVs gravados")
+    parser.add_argument("--backend", default="whisper", choices=["whisper", "faster-whisper"])
+    parser.add_argument("--models", nargs="+", default=list(MODELS))
+    parser.add_argument("--threads", type=int, nargs="+", default=list(THREADS))
+    parser.add_argument("--json", help="grava os resultados neste arquivo")
+    args = parser.parse_args()
+    items = load_dataset(args.directory)
+    results = run(items, args.models, args.threads, args.backend)
+    write_json({"environment": environment(), "asr_rtf": results}, args.json)
+
+
+if __name__ == "__main__":
+    main()
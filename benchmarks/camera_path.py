@@ -0,0 +1,170 @@
+#!/usr/bin/env python3
+"""
+Custo por frame do caminho câmera → RGB para o MediaPipe, antes e depois
+dos buffers pré-alocados (camera.py).
+
+Uso:
+  python -m benchmarks.camera_path --frames 300
+  python -m benchmarks.camera_path --device 0      # webcam de verdade
+
+  antes   cap.read() novo array → resize/recorte → cvtColor novo array
+  depois  cap.read(buffer do pool) → FrameConverter (dst pré-alocado)
+
+Sem --device a fonte é sintética e imita o OpenCV: read() sem argumento
+aloca um frame novo, read(buf) copia para o buffer. Mede CPU por frame
+(time.process_time), tempo de parede e bytes alocados por frame
+(tracemalloc, numa passada separada para não distorcer os tempos), nos três
+modos do FrameScheduler: cheio, ocioso (reduzido) e ROI.
+"""
+
+import time
+import argparse
+import tracemalloc
+from typing import Callable, Dict
+import numpy as np
+
+from benchmarks.common import environment, timing_stats, write_json
+
+MODES = ("cheio", "ocioso", "roi")
+
+
+class _SyntheticCapture:
+    """Fonte BGR com a semântica de alocação do cv2.VideoCapture"""
+
+    def __init__(self, width: int = 640, height: int = 480, seed: int = 0):
+        rng = np.random.default_rng(seed)
+        self.frame = rng.integers(0, 256, (height, width, 3), dtype=np.uint8)
+
+    def read(self, image: np.ndarray = None):
+        if image is None:
+            return True, self.frame.copy()
+        np.copyto(image, self.frame)
+        return True, image
+
+    def grab(self) -> bool:
+        return True
+
+    def release(self):
+        pass
+
+
+def _plan(mode: str, shape):
+    """Mesmos parâmetros que o FrameScheduler.plan produziria"""
+    from gestures import IDLE_SCALE
+    if mode == "ocioso":
+        return None, IDLE_SCALE, None
+    if mode == "roi":
+        h, w = shape[:2]
+        return (w // 4, h // 4, 3 * w // 4, 3 * h // 4), 1.0, None
+    return None, 1.0, None
+
+
+def _legacy_step(cap, mode: str) -> Callable[[], np.ndarray]:
+    import cv2
+
+    def step():
+        _, frame = cap.read()
+        box, scale, _ = _plan(mode, frame.shape)
+        if box is not None:
+            x0, y0, x1, y1 = box
+            frame = frame[y0:y1, x0:x1]
+        if scale != 1.0:
+            frame = cv2.resize(frame, None, fx=scale, fy=scale, interpolation=cv2.INTER_AREA)
+        return cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
+    return step
+
+
+def _pooled_step(cap, mode: str) -> Callable[[], np.ndarray]:
+    from camera import Camera, FrameConverter
+
+    camera = Camera(0)
+    _, first = cap.read()
+    camera._attach(cap, first)
+    converter = FrameConverter(first.shape[0] * first.shape[1], source_rgb=camera.rgb)
+
+    leased = []
+
+    def step():
+        # Devolve o frame anterior, como o loop de gestos depois do mp.Image
+        while leased:
+            camera.recycle(leased.pop())
+        frame = camera.read()
+        leased.append(frame)
+        box, scale, _ = _plan(mode, frame.shape)
+        return converter.convert(frame, box, scale)
+    return step
+
+
+def _wrap_mediapipe(step: Callable[[], np.ndarray]) -> Callable[[], object]:
+    """Inclui a criação do mp.Image (cópia dos pixels), se o MediaPipe existir"""
+    try:
+        import mediapipe as mp
+    except ImportError:
+        return step
+    return lambda: mp.Image(image_format=mp.ImageFormat.SRGB, data=step())
+
+
+def _measure(step: Callable[[], object], frames: int) -> Dict[str, object]:
+    for _ in range(10):  # aquece caches e o pool
+        step()
+
+    cpu, wall = [], []
+    for _ in range(frames):
+        c0, w0 = time.process_time(), time.perf_counter()
+        step()
+        cpu.append(time.process_time() - c0)
+        wall.append(time.perf_counter() - w0)
+
+    tracemalloc.start()
+    allocated = []
+    try:
+        for _ in range(min(frames, 50)):
+            before = tracemalloc.get_traced_memory()[0]
+            tracemalloc.reset_peak()
+            result = step()
+            allocated.append(tracemalloc.get_traced_memory()[1] - before)
+            del result
+    finally:
+        tracemalloc.stop()
+
+    return {"cpu": timing_stats(cpu), "wall": timing_stats(wall),
+            "alloc_bytes_per_frame": int(np.median(allocated))}
+
+
+def run(frames: int = 300, device: int = None, size=(640, 480)) -> dict:
+    if device is None:
+        make_source = lambda: _SyntheticCapture(*size)  # noqa: E731
+    else:
+        import cv2
+        make_source = lambda: cv2.VideoCapture(device)  # noqa: E731
+
+    results = {}
+    for mode in MODES:
+        results[mode] = {}
+        for variant, build in (("antes", _legacy_step), ("depois", _pooled_step)):
+            cap = make_source()
+            try:
+                results[mode][variant] = _measure(_wrap_mediapipe(build(cap, mode)), frames)
+            finally:
+                cap.release()
+        before, after = results[mode]["antes"], results[mode]["depois"]
+        print(f"  {mode:7} CPU p50 {before['cpu']['p50_us']:8.1f} → {after['cpu']['p50_us']:8.1f} µs/frame, "
+              f"alocação {before['alloc_bytes_per_frame'] / 1024:7.1f} → "
+              f"{after['alloc_bytes_per_frame'] / 1024:7.1f} KiB/frame")
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Custo por frame do caminho câmera → RGB")
+    parser.add_argument("--frames", type=int, default=300)
+    parser.add_argument("--device", type=int, help="índice da webcam (padrão: fonte sintética)")
+    parser.add_argument("--size", default="640x480", help="resolução da fonte sintética")
+    parser.add_argument("--json", help="grava os resultados neste arquivo")
+    args = parser.parse_args()
+    size = tuple(int(v) for v in args.size.lower().split("x"))
+    write_json({"environment": environment(),
+                "camera_path": run(args.frames, args.device, size)}, args.json)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,56 @@
+#!/usr/bin/env python3
+"""
+Utilidades compartilhadas pelos benchmarks: metadados do ambiente,
+estatísticas de tempos e gravação dos resultados em JSON.
+"""
+
+import os
+import sys
+import json
+import time
+import platform
+import subprocess
+from typing import Dict, List
+import numpy as np
+
+
+def environment() -> Dict[str, object]:
+    """Metadados para comparar resultados entre builds e máquinas"""
+    try:
+        commit = subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True,
+                                text=True, cwd=os.path.dirname(__file__)).stdout.strip()
+    except OSError:
+        commit = ""
+    return {
+        "commit": commit or None,
+        "python": platform.python_version(),
+        "numpy": np.__version__,
+        "platform": platform.platform(),
+        "cpus": os.cpu_count(),
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+    }
+
+
+def timing_stats(seconds: List[float], scale: float = 1e6, unit: str = "us") -> Dict[str, float]:
+    """p50/p95/p99/média de uma lista de durações (padrão em microssegundos)"""
+    if not seconds:
+        return {"n": 0}
+    values = np.asarray(seconds) * scale
+    return {
+        "n": len(values),
+        f"p50_{unit}": round(float(np.percentile(values, 50)), 3),
+        f"p95_{unit}": round(float(np.percentile(values, 95)), 3),
+        f"p99_{unit}": round(float(np.percentile(values, 99)), 3),
+        f"mean_{unit}": round(float(values.mean()), 3),
+    }
+
+
+def write_json(results: dict, path: str = None):
+    """Grava em arquivo ou imprime no stdout"""
+    text = json.dumps(results, ensure_ascii=False, indent=2)
+    if path:
+        with open(path, "w") as f:
+            f.write(text + "\n")
+        print(f"💾 Resultados gravados em {path}", file=sys.stderr)
+    else:
+        print(text)
@@ -0,0 +1,147 @@
+#!/usr/bin/env python3
+"""
+Custo por frame do GestureController._check_gestures_inner.
+
+Uso:
+  python -m benchmarks.gesture_rules [landmarks.jsonl] --repeat 20
+
+O stream de landmarks vem de uma gravação (JARVIS_GESTURE_RECORD=arquivo
+durante o uso normal grava um JSON por frame: {"t": s, "hands": [[[x,y,z]*21]]})
+ou, na falta dela, de um stream sintético a 30 fps com pinça, arrasto e
+volume (semente fixa). O relógio e o teclado são substituídos durante a
+medição: o tempo segue os timestamps gravados e nenhuma tecla é enviada.
+Com JARVIS_GESTURE_MODEL definido, mede o classificador kNN no lugar das
+regras de limiar.
+"""
+
+import json
+import time
+import argparse
+from typing import List, Tuple
+import numpy as np
+
+from benchmarks.common import environment, timing_stats, write_json
+
+FPS = 30.0
+
+
+def load_stream(path: str) -> List[Tuple[float, list]]:
+    stream = []
+    with open(path) as f:
+        for line in f:
+            if line.strip():
+                frame = json.loads(line)
+                hands = [np.asarray(hand, dtype=np.float32) for hand in frame["hands"]]
+                stream.append((frame["t"], hands))
+    return stream
+
+
+def _hand(wrist_x: float, wrist_y: float, pinch: bool = False, two_up: bool = False) -> np.ndarray:
+    """Mão sintética com os 21 landmarks do MediaPipe (coordenadas normalizadas)"""
+    pts = [(wrist_x + 0.02 * (i % 5), wrist_y - 0.03 * (i // 4), 0.0) for i in range(21)]
+    pts = [list(p) for p in pts]
+    pts[0] = [wrist_x, wrist_y, 0.0]
+    pts[4] = [wrist_x + 0.10, wrist_y - 0.10, 0.0]
+    pts[8] = [wrist_x + 0.25, wrist_y - 0.25, 0.0]
+    if pinch:
+        pts[8] = [pts[4][0] + 0.02, pts[4][1], 0.0]
+    if two_up:
+        for tip, pip, mcp in ((8, 6, 5), (12, 10, 9)):
+            pts[mcp][1], pts[pip][1], pts[tip][1] = wrist_y - 0.10, wrist_y - 0.18, wrist_y - 0.26
+        for tip, pip in ((16, 14), (20, 18)):
+            pts[pip][1], pts[tip][1] = wrist_y - 0.12, wrist_y - 0.05
+    return np.asarray(pts, dtype=np.float32)
+
+
+def synthetic_stream(seconds: float = 60.0) -> List[Tuple[float, list]]:
+    """Ciclos de 4 s: sem mão, pinça arrastando, mão aberta, volume subindo/descendo"""
+    stream = []
+    for i in range(int(seconds * FPS)):
+        t = i / FPS
+        phase = t % 4.0
+        if phase < 0.5:
+            hands = []
+        elif phase < 1.5:
+            hands = [_hand(0.3 + 0.4 * (phase - 0.5), 0.6, pinch=True)]
+        elif phase < 2.0:
+            hands = [_hand(0.5, 0.6)]
+        elif phase < 3.0:
+            hands = [_hand(0.5, 0.8 - 0.4 * (phase - 2.0), two_up=True)]
+        else:
+            hands = [_hand(0.5, 0.4 + 0.4 * (phase - 3.0), two_up=True)]
+        stream.append((t, hands))
+    return stream
+
+
+class _Clock:
+    """Substitui o módulo time dentro de gestures: time() segue o stream"""
+
+    def __init__(self):
+        self.now = 0.0
+
+    def time(self) -> float:
+        return self.now
+
+    def monotonic(self) -> float:
+        return self.now
+
+    def sleep(self, seconds: float):
+        pass
+
+
+class _Keyboard:
+    """Substitui o pyautogui: só conta as ações"""
+
+    def __init__(self):
+        self.actions = 0
+
+    def _count(self, *args, **kwargs):
+        self.actions += 1
+
+    keyDown = keyUp = press = _count
+
+
+def run(stream, repeat: int = 10) -> dict:
+    import gestures
+    from gestures import GestureController
+
+    controller = GestureController.__new__(GestureController)
+    controller._init_state()
+    clock, keyboard, volume = _Clock(), _Keyboard(), []
+    saved = gestures.time, gestures.pyautogui, gestures._set_volume
+    gestures.time, gestures.pyautogui, gestures._set_volume = clock, keyboard, volume.append
+    try:
+        latencies = []
+        duration = stream[-1][0] - stream[0][0] if stream else 0.0
+        for r in range(repeat):
+            offset = r * (duration + 1.0)
+            for t, hands in stream:
+                clock.now = t + offset
+                controller._landmarks = hands
+                t0 = time.perf_counter()
+                controller._check_gestures_inner(clock.now)
+                latencies.append(time.perf_counter() - t0)
+    finally:
+        gestures.time, gestures.pyautogui, gestures._set_volume = saved
+
+    result = {"classifier": controller.classifier.name, "frames": len(latencies), "frames_per_s": round(len(latencies) / sum(latencies), 1),
+              "key_actions": keyboard.actions, "volume_actions": len(volume),
+              **timing_stats(latencies)}
+    print(f"  _check_gestures_inner ({result['classifier']}): p50 {result['p50_us']:.1f} µs/frame, "
+          f"p99 {result['p99_us']:.1f} µs ({result['key_actions']} teclas, "
+          f"{result['volume_actions']} ajustes de volume)")
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Custo por frame das regras de gestos")
+    parser.add_argument("landmarks", nargs="?", help="JSONL gravado (padrão: stream sintético)")
+    parser.add_argument("--repeat", type=int, default=10)
+    parser.add_argument("--json", help="grava os resultados neste arquivo")
+    args = parser.parse_args()
+    stream = load_stream(args.landmarks) if args.landmarks else synthetic_stream()
+    write_json({"environment": environment(), "gestures": run(stream, args.repeat)}, args.json)
+
+
+if __name__ == "__main__":
+    main()
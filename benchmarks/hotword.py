@@ -0,0 +1,74 @@
+#!/usr/bin/env python3
+"""
+Vazão do Porcupine através do _detect_hotword (frames/s).
+
+Uso:
+  PORCUPINE_ACCESS_KEY=... python -m benchmarks.hotword [gravacoes/] --seconds 60
+
+Sem diretório, usa ruído branco de baixa amplitude (semente fixa). Um frame
+do Porcupine tem 512 amostras (32 ms a 16 kHz); frames/s acima de ~31 é
+mais rápido que o tempo real.
+"""
+
+import time
+import logging
+import argparse
+import numpy as np
+
+from benchmarks.asr_backends import load_dataset
+from benchmarks.common import environment, timing_stats, write_json
+
+SEED = 1234
+
+
+def test_signal(seconds: float, sample_rate: int = 16000) -> np.ndarray:
+    rng = np.random.default_rng(SEED)
+    return (rng.standard_normal(int(seconds * sample_rate)) * 300).astype(np.int16)
+
+
+def run(audio: np.ndarray = None, seconds: float = 60.0) -> dict:
+    from replay import ReplayJarvis
+    jarvis = ReplayJarvis()
+    jarvis.logger.setLevel(logging.ERROR)
+    jarvis._init_porcupine()
+    if jarvis.porcupine is None:
+        return {"skipped": "Porcupine indisponível (PORCUPINE_ACCESS_KEY?)"}
+
+    if audio is None:
+        audio = test_signal(seconds, jarvis.sample_rate)
+    n = jarvis.porcupine.frame_length
+    frames = [audio[i:i + n] for i in range(0, len(audio) - n + 1, n)]
+
+    latencies, detections = [], 0
+    for i, frame in enumerate(frames):
+        t = time.perf_counter()
+        detections += jarvis._detect_hotword(frame, (i + 1) * n)
+        latencies.append(time.perf_counter() - t)
+    jarvis.porcupine.delete()
+
+    total = sum(latencies)
+    audio_s = len(frames) * n / jarvis.sample_rate
+    result = {"frames": len(frames), "frame_length": n, "audio_s": round(audio_s, 2),
+              "frames_per_s": round(len(frames) / total, 1),
+              "realtime_factor": round(total / audio_s, 5), "detections": detections,
+              **timing_stats(latencies)}
+    print(f"  Porcupine: {result['frames_per_s']:.0f} frames/s "
+          f"(p50 {result['p50_us']:.0f} µs/frame, RTF {result['realtime_factor']:.4f})")
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark do _detect_hotword")
+    parser.add_argument("directory", nargs="?", help="WAVs a concatenar (padrão: ruído)")
+    parser.add_argument("--seconds", type=float, default=60.0)
+    parser.add_argument("--json", help="grava os resultados neste arquivo")
+    args = parser.parse_args()
+    audio = None
+    if args.directory:
+        clips = [clip for _, clip, _ in load_dataset(args.directory)]
+        audio = (np.concatenate(clips) * 32767).astype(np.int16)
+    write_json({"environment": environment(), "hotword": run(audio, args.seconds)}, args.json)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,120 @@
+#!/usr/bin/env python3
+"""
+Vazão do _find_command com conjuntos de 14 a 10k comandos.
+
+Uso:
+  python -m benchmarks.matcher --sizes 14 100 1000 10000 --json matcher.json
+
+O conjunto de 14 é o mapeamento real do Jarvis; os maiores acrescentam frases
+sintéticas (semente fixa). As consultas imitam transcrições reais: comando
+exato, comando dentro de uma frase, erros de grafia e fala sem comando.
+"""
+
+import random
+import logging
+import argparse
+import time
+
+from benchmarks.common import environment, timing_stats, write_json
+from command_matcher import CommandMatcher
+
+SEED = 1234
+SIZES = (14, 100, 1000, 10000)
+SYLLABLES = ["ba", "ca", "da", "fe", "ga", "li", "ma", "no", "pa", "que", "ra", "sa",
+             "ta", "vo", "xi", "ze", "lu", "mo", "ni", "ro", "te", "ve"]
+VERBS = ["abre", "fecha", "liga", "desliga", "toca", "mostra", "procura", "aumenta", "baixa"]
+FILLERS = ["jarvis", "por favor", "agora", "aí", "o", "a", "pra mim", "que", "é"]
+NOISE = ["hum acho que não", "tá bom então", "nada não", "espera um pouco",
+         "o que você disse", "bom dia gente"]
+
+
+def _word(rng: random.Random) -> str:
+    return "".join(rng.choice(SYLLABLES) for _ in range(rng.randint(2, 4)))
+
+
+def command_set(size: int, base, rng: random.Random):
+    """Comandos reais + frases sintéticas até completar o tamanho"""
+    phrases = list(base)
+    seen = set(phrases)
+    while len(phrases) < size:
+        phrase = f"{rng.choice(VERBS)} {_word(rng)}"
+        if rng.random() < 0.3:
+            phrase += f" {_word(rng)}"
+        if phrase not in seen:
+            seen.add(phrase)
+            phrases.append(phrase)
+    return phrases[:max(size, len(base))]
+
+
+def _misspell(text: str, rng: random.Random) -> str:
+    chars = list(text)
+    i = rng.randrange(len(chars))
+    op = rng.choice(("drop", "swap", "dup"))
+    if op == "drop" and len(chars) > 3:
+        del chars[i]
+    elif op == "swap" and i + 1 < len(chars):
+        chars[i], chars[i + 1] = chars[i + 1], chars[i]
+    else:
+        chars.insert(i, chars[i])
+    return "".join(chars)
+
+
+def queries(phrases, count: int, rng: random.Random):
+    out = []
+    for _ in range(count):
+        kind = rng.random()
+        phrase = rng.choice(phrases)
+        if kind < 0.4:
+            out.append(phrase)
+        elif kind < 0.65:
+            out.append(f"{rng.choice(FILLERS)} {phrase} {rng.choice(FILLERS)}")
+        elif kind < 0.9:
+            out.append(_misspell(phrase, rng))
+        else:
+            out.append(rng.choice(NOISE))
+    return out
+
+
+def run(sizes=SIZES, count: int = 2000, jarvis=None) -> list:
+    """Mede _find_command para cada tamanho; retorna uma linha por tamanho"""
+    from replay import ReplayJarvis
+    jarvis = jarvis or ReplayJarvis()
+    jarvis.logger.setLevel(logging.WARNING)  # sem I/O de log no laço medido
+    base = list(jarvis.commands)
+    results = []
+    for size in sizes:
+        rng = random.Random(SEED + size)
+        phrases = command_set(size, base, rng)
+        t0 = time.perf_counter()
+        jarvis.command_matcher = CommandMatcher(phrases)
+        build_s = time.perf_counter() - t0
+        batch = queries(phrases, count, rng)
+
+        for text in batch[:50]:  # aquecimento
+            jarvis._find_command(text)
+        latencies, hits = [], 0
+        for text in batch:
+            t = time.perf_counter()
+            hits += jarvis._find_command(text) is not None
+            latencies.append(time.perf_counter() - t)
+
+        total = sum(latencies)
+        row = {"commands": len(phrases), "queries": count, "build_ms": round(build_s * 1000, 2),
+               "queries_per_s": round(count / total, 1), "matched": hits, **timing_stats(latencies)}
+        results.append(row)
+        print(f"  {len(phrases):>6} comandos: {row['queries_per_s']:>10.0f} consultas/s "
+              f"(p50 {row['p50_us']:.0f} µs, p99 {row['p99_us']:.0f} µs)")
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark do _find_command")
+    parser.add_argument("--sizes", type=int, nargs="+", default=list(SIZES))
+    parser.add_argument("--queries", type=int, default=2000)
+    parser.add_argument("--json", help="grava os resultados neste arquivo")
+    args = parser.parse_args()
+    write_json({"environment": environment(), "matcher": run(args.sizes, args.queries)}, args.json)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,64 @@
+#!/usr/bin/env python3
+"""
+Roda a suíte inteira e grava um único JSON para comparar builds.
+
+Uso:
+  python -m benchmarks.run_all --audio gravacoes/ --landmarks gestos.jsonl --json build.json
+  python -m benchmarks.run_all --skip asr_rtf hotword   # só o que roda sem modelos/chave
+
+Cada parte que não puder rodar (modelo, chave ou dependência ausente) entra
+no JSON como {"skipped": motivo}, sem derrubar as outras.
+"""
+
+import argparse
+
+from benchmarks.common import environment, write_json
+
+PARTS = ("matcher", "hotword", "asr_rtf", "gestures", "camera")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Suíte de benchmarks do Jarvis")
+    parser.add_argument("--audio", help="diretório com WAVs (ASR e hotword)")
+    parser.add_argument("--landmarks", help="JSONL de landmarks gravados")
+    parser.add_argument("--models", nargs="+", default=["tiny", "base", "small"])
+    parser.add_argument("--threads", type=int, nargs="+", default=[1, 2, 4])
+    parser.add_argument("--skip", nargs="+", default=[], choices=PARTS)
+    parser.add_argument("--json", help="grava os resultados neste arquivo")
+    args = parser.parse_args()
+
+    results = {"environment": environment()}
+    for part in PARTS:
+        if part in args.skip:
+            continue
+        print(f"▶️  {part}")
+        try:
+            if part == "matcher":
+                from benchmarks import matcher
+                results[part] = matcher.run()
+            elif part == "hotword":
+                from benchmarks import hotword
+                results[part] = hotword.run()
+            elif part == "asr_rtf":
+                if not args.audio:
+                    results[part] = {"skipped": "sem --audio"}
+                    continue
+                from benchmarks import asr_rtf
+                from benchmarks.asr_backends import load_dataset
+                results[part] = asr_rtf.run(load_dataset(args.audio), args.models, args.threads)
+            elif part == "gestures":
+                from benchmarks import gesture_rules
+                stream = (gesture_rules.load_stream(args.landmarks) if args.landmarks
+                          else gesture_rules.synthetic_stream())
+                results[part] = gesture_rules.run(stream)
+            elif part == "camera":
+                from benchmarks import camera_path
+                results[part] = camera_path.run()
+        except Exception as e:
+            print(f"⚠️  {part} indisponível: {e}")
+            results[part] = {"skipped": str(e)}
+    write_json(results, args.json)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,166 @@
+#!/usr/bin/env python3
+"""
+Captura da webcam para o MediaPipe sem alocação por frame.
+
+  - Camera: negocia MJPEG/resolução/fps direto com o V4L2 (a decodificação
+    JPEG acontece dentro do OpenCV) e lê cada frame num buffer emprestado de
+    um pool pré-alocado (cap.read(buf)); quem consome o frame o devolve com
+    recycle(). Com JARVIS_CAMERA_BACKEND=gstreamer o pipeline já entrega RGB
+    e a conversão de cor some.
+  - FrameConverter: recorte/redução/BGR→RGB escritos em views contíguas de
+    áreas pré-alocadas, prontas para o mp.Image.
+
+O mp.Image copia os pixels na criação, então os buffers podem ser
+reaproveitados assim que o detect_async retorna.
+
+Configuração (.jarvis_config / variáveis de ambiente):
+  JARVIS_CAMERA_BACKEND   v4l2 (padrão) ou gstreamer
+  JARVIS_CAMERA_SIZE      resolução pedida, ex.: 640x480 (padrão)
+  JARVIS_CAMERA_FPS       taxa pedida (padrão: 30)
+"""
+
+import os
+import logging
+import threading
+from typing import Optional, Tuple
+import cv2
+import numpy as np
+
+logger = logging.getLogger("Camera")
+
+POOL_SIZE = 4  # captura + slot + processamento + folga
+
+
+def _fourcc_name(value: float) -> str:
+    code = int(value)
+    return "".join(chr((code >> (8 * i)) & 0xFF) for i in range(4)).strip("\x00") or "?"
+
+
+class Camera:
+    """Webcam com formato negociado e pool de buffers para cap.read()"""
+
+    def __init__(self, index: int, size: Tuple[int, int] = None, fps: int = None,
+                 backend: str = None):
+        if size is None:
+            w, h = os.getenv("JARVIS_CAMERA_SIZE", "640x480").lower().split("x")
+            size = (int(w), int(h))
+        self.index   = index
+        self.size    = size
+        self.fps     = fps or int(os.getenv("JARVIS_CAMERA_FPS", "30"))
+        self.backend = (backend or os.getenv("JARVIS_CAMERA_BACKEND", "v4l2")).lower()
+        self.rgb     = False  # True quando o pipeline já entrega RGB
+        self.cap     = None
+        self._pool   = []
+        self._free   = []
+        self._lock   = threading.Lock()
+
+    def open(self) -> bool:
+        w, h = self.size
+        if self.backend == "gstreamer":
+            pipeline = (f"v4l2src device=/dev/video{self.index} ! "
+                        f"image/jpeg,width={w},height={h},framerate={self.fps}/1 ! jpegdec ! "
+                        f"videoconvert ! video/x-raw,format=RGB ! appsink drop=true max-buffers=1")
+            cap = cv2.VideoCapture(pipeline, cv2.CAP_GSTREAMER)
+            self.rgb = True
+        else:
+            cap = cv2.VideoCapture(self.index, cv2.CAP_V4L2)
+            cap.set(cv2.CAP_PROP_FOURCC, cv2.VideoWriter_fourcc(*"MJPG"))
+            cap.set(cv2.CAP_PROP_FRAME_WIDTH, w)
+            cap.set(cv2.CAP_PROP_FRAME_HEIGHT, h)
+            cap.set(cv2.CAP_PROP_FPS, self.fps)
+            cap.set(cv2.CAP_PROP_BUFFERSIZE, 1)  # sempre o frame mais novo do driver
+            self.rgb = False
+
+        ok, frame = cap.read() if cap.isOpened() else (False, None)
+        if not ok:
+            cap.release()
+            return False
+
+        self._attach(cap, frame)
+        logger.info(f"📷 Câmera {self.index}: {frame.shape[1]}x{frame.shape[0]} "
+                    f"{_fourcc_name(cap.get(cv2.CAP_PROP_FOURCC))} @ {cap.get(cv2.CAP_PROP_FPS):.0f} fps "
+                    f"({self.backend}, {'RGB' if self.rgb else 'BGR'})")
+        return True
+
+    def _attach(self, cap, frame: np.ndarray):
+        """Adota uma captura já aberta; o pool segue o formato do primeiro frame"""
+        self.cap = cap
+        with self._lock:
+            self._pool = [np.empty_like(frame) for _ in range(POOL_SIZE)]
+            self._free = list(self._pool)
+
+    @property
+    def shape(self):
+        return self._pool[0].shape if self._pool else None
+
+    def grab(self) -> bool:
+        """Avança um frame sem decodificar"""
+        return self.cap.grab()
+
+    def read(self) -> Optional[np.ndarray]:
+        """Próximo frame num buffer livre do pool (None se falhar)
+
+        O buffer fica emprestado até recycle(frame): um consumidor atrasado
+        nunca tem o frame sobrescrito pela captura seguinte.
+        """
+        with self._lock:
+            if self._free:
+                buf = self._free.pop()
+            else:
+                # Todos emprestados (consumidor parado): cresce em vez de sobrescrever
+                buf = np.empty_like(self._pool[0])
+                self._pool.append(buf)
+                logger.warning(f"⚠️  Pool da câmera esgotado, agora com {len(self._pool)} buffers")
+        ok, frame = self.cap.read(buf)
+        if not ok or frame is not buf:
+            # Falha, ou o OpenCV alocou outro array (formato mudou): o buffer volta livre
+            self.recycle(buf)
+        return frame if ok else None
+
+    def recycle(self, frame: np.ndarray):
+        """Devolve ao pool o buffer de um frame já consumido (ignora arrays de fora)"""
+        with self._lock:
+            if any(frame is buf for buf in self._pool) and not any(frame is buf for buf in self._free):
+                self._free.append(frame)
+
+    def release(self):
+        if self.cap is not None:
+            self.cap.release()
+            self.cap = None
+
+
+class FrameConverter:
+    """Recorte + redução + conversão para RGB em áreas pré-alocadas"""
+
+    def __init__(self, max_pixels: int, source_rgb: bool = False):
+        self.source_rgb = source_rgb
+        self._resized = np.empty(max_pixels * 3, dtype=np.uint8)
+        self._rgb     = np.empty(max_pixels * 3, dtype=np.uint8)
+
+    def _view(self, name: str, h: int, w: int) -> np.ndarray:
+        """View contígua (h, w, 3) no início da área — sem alocar pixels"""
+        area = getattr(self, name)
+        if area.size < h * w * 3:  # câmera reconectada com resolução maior
+            area = np.empty(h * w * 3, dtype=np.uint8)
+            setattr(self, name, area)
+        return area[:h * w * 3].reshape(h, w, 3)
+
+    def convert(self, frame: np.ndarray, box: Tuple[int, int, int, int] = None,
+                scale: float = 1.0) -> np.ndarray:
+        """RGB contíguo do frame (ou do recorte box=(x0, y0, x1, y1) em pixels)"""
+        if box is not None:
+            x0, y0, x1, y1 = box
+            frame = frame[y0:y1, x0:x1]
+        if scale != 1.0:
+            h, w = max(1, int(frame.shape[0] * scale)), max(1, int(frame.shape[1] * scale))
+            frame = cv2.resize(frame, (w, h), dst=self._view("_resized", h, w),
+                               interpolation=cv2.INTER_AREA)
+
+        h, w = frame.shape[:2]
+        out = self._view("_rgb", h, w)
+        if self.source_rgb:
+            if frame.flags.c_contiguous:
+                return frame
+            np.copyto(out, frame)
+            return out
+        return cv2.cvtColor(frame, cv2.COLOR_BGR2RGB, dst=out)
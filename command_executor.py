@@ -0,0 +1,152 @@
+#!/usr/bin/env python3
+"""
+Executor de comandos: fila limitada + pool de threads + timeout + cancelamento.
+
+O reconhecimento só enfileira o comando e volta a escutar a hotword na hora;
+handlers lentos (desligar com contagem, modo trabalho, Spotify) rodam nas
+threads do pool. Threads Python não podem ser mortas, então timeout e
+cancelamento são cooperativos: o handler usa executor.sleep() / cancelled(),
+que retornam assim que o comando é cancelado.
+"""
+
+import time
+import queue
+import logging
+import itertools
+import threading
+from typing import Callable, Dict, Optional
+
+logger = logging.getLogger("Executor")
+
+DEFAULT_TIMEOUT = 30.0
+
+
+class CommandTask:
+    """Um comando enfileirado ou em execução"""
+
+    def __init__(self, task_id: int, name: str, fn: Callable, timeout: float):
+        self.id       = task_id
+        self.name     = name
+        self.fn       = fn
+        self.timeout  = timeout
+        self.state    = "pendente"
+        self.error: Optional[BaseException] = None
+        self._cancel  = threading.Event()
+        self._done    = threading.Event()
+
+    @property
+    def cancelled(self) -> bool:
+        return self._cancel.is_set()
+
+    def cancel(self, reason: str = "cancelado"):
+        if not self._done.is_set() and not self._cancel.is_set():
+            self.state = reason
+            self._cancel.set()
+
+    def wait(self, timeout: float = None) -> bool:
+        """Aguarda o término; retorna False se ainda estiver rodando"""
+        return self._done.wait(timeout)
+
+
+class CommandExecutor:
+    """Pool limitado de workers que consome uma fila de comandos"""
+
+    def __init__(self, max_workers: int = 2, max_pending: int = 8):
+        self._queue   = queue.Queue(maxsize=max_pending)
+        self._local   = threading.local()
+        self._ids     = itertools.count(1)
+        self._lock    = threading.Lock()
+        self._active: Dict[int, CommandTask] = {}
+        self._workers = []
+        for i in range(max_workers):
+            t = threading.Thread(target=self._worker, name=f"jarvis-cmd-{i}", daemon=True)
+            t.start()
+            self._workers.append(t)
+
+    # ── API para quem enfileira ──────────────────────────────────────────────
+
+    def submit(self, name: str, fn: Callable, timeout: float = DEFAULT_TIMEOUT) -> Optional[CommandTask]:
+        """Enfileira o comando; retorna None se a fila estiver cheia"""
+        task = CommandTask(next(self._ids), name, fn, timeout)
+        with self._lock:
+            self._active[task.id] = task
+        try:
+            self._queue.put_nowait(task)
+        except queue.Full:
+            logger.warning(f"⚠️  Fila de comandos cheia, descartando '{name}'")
+            self._finish(task)
+            return None
+        return task
+
+    def cancel_all(self) -> int:
+        """Cancela comandos pendentes e em execução; retorna quantos foram afetados"""
+        with self._lock:
+            tasks = list(self._active.values())
+        for task in tasks:
+            task.cancel()
+        return len(tasks)
+
+    def active(self):
+        """Comandos pendentes ou em execução"""
+        with self._lock:
+            return list(self._active.values())
+
+    # ── API para os handlers ─────────────────────────────────────────────────
+
+    def current(self) -> Optional[CommandTask]:
+        """Comando rodando na thread atual (None fora do pool)"""
+        return getattr(self._local, "task", None)
+
+    def cancelled(self) -> bool:
+        task = self.current()
+        return task is not None and task.cancelled
+
+    def sleep(self, seconds: float) -> bool:
+        """Espera interrompível; retorna False se o comando foi cancelado"""
+        task = self.current()
+        if task is None:
+            time.sleep(seconds)
+            return True
+        return not task._cancel.wait(seconds)
+
+    # ── Workers ──────────────────────────────────────────────────────────────
+
+    def _worker(self):
+        while True:
+            task = self._queue.get()
+            if task.cancelled:
+                self._finish(task)
+                logger.info(f"🚫 Comando '{task.name}' cancelado antes de iniciar")
+                continue
+
+            task.state = "executando"
+            self._local.task = task
+            timer = threading.Timer(task.timeout, self._expire, args=(task,))
+            timer.daemon = True
+            timer.start()
+            t0 = time.perf_counter()
+            try:
+                task.fn()
+                if task.cancelled:
+                    logger.warning(f"⏹️  Comando '{task.name}' interrompido ({task.state})")
+                else:
+                    task.state = "concluído"
+                    logger.info(f"✅ Comando '{task.name}' executado com sucesso! "
+                                f"({(time.perf_counter() - t0) * 1000:.0f} ms)")
+            except Exception as e:
+                task.state = "erro"
+                task.error = e
+                logger.error(f"❌ Erro ao executar comando '{task.name}': {e}")
+            finally:
+                timer.cancel()
+                self._local.task = None
+                self._finish(task)
+
+    def _expire(self, task: CommandTask):
+        logger.warning(f"⏱️  Comando '{task.name}' excedeu {task.timeout:.0f}s, cancelando")
+        task.cancel("timeout")
+
+    def _finish(self, task: CommandTask):
+        with self._lock:
+            self._active.pop(task.id, None)
+        task._done.set()
@@ -0,0 +1,209 @@
+#!/usr/bin/env python3
+"""
+Casamento de texto reconhecido com comandos, pré-compilado uma vez.
+
+Estágios (do mais confiável ao menos):
+  1. exato      → texto normalizado igual a uma frase
+  2. substring  → frase inteira dentro do texto (autômato Aho-Corasick)
+  3. fonético   → chave fonética igual ("musica"/"música", "ola"/"olá", "ora"/"hora")
+  4. fuzzy      → índice de trigramas gera candidatos, difflib só neles
+
+A normalização remove acentos e pontuação, então todos os índices trabalham
+sobre o mesmo texto "dobrado". Sem acentos, palavras curtas ficam parecidas
+demais ("tá" → "ta" ≈ "data"), por isso os estágios não exatos têm um piso
+de pontuação (MIN_SCORE). O custo por consulta depende do tamanho do
+texto e dos candidatos, não do número total de frases.
+"""
+
+import re
+import difflib
+import unicodedata
+from collections import defaultdict
+from dataclasses import dataclass
+from typing import Dict, Iterable, List, Optional
+
+MAX_CANDIDATES  = 20    # candidatos do índice de trigramas avaliados com difflib
+MIN_SCORE       = 0.6   # piso dos estágios não exatos
+
+SCORE_EXACT     = 1.0
+SCORE_SUBSTRING = 0.95
+SCORE_PHONETIC  = 0.9
+SCORE_FUZZY     = 0.85  # multiplicado pela similaridade
+
+# Similaridade mínima do fuzzy (texto inteiro ou janela de palavras): ≈ 0.71
+FUZZY_CUTOFF    = MIN_SCORE / SCORE_FUZZY
+
+
+@dataclass
+class Match:
+    command: str
+    score: float
+    method: str
+
+
+def fold(text: str) -> str:
+    """Minúsculas, sem acentos, sem pontuação, espaços simples"""
+    text = unicodedata.normalize("NFKD", text.lower())
+    text = "".join(ch for ch in text if not unicodedata.combining(ch))
+    text = re.sub(r"[^a-z0-9 ]+", " ", text)
+    return " ".join(text.split())
+
+
+_PHONETIC_RULES = [
+    (r"ch", "x"), (r"sh", "x"), (r"lh", "l"), (r"nh", "n"),
+    (r"qu(?=[ei])", "k"), (r"gu(?=[ei])", "g"),
+    (r"c(?=[ei])", "s"), (r"c", "k"), (r"q", "k"),
+    (r"ph", "f"), (r"z", "s"), (r"y", "i"), (r"w", "v"),
+    (r"h", ""),
+    (r"(.)\1+", r"\1"),
+]
+
+
+def phonetic(text: str) -> str:
+    """Chave fonética simples para português sobre o texto já dobrado"""
+    key = fold(text)
+    for pattern, repl in _PHONETIC_RULES:
+        key = re.sub(pattern, repl, key)
+    return key
+
+
+def _trigrams(text: str) -> set:
+    padded = f"  {text} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+class AhoCorasick:
+    """Autômato de Aho-Corasick para achar todas as frases contidas num texto"""
+
+    def __init__(self, patterns: Iterable[str]):
+        self._goto: List[Dict[str, int]] = [{}]
+        self._fail: List[int] = [0]
+        self._out:  List[List[str]] = [[]]
+        for pattern in patterns:
+            self._add(pattern)
+        self._build()
+
+    def _add(self, pattern: str):
+        state = 0
+        for ch in pattern:
+            nxt = self._goto[state].get(ch)
+            if nxt is None:
+                nxt = len(self._goto)
+                self._goto.append({})
+                self._fail.append(0)
+                self._out.append([])
+                self._goto[state][ch] = nxt
+            state = nxt
+        self._out[state].append(pattern)
+
+    def _build(self):
+        queue = list(self._goto[0].values())
+        for state in queue:
+            for ch, nxt in self._goto[state].items():
+                queue.append(nxt)
+                f = self._fail[state]
+                while f and ch not in self._goto[f]:
+                    f = self._fail[f]
+                self._fail[nxt] = self._goto[f].get(ch, 0)
+                self._out[nxt] = self._out[nxt] + self._out[self._fail[nxt]]
+
+    def find(self, text: str) -> List[str]:
+        """Todas as frases encontradas no texto (com repetição, na ordem de término)"""
+        found = []
+        state = 0
+        for ch in text:
+            while state and ch not in self._goto[state]:
+                state = self._fail[state]
+            state = self._goto[state].get(ch, 0)
+            if self._out[state]:
+                found.extend(self._out[state])
+        return found
+
+
+class CommandMatcher:
+    """Índices de comandos montados uma vez; consulta retorna candidatos pontuados"""
+
+    def __init__(self, phrases: Iterable[str]):
+        self._by_folded: Dict[str, str] = {}
+        self._by_phonetic: Dict[str, str] = {}
+        self._trigram_index: Dict[str, set] = defaultdict(set)
+        self._word_counts = set()
+
+        for phrase in phrases:
+            folded = fold(phrase)
+            if not folded or folded in self._by_folded:
+                continue
+            self._by_folded[folded] = phrase
+            self._by_phonetic.setdefault(phonetic(folded), phrase)
+            self._word_counts.add(len(folded.split()))
+            for tri in _trigrams(folded):
+                self._trigram_index[tri].add(folded)
+
+        # Padding com espaços garante que só palavras inteiras casem ("hora" ≠ "agora")
+        self._automaton = AhoCorasick(f" {f} " for f in self._by_folded)
+
+    def __len__(self):
+        return len(self._by_folded)
+
+    def _windows(self, words: List[str]):
+        for n in sorted(self._word_counts):
+            for i in range(len(words) - n + 1):
+                yield " ".join(words[i:i + n])
+
+    def _fuzzy(self, query: str, scores: Dict[str, Match]):
+        cutoff = FUZZY_CUTOFF
+        counts: Dict[str, int] = defaultdict(int)
+        for tri in _trigrams(query):
+            for folded in self._trigram_index.get(tri, ()):
+                counts[folded] += 1
+        best = sorted(counts, key=counts.get, reverse=True)[:MAX_CANDIDATES]
+
+        matcher = difflib.SequenceMatcher(b=query, autojunk=False)
+        for folded in best:
+            matcher.set_seq1(folded)
+            if matcher.real_quick_ratio() < cutoff or matcher.quick_ratio() < cutoff:
+                continue
+            ratio = matcher.ratio()
+            if ratio >= cutoff:
+                self._add(scores, self._by_folded[folded], SCORE_FUZZY * ratio, "fuzzy")
+
+    @staticmethod
+    def _add(scores: Dict[str, Match], command: str, score: float, method: str):
+        current = scores.get(command)
+        if current is None or score > current.score:
+            scores[command] = Match(command, round(score, 4), method)
+
+    def match(self, text: str, limit: int = 5) -> List[Match]:
+        """Candidatos ordenados por pontuação (maior primeiro)"""
+        folded = fold(text)
+        if not folded:
+            return []
+
+        scores: Dict[str, Match] = {}
+        exact = self._by_folded.get(folded)
+        if exact:
+            self._add(scores, exact, SCORE_EXACT, "exato")
+
+        # Frases mais longas contidas no texto pesam um pouco mais
+        for hit in self._automaton.find(f" {folded} "):
+            hit = hit.strip()
+            bonus = min(len(hit), 20) / 1000
+            self._add(scores, self._by_folded[hit], SCORE_SUBSTRING + bonus, "substring")
+
+        words = folded.split()
+        for window in [folded, *self._windows(words)]:
+            phrase = self._by_phonetic.get(phonetic(window))
+            if phrase:
+                self._add(scores, phrase, SCORE_PHONETIC, "fonético")
+
+        if not scores:
+            self._fuzzy(folded, scores)
+            for window in self._windows(words):
+                self._fuzzy(window, scores)
+
+        return sorted(scores.values(), key=lambda m: m.score, reverse=True)[:limit]
+
+    def best(self, text: str) -> Optional[Match]:
+        """Melhor candidato ou None"""
+        matches = self.match(text, limit=1)
+        return matches[0] if matches else None
@@ -8,20 +8,40 @@ Gestos:
   - Pinça mantida + mover esquerda                → seta esquerda
   - Indicador + médio levantados, mover pra cima → volume +10%
   - Indicador + médio levantados, mover pra baixo → volume -10%
+
+Pipeline guiado pela câmera: uma thread de captura deixa só o frame mais
+recente num slot (com o instante monotônico da captura), a thread de
+processamento entrega cada frame novo ao MediaPipe e os gestos são avaliados
+no próprio callback do resultado, com o tempo da captura. A latência
+captura → ação de cada gesto é medida.
+
+O FrameScheduler decide quais frames processar: sem mão à vista, poucos fps
+em resolução reduzida (os frames pulados nem são decodificados, só grab());
+com a mão detectada, taxa da câmera e recorte (ROI) em volta da última
+posição da mão. Durante o reconhecimento de fala e com o áudio atrasado a
+taxa cai para liberar CPU. Captura e conversão para RGB reaproveitam buffers
+pré-alocados (camera.py). Os landmarks viram arrays (21, 3), passam por um
+filtro One-Euro (posição e velocidade suavizadas, compartilhadas por todas
+as regras) e a decisão do gesto é de um classificador trocável
+(landmarks.py: regras de limiar ou kNN treinado).
 """
 
 import os
+import json
 import time
 import logging
 import threading
 import collections
 import subprocess
-import cv2
 import mediapipe as mp
 from mediapipe.tasks import python as mp_python
 from mediapipe.tasks.python import vision as mp_vision
 import pyautogui
 
+from latency import LatencyTracker
+from camera import Camera, FrameConverter
+from landmarks import OneEuroFilter, PALM_WEIGHTS, PINCH, TWO_UP, to_array, load_classifier
+
 pyautogui.FAILSAFE = False
 
 logger = logging.getLogger("Gestures")
@@ -29,28 +49,85 @@ logger = logging.getLogger("Gestures")
 MODEL_PATH     = os.path.join(os.path.dirname(__file__), "hand_landmarker.task")
 VOL_STEP          = 10    # % por gesto
 VOL_COOLDOWN      = 0.3   # segundos entre ajustes de volume
-VOL_VELOCITY_DOWN = 0.18  # velocidade mínima para volume - (mão pra baixo)
-VOL_VELOCITY_UP   = 0.12  # velocidade mínima para volume + (mão pra cima, mais sensível)
-PINCH_VELOCITY    = 0.20  # velocidade mínima horizontal para seta (pinça)
+VOL_VELOCITY_DOWN = 0.18  # velocidade suavizada mínima para volume - (mão pra baixo)
+VOL_VELOCITY_UP   = 0.12  # velocidade suavizada mínima para volume + (mão pra cima, mais sensível)
+PINCH_VELOCITY    = 0.20  # velocidade suavizada mínima horizontal para seta (pinça)
+GESTURE_MIN_FRAMES = 3    # frames no gesto antes de confiar na velocidade
 PINCH_COOLDOWN    = 0.4   # segundos entre setas
+BACKOFF_INTERVAL  = 0.15  # intervalo mínimo entre frames com o áudio atrasado (~6 fps)
+IDLE_INTERVAL     = 0.25  # sem mão à vista: ~4 fps...
+IDLE_SCALE        = 0.5   # ...em meia resolução
+IDLE_TIMEOUT      = 1.5   # s sem mão até voltar ao modo ocioso
+BUSY_INTERVAL     = 0.1   # ASR rodando: no máximo ~10 fps
+ROI_MARGIN        = 0.5   # margem do recorte em volta da mão (fração do tamanho da mão)
+ROI_MIN_SIZE      = 0.35  # lado mínimo do recorte (fração do frame)
 
 
-def _dist(p1, p2) -> float:
-    return ((p1.x - p2.x) ** 2 + (p1.y - p2.y) ** 2) ** 0.5
-
+class FrameScheduler:
+    """Decide quando e em que resolução/recorte processar o próximo frame"""
 
-def _is_pinch(lm) -> bool:
-    return _dist(lm[4], lm[8]) < 0.08
-
-
-def _is_two_fingers_up(lm) -> bool:
-    """Indicador + médio estendidos, anelar + mínimo dobrados."""
-    return (
-        lm[8].y  < lm[6].y  < lm[5].y   and  # indicador
-        lm[12].y < lm[10].y < lm[9].y   and  # médio
-        lm[16].y > lm[14].y              and  # anelar dobrado
-        lm[20].y > lm[18].y                   # mínimo dobrado
-    )
+    def __init__(self):
+        self.active         = False  # mão vista recentemente
+        self.busy           = False  # ASR rodando
+        self.backoff        = False  # áudio da hotword atrasado
+        self.last_hand      = float("-inf")
+        self.last_processed = float("-inf")
+        self.roi            = None   # (x0, y0, x1, y1) normalizado, em volta da última mão
+
+    def interval(self) -> float:
+        interval = 0.0 if self.active else IDLE_INTERVAL  # ativo: taxa da câmera
+        if self.backoff:
+            interval = max(interval, BACKOFF_INTERVAL)
+        if self.busy:
+            interval = max(interval, BUSY_INTERVAL)
+        return interval
+
+    def due(self, now: float) -> bool:
+        """O próximo frame deve ser processado? (tolerância de meio frame)"""
+        return now - self.last_processed >= self.interval() - 0.015
+
+    def plan(self, shape, captured: float):
+        """Como converter o frame: (recorte em pixels, escala, recorte normalizado)
+
+        Ocioso → frame inteiro reduzido; ativo → recorte da ROI (ou frame
+        inteiro, se a mão sumiu). A conversão em si fica com o FrameConverter.
+        """
+        self.last_processed = captured
+        if not self.active:
+            return None, IDLE_SCALE, None
+        if self.roi is None:
+            return None, 1.0, None
+        h, w = shape[:2]
+        x0, y0, x1, y1 = self.roi
+        px0, py0, px1, py1 = int(x0 * w), int(y0 * h), int(x1 * w), int(y1 * h)
+        crop = (px0 / w, py0 / h, (px1 - px0) / w, (py1 - py0) / h)
+        return (px0, py0, px1, py1), 1.0, crop
+
+    def update(self, hands, crop, captured: float):
+        """Converte landmarks do recorte para o frame inteiro e atualiza o estado"""
+        if crop is not None and hands:
+            cx, cy, cw, ch = crop
+            for lm in hands:  # arrays (21, 3), ajustados no lugar
+                lm[:, 0] = cx + lm[:, 0] * cw
+                lm[:, 1] = cy + lm[:, 1] * ch
+
+        if hands:
+            if not self.active:
+                logger.info("🖐️  Mão detectada, gestos em taxa máxima")
+            self.active = True
+            self.last_hand = captured
+            lo, hi = hands[0][:, :2].min(axis=0), hands[0][:, :2].max(axis=0)
+            size = float((hi - lo).max())
+            half = max(size * (0.5 + ROI_MARGIN), ROI_MIN_SIZE / 2)
+            cx, cy = ((hi + lo) / 2).tolist()
+            self.roi = (max(0.0, cx - half), max(0.0, cy - half),
+                        min(1.0, cx + half), min(1.0, cy + half))
+        else:
+            self.roi = None  # perdeu a mão no recorte: próximo frame inteiro
+            if self.active and captured - self.last_hand > IDLE_TIMEOUT:
+                self.active = False
+                logger.info("💤 Sem mão à vista, gestos em modo ocioso")
+        return hands
 
 
 def _set_volume(delta: int):
@@ -64,17 +141,42 @@ def _set_volume(delta: int):
 
 class GestureController:
 
-    def __init__(self):
+    def __init__(self, latency: LatencyTracker = None):
+        self._init_state(latency)
+        self.landmarker = self._create_landmarker()
+
+    def _init_state(self, latency: LatencyTracker = None):
+        """Estado dos gestos (sem câmera nem MediaPipe; usado também pelos benchmarks)"""
         self.running    = False
         self._thread    = None
+        self._capture_thread = None
+        self._slot_cond = threading.Condition()
+        self._slot      = None  # (frame BGR, instante monotônico da captura, câmera dona do buffer)
+        self.frames_captured = 0
+        self.frames_dropped  = 0  # substituídos no slot antes de serem processados
+        self.frames_skipped  = 0  # pulados pelo scheduler (só grab, sem decodificar)
+        self.scheduler  = FrameScheduler()
+        # (timestamp_ms, recorte) dos frames enviados ao MediaPipe, em ordem; escrito
+        # pela thread de processamento e lido no callback do MediaPipe
+        self._crops     = collections.deque(maxlen=64)
+        self._crops_lock = threading.Lock()
+        # Latência captura → resultado e captura → ação (compartilhada com o Jarvis)
+        self.latency = latency or LatencyTracker(interval=0)
         self._lock      = threading.Lock()
         self._landmarks = []
+        self._filter    = OneEuroFilter(smooth_position=False)  # só a velocidade: as regras veem os landmarks crus
+        self.classifier = load_classifier()
         self._alt_held      = False
-        self._vol_history: collections.deque   = collections.deque(maxlen=20)
+        self._vol_frames    = 0  # frames seguidos no gesto de volume (desde a última ação)
         self._last_vol_t    = 0.0
-        self._pinch_history: collections.deque = collections.deque(maxlen=20)
+        self._pinch_frames  = 0  # idem para a pinça
         self._last_pinch_t  = 0.0
+        self.backoff        = False  # áudio atrasado: a hotword tem prioridade
+        # Grava os landmarks em JSONL para replay/benchmark (JARVIS_GESTURE_RECORD=arquivo)
+        record_path = os.getenv("JARVIS_GESTURE_RECORD", "")
+        self._record = open(record_path, "a") if record_path else None
 
+    def _create_landmarker(self):
         base_options = mp_python.BaseOptions(model_asset_path=MODEL_PATH)
         options = mp_vision.HandLandmarkerOptions(
             base_options=base_options,
@@ -85,106 +187,144 @@ class GestureController:
             min_tracking_confidence=0.55,
             result_callback=self._on_result
         )
-        self.landmarker = mp_vision.HandLandmarker.create_from_options(options)
+        return mp_vision.HandLandmarker.create_from_options(options)
+
+    def set_busy(self, enabled: bool):
+        """Reduz a taxa de frames enquanto o ASR está rodando"""
+        self.scheduler.busy = enabled
+
+    def set_backoff(self, enabled: bool):
+        """Reduz a taxa de frames enquanto o caminho da hotword está atrasado"""
+        if enabled != self.backoff:
+            self.backoff = enabled
+            self.scheduler.backoff = enabled
+            if enabled:
+                logger.info("🐢 Áudio atrasado, gestos desacelerados")
+            else:
+                logger.info("🐇 Áudio em dia, gestos na taxa normal")
 
     def _on_result(self, result, output_image, timestamp_ms):
+        """Callback do MediaPipe: guarda os landmarks e avalia os gestos na hora"""
+        try:
+            self._on_result_inner(result, timestamp_ms)
+        except Exception as e:
+            logger.warning(f"⚠️  Erro no resultado dos gestos (ignorado): {e}")
+
+    def _take_crop(self, timestamp_ms: int):
+        """Recorte usado no frame; descarta os de frames que o MediaPipe pulou"""
+        with self._crops_lock:
+            while self._crops and self._crops[0][0] < timestamp_ms:
+                self._crops.popleft()
+            if self._crops and self._crops[0][0] == timestamp_ms:
+                return self._crops.popleft()[1]
+        return None
+
+    def _on_result_inner(self, result, timestamp_ms):
+        captured = timestamp_ms / 1000  # o timestamp do frame é o instante da captura
+        self.latency.record("gesto:captura→resultado", time.monotonic() - captured)
+        crop = self._take_crop(timestamp_ms)
+        hands = [to_array(hand) for hand in result.hand_landmarks or []]
+        hands = self.scheduler.update(hands, crop, captured)
         with self._lock:
-            self._landmarks = result.hand_landmarks or []
+            self._landmarks = hands
+        if self._record is not None:
+            hands = [lm.tolist() for lm in hands]
+            self._record.write(json.dumps({"t": captured, "hands": hands}) + "\n")
+        self._check_gestures(captured)
 
-    def _check_gestures(self):
+    def _check_gestures(self, now: float = None):
         try:
-            self._check_gestures_inner()
+            self._check_gestures_inner(now)
         except Exception as e:
             logger.warning(f"⚠️  Erro em _check_gestures (ignorado): {e}")
 
-    def _check_gestures_inner(self):
+    def _action(self, name: str, captured: float):
+        """Registra a latência entre a captura do frame e a ação disparada"""
+        self.latency.record(f"gesto:{name}", time.monotonic() - captured)
+
+    def _check_gestures_inner(self, now: float = None):
+        """Avalia as regras; `now` é o instante da captura do frame (monotônico)"""
+        now = time.monotonic() if now is None else now
         with self._lock:
             hands = list(self._landmarks)
 
         lm = hands[0] if hands else None
-        pinching = lm is not None and _is_pinch(lm)
+        if lm is not None:
+            # O classificador vê os landmarks crus, como nas gravações de treino
+            # (JARVIS_GESTURE_RECORD); o filtro só suaviza a velocidade dos movimentos
+            label = self.classifier.predict(lm)
+            _, velocity = self._filter.update(now, lm)
+            palm_velocity = (PALM_WEIGHTS @ velocity).tolist()  # média de 5 pontos: menos ruído que o pulso
+        else:
+            self._filter.reset()
+            label = None
 
         # ── Pinça: Alt+Tab ao fechar, setas ao mover com pinça ──────────
-        if pinching:
+        if label == PINCH:
             if not self._alt_held:
                 logger.info("🤙 Pinça → Alt segurado + Tab")
                 pyautogui.keyDown("alt")
                 pyautogui.press("tab")
                 self._alt_held = True
-
-            now = time.time()
-            wrist_x = lm[0].x
-            self._pinch_history.append((now, wrist_x))
-
-            window = [(t, x) for t, x in self._pinch_history if now - t <= 0.3]
-            if len(window) >= 4:
-                dx = window[-1][1] - window[0][1]
-                dt = window[-1][0] - window[0][0]
-                if dt > 0:
-                    velocity = dx / dt  # positivo = mão indo pra direita
-                    if abs(velocity) > PINCH_VELOCITY and now - self._last_pinch_t >= PINCH_COOLDOWN:
-                        if velocity > 0:
-                            pyautogui.press("right")
-                            logger.info("👉 Pinça direita → seta direita")
-                        else:
-                            pyautogui.press("left")
-                            logger.info("👈 Pinça esquerda → seta esquerda")
-                        self._last_pinch_t = now
-                        self._pinch_history.clear()
+                self._action("alt+tab", now)
+
+            self._pinch_frames += 1
+            if self._pinch_frames >= GESTURE_MIN_FRAMES:
+                vx = palm_velocity[0]  # positivo = mão indo pra direita
+                if abs(vx) > PINCH_VELOCITY and now - self._last_pinch_t >= PINCH_COOLDOWN:
+                    if vx > 0:
+                        pyautogui.press("right")
+                        logger.info("👉 Pinça direita → seta direita")
+                    else:
+                        pyautogui.press("left")
+                        logger.info("👈 Pinça esquerda → seta esquerda")
+                    self._action("seta", now)
+                    self._last_pinch_t = now
+                    self._pinch_frames = 0
         else:
-            self._pinch_history.clear()
+            self._pinch_frames = 0
             if self._alt_held:
                 logger.info("✋ Pinça solta → Alt liberado")
                 pyautogui.keyUp("alt")
                 self._alt_held = False
 
         # ── Volume: indicador + médio levantados, move pra cima/baixo ───
-        if lm is not None and _is_two_fingers_up(lm):
-            now   = time.time()
-            wrist_y = lm[0].y
-            self._vol_history.append((now, wrist_y))
-
-            window = [(t, y) for t, y in self._vol_history if now - t <= 0.3]
-            if len(window) >= 4:
-                dy = window[-1][1] - window[0][1]
-                dt = window[-1][0] - window[0][0]
-                if dt > 0:
-                    velocity = dy / dt  # positivo = mão descendo (y aumenta)
-                    going_up   = velocity < 0 and abs(velocity) > VOL_VELOCITY_UP
-                    going_down = velocity > 0 and abs(velocity) > VOL_VELOCITY_DOWN
-                    if (going_up or going_down) and now - self._last_vol_t >= VOL_COOLDOWN:
-                        if going_down:
-                            _set_volume(-VOL_STEP)   # mão pra baixo = volume -
-                        else:
-                            _set_volume(+VOL_STEP)   # mão pra cima = volume +
-                        self._last_vol_t = now
-                        self._vol_history.clear()
+        if label == TWO_UP:
+            self._vol_frames += 1
+            if self._vol_frames >= GESTURE_MIN_FRAMES:
+                vy = palm_velocity[1]  # positivo = mão descendo (y aumenta)
+                going_up   = vy < 0 and abs(vy) > VOL_VELOCITY_UP
+                going_down = vy > 0 and abs(vy) > VOL_VELOCITY_DOWN
+                if (going_up or going_down) and now - self._last_vol_t >= VOL_COOLDOWN:
+                    if going_down:
+                        _set_volume(-VOL_STEP)   # mão pra baixo = volume -
+                    else:
+                        _set_volume(+VOL_STEP)   # mão pra cima = volume +
+                    self._action("volume", now)
+                    self._last_vol_t = now
+                    self._vol_frames = 0
         else:
-            self._vol_history.clear()
+            self._vol_frames = 0
 
     def _open_camera(self):
         for idx in [0, 1, 2]:
-            c = cv2.VideoCapture(idx)
-            ret, _ = c.read()
-            if ret:
-                logger.info(f"📷 Usando câmera {idx}")
-                return c
-            c.release()
+            camera = Camera(idx)
+            if camera.open():
+                return camera
         return None
 
-    def _loop(self):
-        cap = self._open_camera()
-        if cap is None:
-            logger.error("❌ Webcam não encontrada")
-            return
-
-        logger.info("✅ Gestos iniciados")
-        timestamp = 0
+    def _capture_loop(self, cap):
+        """Lê a câmera no ritmo dela e deixa só o frame mais recente no slot"""
         consecutive_failures = 0
-
         while self.running:
             try:
-                ret, frame = cap.read()
+                if not self.scheduler.due(time.monotonic()):
+                    # Frame que não será processado: descarta sem decodificar
+                    ret, frame = cap.grab(), None
+                else:
+                    frame = cap.read()  # num buffer do pool da Camera
+                    ret = frame is not None
+                captured = time.monotonic()
                 if not ret:
                     consecutive_failures += 1
                     if consecutive_failures >= 30:
@@ -199,24 +339,82 @@ class GestureController:
                     continue
 
                 consecutive_failures = 0
-                rgb      = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
-                mp_image = mp.Image(image_format=mp.ImageFormat.SRGB, data=rgb)
-                self.landmarker.detect_async(mp_image, timestamp)
-                timestamp += 33
+                if frame is None:
+                    self.frames_skipped += 1
+                    continue
+                with self._slot_cond:
+                    stale, self._slot = self._slot, (frame, captured, cap)
+                    self.frames_captured += 1
+                    self._slot_cond.notify()
+                if stale is not None:
+                    self.frames_dropped += 1
+                    stale[2].recycle(stale[0])
+            except Exception as e:
+                logger.warning(f"⚠️  Erro na captura de gestos (continuando): {e}")
+                time.sleep(0.1)
+
+        if cap is not None:
+            cap.release()
+        self.running = False
+        with self._slot_cond:
+            self._slot_cond.notify_all()
 
-                self._check_gestures()
-                time.sleep(0.03)
+    def _next_frame(self):
+        """Bloqueia até haver um frame novo no slot (None ao parar)"""
+        with self._slot_cond:
+            self._slot_cond.wait_for(lambda: self._slot is not None or not self.running)
+            item, self._slot = self._slot, None
+            return item
+
+    def _loop(self):
+        cap = self._open_camera()
+        if cap is None:
+            logger.error("❌ Webcam não encontrada")
+            self.running = False
+            return
+
+        converter = FrameConverter(cap.shape[0] * cap.shape[1], source_rgb=cap.rgb)
+        logger.info("✅ Gestos iniciados")
+        self._capture_thread = threading.Thread(target=self._capture_loop, args=(cap,),
+                                                name="jarvis-camera", daemon=True)
+        self._capture_thread.start()
+        last_timestamp = -1
+
+        while self.running:
+            try:
+                item = self._next_frame()
+                if item is None:
+                    break
+                frame, captured, camera = item
+
+                box, scale, crop = self.scheduler.plan(frame.shape, captured)
+                try:
+                    rgb      = converter.convert(frame, box, scale)
+                    mp_image = mp.Image(image_format=mp.ImageFormat.SRGB, data=rgb)
+                finally:
+                    camera.recycle(frame)  # o mp.Image já copiou os pixels
+                # Timestamp = instante da captura; os gestos são avaliados no _on_result
+                timestamp = max(int(captured * 1000), last_timestamp + 1)
+                with self._crops_lock:
+                    self._crops.append((timestamp, crop))
+                self.landmarker.detect_async(mp_image, timestamp)
+                last_timestamp = timestamp
 
             except Exception as e:
                 logger.warning(f"⚠️  Erro no loop de gestos (continuando): {e}")
                 time.sleep(0.1)
 
+        if self._capture_thread is not None:
+            self._capture_thread.join(timeout=1.0)
         if self._alt_held:
             pyautogui.keyUp("alt")
 
-        cap.release()
         self.landmarker.close()
-        logger.info("🔇 Gestos encerrados")
+        if self._record is not None:
+            self._record.close()
+        logger.info(f"🔇 Gestos encerrados ({self.frames_captured} frames capturados, "
+                    f"{self.frames_dropped} descartados por atraso, "
+                    f"{self.frames_skipped} pulados pelo scheduler)")
 
     def start(self):
         if self.running:
@@ -227,3 +425,5 @@ class GestureController:
 
     def stop(self):
         self.running = False
+        with self._slot_cond:
+            self._slot_cond.notify_all()
@@ -11,18 +11,27 @@ import subprocess
 import threading
 import queue
 import json
+import wave
+import argparse
+from collections import deque
+from concurrent.futures import Future
 from typing import Dict, Callable, Optional
 import sounddevice as sd
 import numpy as np
 import pvporcupine
-import whisper
-import difflib
 from pathlib import Path
-from gestures import GestureController
 from jarvis_gui import JarvisGUI
-import pygame
-from gtts import gTTS
-import tempfile
+from audio_buffer import AudioRingBuffer, FrameAligner, BlockQueue, AudioStats
+from vad import VoiceActivityEndpointer
+from asr import ASRResult, create_backend, normalize_text, VoskGrammarBackend
+from asr_worker import ASRWorker, parse_cpus
+from speculative import StableHypothesis, ambiguous_prefixes
+from command_matcher import CommandMatcher, SCORE_PHONETIC
+from command_executor import CommandExecutor, DEFAULT_TIMEOUT
+from app_launcher import AppLauncher, WORK_APPS
+from audio_player import AudioPlayer
+from tts import create_tts, ClockPrerenderer
+from latency import LatencyTracker, Trace
 import os
 from datetime import datetime
 
@@ -31,9 +40,41 @@ class JarvisFinal:
     """Versão final do assistente Jarvis"""
     
     def __init__(self, hotword: str = "jarvis"):
+        self._init_state(hotword)
+        
+        # Configuração de logging
+        self._setup_logging()
+        self.latency.start()
+        
+        # Estágio 1: o mínimo para escutar a hotword
+        self._run_stage("cmatrix", self._start_cmatrix)
+        self._run_stage("hotword", self._init_porcupine, lambda: self.porcupine is not None)
+        self._run_stage("comandos", self._init_command_mapping)
+        self._run_stage("painel", self._init_gui, lambda: self.gui is not None)
+
+        # Estágio 2: modelos pesados e som em threads de segundo plano
+        self._start_background_loading()
+        
+        elapsed_ms = (time.perf_counter() - self._startup_t0) * 1000
+        self.logger.info(f"Jarvis Final inicializado em {elapsed_ms:.0f} ms "
+                         f"(modelos carregando em segundo plano)")
+    
+    @classmethod
+    def headless(cls, hotword: str = "jarvis") -> "JarvisFinal":
+        """Instância sem dispositivos, painel nem modelos (lote, replay, benchmarks)"""
+        jarvis = cls.__new__(cls)
+        jarvis._init_state(hotword)
+        jarvis.logger = logging.getLogger('JarvisFinal')
+        jarvis._init_command_mapping()
+        return jarvis
+    
+    def _init_state(self, hotword: str):
+        """Atributos e configurações (sem abrir dispositivos nem carregar modelos)"""
         self.hotword = hotword.lower()
         self.is_listening = False
         self.is_processing_command = False
+        # Pedido de encerramento ("fechar" roda no pool: exit() ali só mataria o worker)
+        self.shutdown_requested = threading.Event()
         
         # Configurações personalizáveis
         self.nome = "Gustavo"  # Nome para personalização
@@ -43,27 +84,57 @@ class JarvisFinal:
         # Configuração de áudio
         self.sample_rate = 16000
         self.chunk_size = 1024
-        self.audio_queue = queue.Queue()
+        # (posição final do bloco, instante do callback); cheia, descarta o mais antigo
+        self.audio_queue = BlockQueue(maxsize=32)
+        self.audio_stats = AudioStats()
+        self.backlog_blocks = 3  # blocos pendentes (~190 ms) que indicam atraso da hotword
+        self.backlog_recover = 2.0  # s sem atraso para devolver a taxa normal aos gestos
+        self.stats_interval = 60.0  # s entre avisos de contadores de áudio alterados
+        self.command_duration = 5  # duração máxima do comando após a hotword (s)
+        self.vad = VoiceActivityEndpointer(self.sample_rate, hangover_ms=300,
+                                           max_length=self.command_duration)
+        # ~10 s de int16; capacidade múltipla do frame do Porcupine (512) e do VAD (320)
+        self.audio_ring = AudioRingBuffer(2560 * 64, dtype=np.int16)
+        self.hotword_position = 0  # posição absoluta do frame que disparou a hotword
+        self.grammar_confidence = 0.85  # abaixo disso, o caminho rápido cai no ASR completo
+        self.speculative = True  # decide o comando enquanto o usuário ainda fala
+        self.speculative_interval = 0.5  # s entre transcrições parciais com o ASR completo
+        self.speculative_hold = 0.2  # s de áudio com a mesma hipótese para confirmar
+        self.grammar_stable_frames = 6  # frames do VAD (20 ms) com a mesma parcial da gramática
+        # Whisper local não é reentrante (hooks de kv-cache no modelo) e o worker
+        # atende um pedido por vez: transcrições parciais e a final passam por aqui
+        self._asr_lock = threading.Lock()
+        self._partial = None  # (amostras cobertas, Future do ASRResult) da especulação atual
+        self._partial_lock = threading.Lock()  # publicação do _partial × fim da captura
+        self.capture_dir = os.getenv("JARVIS_CAPTURE_DIR", "")  # guarda os comandos capturados (WAV)
         
-        # Configuração de logging
-        self._setup_logging()
-        
-        # Iniciar cmatrix em tela separada (após logger estar pronto)
-        self._start_cmatrix()
+        # Execução de comandos fora da thread de reconhecimento
+        self.executor = CommandExecutor(max_workers=2, max_pending=8)
+        self.command_timeouts = {"desliga": 15, "trabalho": 25, "música": 10, "musica": 10}
+        self.immediate_commands = {"cancela"}  # rodam na hora, sem passar pela fila
+        self.app_launcher = AppLauncher()
         
-        # Inicialização dos componentes
-        self._init_pygame()
-        self._init_tts()
-        self._init_porcupine()
-        self._init_whisper()
-        self._init_command_mapping()
-        self._init_gestures()
-        self._init_gui()
-
-        # Tocar som de inicialização
-        self._play_startup_sound()
+        # Componentes carregados em segundo plano (None até ficarem prontos)
+        self.asr = None
+        self.grammar_asr = None
+        self.gesture_controller = None
+        self.player = None
+        self.sound_ready = False
+        self.tts = None
+        self.clock_prerenderer = None
+        self.component_status: Dict[str, str] = {}
+        self.startup_timings: Dict[str, float] = {}
+        self._ready: Dict[str, threading.Event] = {}
+        self._startup_t0 = time.perf_counter()
+        self.porcupine = None
+        self.gui = None
+        self.command_thread = None
         
-        self.logger.info("Jarvis Final inicializado com sucesso!")
+        # Latência por estágio do caminho da hotword (resumo periódico no log)
+        self.latency = LatencyTracker()
+        self._last_backlog = 0.0
+        self._last_stats_report = time.monotonic()
+        self._reported_stats = {}
     
     def _setup_logging(self):
         """Configura o sistema de logging"""
@@ -77,136 +148,154 @@ class JarvisFinal:
         )
         self.logger = logging.getLogger('JarvisFinal')
     
-    def _init_pygame(self):
-        """Inicializa o pygame para reprodução de sons"""
+    def _run_stage(self, name: str, init: Callable, check: Callable = None):
+        """Executa um estágio de inicialização medindo o tempo e publicando o status"""
+        event = self._ready.setdefault(name, threading.Event())
+        self.component_status[name] = "carregando"
+        t0 = time.perf_counter()
+        try:
+            init()
+            ok = check() if check else True
+        except Exception as e:
+            self.logger.error(f"❌ Erro no estágio '{name}': {e}")
+            ok = False
+        self.startup_timings[name] = time.perf_counter() - t0
+        self.component_status[name] = "pronto" if ok else "falhou"
+        event.set()
+
+    def _start_background_loading(self):
+        """Carrega ASR, gramática, gestos e som em paralelo, fora do caminho da escuta"""
+        stages = [
+            ("gramática", self._init_grammar, lambda: self.grammar_asr is not None),
+            ("asr", self._init_asr, lambda: self.asr is not None),
+            ("gestos", self._init_gestures, lambda: self.gesture_controller is not None),
+            ("som", self._init_sound, lambda: self.sound_ready),
+            ("voz", self._init_tts, lambda: self.tts is not None),
+        ]
+        threads = []
+        for name, init, check in stages:
+            self._ready.setdefault(name, threading.Event())
+            self.component_status[name] = "carregando"
+            t = threading.Thread(target=self._run_stage, args=(name, init, check), daemon=True)
+            t.start()
+            threads.append(t)
+
+        def report():
+            for t in threads:
+                t.join()
+            total_ms = (time.perf_counter() - self._startup_t0) * 1000
+            breakdown = ", ".join(f"{name} {secs * 1000:.0f} ms"
+                                  for name, secs in self.startup_timings.items())
+            self.logger.info(f"⏱️  Inicialização completa em {total_ms:.0f} ms — {breakdown}")
+
+        threading.Thread(target=report, daemon=True).start()
+
+    def _wait_ready(self, name: str, timeout: float = 60.0) -> bool:
+        """Aguarda um componente de segundo plano (uso sob demanda)"""
+        event = self._ready.get(name)
+        if event is None or event.is_set():
+            return True
+        self.logger.info(f"⏳ Aguardando '{name}' terminar de carregar...")
+        return event.wait(timeout)
+
+    def _init_sound(self):
+        """Inicializa o player (sons pré-decodificados) e toca o som de inicialização"""
         try:
-            pygame.mixer.init()
-            self.logger.info("✅ Pygame inicializado para reprodução de sons")
+            player = AudioPlayer(base_dir=os.getcwd())
+            player.start()
+            self.player = player
+            self.sound_ready = True
+            self.logger.info(f"✅ Player de áudio inicializado ({len(player.sounds)} sons em memória)")
+            self._play_startup_sound()
         except Exception as e:
-            self.logger.warning(f"⚠️  Erro ao inicializar pygame: {e}")
+            self.logger.warning(f"⚠️  Erro ao inicializar player de áudio: {e}")
             self.logger.info("💡 Som de ativação não estará disponível")
     
+    def _play_sound(self, name: str, wait: bool = False, timeout: float = 30.0):
+        """Toca um som pré-carregado sem bloquear; com wait=True aguarda o Future"""
+        if self.player is None:
+            return None
+        future = self.player.play(name)
+
+        def report(f):
+            if f.exception() is not None:
+                self.logger.warning(f"⚠️  Erro ao reproduzir {name}: {f.exception()}")
+
+        future.add_done_callback(report)
+        if wait:
+            try:
+                future.result(timeout=timeout)
+            except Exception:
+                pass
+        return future
+    
     def _init_tts(self):
-        """Inicializa o sistema de síntese de voz com gTTS"""
-        # TTS desabilitado por enquanto - descomente quando quiser usar
-        self.tts_lang = None
-        self.tts_slow = False
-        self.logger.info("🔇 Sistema de síntese de voz desabilitado")
-        
-        # Código original comentado para uso futuro:
-        # try:
-        #     # Configurar gTTS para português brasileiro
-        #     self.tts_lang = 'pt-br'  # Português brasileiro
-        #     self.tts_slow = False    # Velocidade normal (mais natural)
-        #     
-        #     self.logger.info("✅ Sistema de síntese de voz gTTS inicializado")
-        #     self.logger.info(f"🌍 Idioma configurado: {self.tts_lang}")
-        # except Exception as e:
-        #     self.logger.warning(f"⚠️  Erro ao inicializar gTTS: {e}")
-        #     self.logger.info("💡 Respostas por voz não estarão disponíveis")
-        #     self.tts_lang = None
+        """Inicializa a síntese de voz offline e pré-renderiza as frases estáveis"""
+        try:
+            tts = create_tts()
+            t0 = time.perf_counter()
+            generated = tts.prerender(self._stable_phrases())
+            self.tts = tts
+            self.logger.info(f"✅ Voz offline pronta ({tts.engine.key()}): "
+                             f"{generated} frases sintetizadas em {time.perf_counter() - t0:.1f}s")
+            # Respostas do próximo minuto ficam prontas antes do relógio virar
+            self.clock_prerenderer = ClockPrerenderer(tts, self._timed_phrases, lead=5.0)
+            self.clock_prerenderer.start()
+        except Exception as e:
+            self.logger.warning(f"⚠️  Voz offline indisponível: {e}")
+            self.logger.info("💡 Respostas por voz não estarão disponíveis")
+    
+    def _stable_phrases(self):
+        """Segmentos que compõem qualquer resposta de saudação/hora"""
+        phrases = [f"{greeting} {self.nome}," for greeting in ("Bom dia", "Boa tarde", "Boa noite")]
+        phrases += [f"são {hour:02d} horas" for hour in range(24)]
+        phrases += [f"e {minute:02d} minutos." for minute in range(60)]
+        return phrases
     
     def _play_startup_sound(self):
-        """Reproduz som de inicialização"""
-        try:
-            sound_file = os.path.join(os.getcwd(), 'ligar.mp3')
-            if os.path.exists(sound_file):
-                pygame.mixer.music.load(sound_file)
-                pygame.mixer.music.play()
-                
-                # Aguardar a reprodução terminar
-                while pygame.mixer.music.get_busy():
-                    pygame.time.wait(100)
-                    
+        """Reproduz som de inicialização (sem bloquear a inicialização)"""
+        future = self._play_sound("ligar.mp3")
+
+        def done(f):
+            if f.exception() is None:
                 self.logger.info("✅ Som de inicialização reproduzido")
-            else:
-                self.logger.warning(f"⚠️  Arquivo de som de inicialização não encontrado: {sound_file}")
-        except Exception as e:
-            self.logger.warning(f"⚠️  Erro ao reproduzir som de inicialização: {e}")
+
+        if future is not None:
+            future.add_done_callback(done)
     
     def _play_activation_sound(self):
-        """Reproduz o som de ativação"""
-        try:
-            sound_file = os.path.join(os.getcwd(), 'listen.mp3')
-            if os.path.exists(sound_file):
-                pygame.mixer.music.load(sound_file)
-                pygame.mixer.music.play()
-                self.logger.info("🔊 Som de ativação reproduzido")
-            else:
-                self.logger.warning(f"⚠️  Arquivo de som não encontrado: {sound_file}")
-        except Exception as e:
-            self.logger.warning(f"⚠️  Erro ao reproduzir som: {e}")
+        """Reproduz o som de ativação — só enfileira, nunca bloqueia a hotword"""
+        if self._play_sound("listen.mp3") is not None:
+            self.logger.info("🔊 Som de ativação reproduzido")
     
-    def _speak(self, text: str, force_speak: bool = False):
-        """Fala o texto usando gTTS - apenas para comando olá"""
-        if force_speak:
-            # Apenas para o comando olá - ativa TTS temporariamente
-            try:
-                self.logger.info(f"🗣️  Falando: {text}")
-                
-                # Configurar gTTS temporariamente
-                tts_lang = 'pt-br'
-                tts_slow = False
-                
-                # Criar arquivo temporário para o áudio
-                with tempfile.NamedTemporaryFile(delete=False, suffix='.mp3') as tmp_file:
-                    temp_path = tmp_file.name
-                
-                # Gerar áudio com gTTS
-                tts = gTTS(text=text, lang=tts_lang, slow=tts_slow)
-                tts.save(temp_path)
-                
-                # Reproduzir o áudio
-                pygame.mixer.music.load(temp_path)
-                pygame.mixer.music.play()
-                
-                # Aguardar a reprodução terminar
-                while pygame.mixer.music.get_busy():
-                    pygame.time.wait(100)
-                
-                # Limpar arquivo temporário
-                os.unlink(temp_path)
-                
-            except Exception as e:
-                self.logger.warning(f"⚠️  Erro ao falar com gTTS: {e}")
-                self.logger.info(f"💬 {text}")
-        else:
+    def _speak(self, text: str, force_speak: bool = False, segments=None):
+        """Fala o texto com a voz offline (cache de frases) - apenas para comando olá
+
+        Se a frase inteira não estiver em cache mas todos os `segments` estiverem,
+        a resposta é montada a partir deles e começa a tocar na hora.
+        """
+        if not force_speak:
             # Para todos os outros comandos - apenas log
             self.logger.info(f"💬 [TTS DESABILITADO] {text}")
+            return
         
-        # Código original comentado para uso futuro:
-        # if self.tts_lang:
-        #     try:
-        #         self.logger.info(f"🗣️  Falando: {text}")
-        #         
-        #         # Criar arquivo temporário para o áudio
-        #         with tempfile.NamedTemporaryFile(delete=False, suffix='.mp3') as tmp_file:
-        #             temp_path = tmp_file.name
-        #         
-        #         # Gerar áudio com gTTS
-        #         tts = gTTS(text=text, lang=self.tts_lang, slow=self.tts_slow)
-        #         tts.save(temp_path)
-        #         
-        #         # Reproduzir o áudio
-        #         pygame.mixer.music.load(temp_path)
-        #         pygame.mixer.music.play()
-        #         
-        #         # Aguardar a reprodução terminar
-        #         while pygame.mixer.music.get_busy():
-        #             pygame.time.wait(100)
-        #         
-        #         # Limpar arquivo temporário
-        #         os.unlink(temp_path)
-        #         
-        #     except Exception as e:
-        #         self.logger.warning(f"⚠️  Erro ao falar com gTTS: {e}")
-        #         self.logger.info(f"💬 {text}")
-        # else:
-        #     self.logger.info(f"💬 {text}")
-    
-    def _get_greeting(self):
+        if not self._wait_ready("voz", timeout=10) or self.tts is None or self.player is None:
+            self.logger.info(f"💬 {text}")
+            return
+        
+        try:
+            self.logger.info(f"🗣️  Falando: {text}")
+            t0 = time.perf_counter()
+            pcm, sample_rate = self.tts.render_best(text, segments)
+            self.logger.info(f"🗣️  Áudio pronto em {(time.perf_counter() - t0) * 1000:.0f} ms")
+            self.player.play_pcm(pcm, sample_rate).result(timeout=60)
+        except Exception as e:
+            self.logger.warning(f"⚠️  Erro ao falar: {e}")
+            self.logger.info(f"💬 {text}")
+    
+    def _get_greeting(self, now: datetime = None):
         """Retorna saudação baseada na hora"""
-        now = datetime.now()
+        now = now or datetime.now()
         hour = now.hour
         
         if 5 <= hour < 12:
@@ -216,11 +305,26 @@ class JarvisFinal:
         else:
             return "Boa noite"
     
-    def _get_time_string(self):
+    def _get_time_string(self, now: datetime = None):
         """Retorna string formatada da hora atual"""
-        now = datetime.now()
+        now = now or datetime.now()
         return now.strftime("%H horas e %M minutos")
     
+    def _greeting_message(self, now: datetime = None) -> str:
+        """Resposta completa do comando olá"""
+        return f"{self._get_greeting(now)} {self.nome}, são {self._get_time_string(now)}."
+    
+    def _time_message(self, now: datetime = None) -> str:
+        """Resposta falada do comando hora"""
+        return f"São {self._get_time_string(now)}"
+    
+    def _timed_phrases(self, now: datetime):
+        """Respostas faladas que mudam a cada minuto (pré-renderizadas antes do minuto virar)
+
+        Só a do olá: o comando hora não fala (TTS desabilitado em _show_time).
+        """
+        return [self._greeting_message(now)]
+    
     def _init_porcupine(self):
         """Inicializa o Porcupine para detecção de hotword"""
         try:
@@ -257,22 +361,28 @@ class JarvisFinal:
     def _init_gestures(self):
         """Inicializa o controlador de gestos"""
         try:
-            self.gesture_controller = GestureController()
+            from gestures import GestureController  # importa cv2/mediapipe só aqui
+            self.gesture_controller = GestureController(latency=self.latency)
             self.gesture_controller.start()
             self.logger.info("✅ Controle por gestos iniciado")
         except Exception as e:
             self.logger.warning(f"⚠️  Gestos não disponíveis: {e}")
             self.gesture_controller = None
 
-    def _init_whisper(self):
-        """Inicializa o Whisper para reconhecimento de voz"""
+    def _init_asr(self):
+        """Inicializa o backend de reconhecimento de voz escolhido na configuração"""
         try:
-            self.logger.info("🔄 Carregando modelo Whisper (base)...")
-            self.whisper_model = whisper.load_model("base")
-            self.logger.info("✅ Whisper inicializado com modelo 'base'")
+            asr = create_backend(sample_rate=self.sample_rate)
+            if os.getenv("JARVIS_ASR_WORKER", "1") == "1":
+                # Modelo quente num processo separado, longe do GIL do loop de áudio
+                asr = ASRWorker(asr, cpus=parse_cpus(os.getenv("JARVIS_ASR_CPUS", "")))
+            self.logger.info(f"🔄 Carregando ASR {asr.describe()}...")
+            asr.load()
+            self.asr = asr
+            self.logger.info(f"✅ ASR inicializado: {self.asr.describe()}")
         except Exception as e:
-            self.logger.error(f"❌ Erro ao inicializar Whisper: {e}")
-            self.whisper_model = None
+            self.logger.error(f"❌ Erro ao inicializar ASR: {e}")
+            self.asr = None
     
     def _init_command_mapping(self):
         """Inicializa o mapeamento de comandos"""
@@ -290,11 +400,26 @@ class JarvisFinal:
             "musica": self._open_music,
             "ligar aura": self._play_aura,
             "desliga": self._shutdown_command,
+            "cancela": self._cancel_command,
             "fechar": self._close_jarvis
         }
         
+        # Índices (Aho-Corasick, fonético, trigramas) montados uma única vez
+        self.command_matcher = CommandMatcher(self.commands)
         self.logger.info(f"📋 Mapeamento de comandos inicializado com {len(self.commands)} comandos")
     
+    def _init_grammar(self):
+        """Inicializa o reconhecedor restrito às frases de self.commands (caminho rápido)"""
+        try:
+            grammar_asr = VoskGrammarBackend(sample_rate=self.sample_rate,
+                                             phrases=self.commands.keys())
+            grammar_asr.load()
+            self.grammar_asr = grammar_asr
+            self.logger.info(f"✅ Caminho rápido por gramática ativo ({len(self.commands)} frases)")
+        except Exception as e:
+            self.logger.warning(f"⚠️  Caminho rápido indisponível, usando só o ASR completo: {e}")
+            self.grammar_asr = None
+    
     def _start_cmatrix(self):
         """Inicia cmatrix em uma tela separada"""
         try:
@@ -378,41 +503,75 @@ class JarvisFinal:
             self.logger.warning(f"⚠️  Erro ao fechar cmatrix: {e}")
             self.logger.info("💡 Continuando com o fechamento do Jarvis...")
     
-    def _audio_callback(self, indata, frames, time, status):
+    def _audio_callback(self, indata, frames, time_info, status):
         """Callback para captura de áudio"""
+        stamp = time.monotonic()
         if status:
-            self.logger.warning(f"Status de áudio: {status}")
+            # Só contadores aqui; o aviso sai do loop de escuta, fora do callback
+            if status.input_overflow:
+                self.audio_stats.input_overflows += 1
+            if status.input_underflow:
+                self.audio_stats.input_underflows += 1
         
-        audio_data = (indata[:, 0] * 32767).astype(np.int16)
-        self.audio_queue.put(audio_data.tobytes())
+        # Stream já é int16: uma única cópia para o buffer, sem conversões no callback
+        self.audio_ring.write(indata[:, 0])
+        self.audio_queue.put((self.audio_ring.position, stamp))
     
-    def _detect_hotword(self, audio_data: bytes) -> bool:
-        """Detecta se a hotword foi pronunciada"""
+    def _check_backlog(self, depth: int, now: float):
+        """Desacelera os gestos enquanto a fila de áudio acumula blocos"""
+        stats = self.audio_stats
+        stats.max_depth = max(stats.max_depth, self.audio_queue.max_depth)
+        lagging = depth >= self.backlog_blocks or self.audio_queue.dropped > stats.dropped_blocks
+        stats.dropped_blocks = self.audio_queue.dropped
+        if lagging:
+            self._last_backlog = now
+        controller = self.gesture_controller
+        if controller is None:
+            return
+        if lagging and not controller.backoff:
+            stats.throttle_events += 1
+            controller.set_backoff(True)
+        elif controller.backoff and now - self._last_backlog > self.backlog_recover:
+            controller.set_backoff(False)
+
+    def _report_audio_stats(self, now: float):
+        """Avisa no log quando algum contador do stream mudou (no máximo a cada stats_interval)"""
+        if now - self._last_stats_report < self.stats_interval:
+            return
+        current = self.audio_stats.as_dict()
+        if any(current[k] != self._reported_stats.get(k, 0) for k in current if k != "max_depth"):
+            self.logger.warning("⚠️  Áudio: " + ", ".join(f"{k}={v}" for k, v in current.items()))
+        self._reported_stats = current
+        self._last_stats_report = now
+
+    def _detect_hotword(self, frame: np.ndarray, frame_end: int = 0) -> bool:
+        """Detecta se a hotword foi pronunciada em um frame do Porcupine"""
         if self.porcupine is None:
             return False
         
         try:
-            audio_array = np.frombuffer(audio_data, dtype=np.int16)
-            frame_length = self.porcupine.frame_length
+            keyword_index = self.porcupine.process(frame)
             
-            if len(audio_array) >= frame_length:
-                frame = audio_array[:frame_length]
-                keyword_index = self.porcupine.process(frame)
-                
-                if keyword_index >= 0:
-                    self.logger.info(f"🔥 Hotword 'jarvis' detectada!")
-                    self._play_activation_sound()
-                    return True
+            if keyword_index >= 0:
+                # Comando começa logo após o frame que disparou a detecção
+                self.hotword_position = frame_end
+                self.logger.info(f"🔥 Hotword 'jarvis' detectada!")
+                self._play_activation_sound()
+                return True
             return False
         except Exception as e:
             self.logger.error(f"Erro na detecção de hotword: {e}")
             return False
     
-    def _recognize_speech(self, audio_float32: np.ndarray) -> str:
-        """Reconhece fala usando Whisper"""
-        if self.whisper_model is None:
-            return ""
+    def _recognize_speech(self, audio_float32: np.ndarray, grammar_result: ASRResult = None,
+                          speech_end: int = None) -> str:
+        """Reconhece fala: gramática fechada primeiro, ASR completo se a confiança for baixa
 
+        grammar_result é o resultado do stream da gramática que já consumiu o
+        comando durante a captura; com ele, o áudio não é decodificado de novo.
+        speech_end (amostras desde o início do clipe) é o fim da fala segundo o
+        VAD, usado para reaproveitar a transcrição especulativa.
+        """
         # Checa energia do áudio — rejeita se for silêncio/ruído
         rms = float(np.sqrt(np.mean(audio_float32 ** 2)))
         self.logger.info(f"🔊 RMS do áudio: {rms:.4f}")
@@ -420,133 +579,285 @@ class JarvisFinal:
             self.logger.info("🔇 Áudio muito fraco, ignorando")
             return ""
 
+        if grammar_result is not None or (self._wait_ready("gramática", timeout=10)
+                                          and self.grammar_asr is not None):
+            try:
+                t0 = time.perf_counter()
+                result = grammar_result or self.grammar_asr.transcribe(audio_float32)
+                text = normalize_text(result.text)
+                elapsed_ms = (time.perf_counter() - t0) * 1000
+                if text in self.commands and result.confidence >= self.grammar_confidence:
+                    self.logger.info(f"⚡ Caminho rápido: '{text}' "
+                                     f"(confiança {result.confidence:.2f}, {elapsed_ms:.0f} ms)")
+                    return text
+                self.logger.info(f"🔁 Gramática incerta ('{text}', confiança {result.confidence:.2f}), "
+                                 f"usando ASR completo")
+            except Exception as e:
+                self.logger.warning(f"⚠️  Erro no caminho rápido: {e}")
+
+        if not self._wait_ready("asr") or self.asr is None:
+            return ""
+
         try:
-            result = self.whisper_model.transcribe(
-                audio_float32,
-                language="pt",
-                fp16=False,
-                no_speech_threshold=0.6,
-                condition_on_previous_text=False,
-                temperature=0.0
-            )
+            result = self._transcribe_full(audio_float32, speech_end)
             # Se probabilidade de "sem fala" for alta, ignora
-            segments = result.get("segments", [])
-            if segments and segments[0].get("no_speech_prob", 0) > 0.5:
-                self.logger.info("🔇 Whisper detectou ausência de fala")
+            if result.no_speech_prob > 0.5:
+                self.logger.info(f"🔇 {self.asr.name} detectou ausência de fala")
                 return ""
 
-            text = result.get("text", "").strip().lower()
-            for ch in ".,!?;:":
-                text = text.replace(ch, "")
-            self.logger.info(f"🎤 Whisper transcreveu: '{text}'")
+            text = normalize_text(result.text)
+            self.logger.info(f"🎤 {self.asr.name} transcreveu: '{text}'")
             return text
         except Exception as e:
-            self.logger.error(f"Erro no reconhecimento Whisper: {e}")
+            self.logger.error(f"Erro no reconhecimento ({self.asr.name}): {e}")
             return ""
     
+    def _transcribe_full(self, audio_float32: np.ndarray, speech_end: int = None):
+        """ASR completo em série com a especulação
+
+        Se a transcrição especulativa em curso (ou a última) já cobre toda a
+        fala (até speech_end; o hangover do VAD no fim do clipe é silêncio),
+        reaproveita o resultado em vez de decodificar de novo.
+        """
+        with self._partial_lock:
+            partial, self._partial = self._partial, None
+        speech_end = len(audio_float32) if speech_end is None else speech_end
+        if partial is not None and partial[0] >= speech_end:
+            covered, future = partial
+            result = future.result(timeout=60)  # já pronta ou terminando
+            if result is not None:
+                self.logger.info(f"♻️  Reaproveitando a transcrição especulativa "
+                                 f"({covered / self.sample_rate:.2f}s de áudio)")
+                return result
+        with self._asr_lock:
+            return self.asr.transcribe(audio_float32)
+
     def _find_command(self, text: str) -> Optional[str]:
-        """Encontra comando correspondente com fuzzy matching"""
+        """Encontra comando correspondente usando o matcher pré-compilado"""
         if not text:
             return None
 
-        # Busca exata
-        if text in self.commands:
-            return text
+        match = self.command_matcher.best(text)
+        if match is None:
+            return None
+        if match.method != "exato":
+            self.logger.info(f"🔍 Match {match.method}: '{text}' → '{match.command}' "
+                             f"(score {match.score:.2f})")
+        return match.command
+    
+    def _timed_handler(self, command: str, trace: Optional[Trace]) -> Callable:
+        """Handler do comando que fecha o trace de latência ao terminar"""
+        handler = self.commands[command]
+        if trace is None:
+            return handler
+
+        def run():
+            try:
+                handler()
+            finally:
+                trace.mark("handler")
+                self.latency.finish(trace, command)
+        return run
 
-        # Busca por substring (comando dentro do texto)
-        for cmd in self.commands:
-            if cmd in text:
-                return cmd
-
-        # Fuzzy matching — pega o comando mais similar
-        matches = difflib.get_close_matches(text, self.commands.keys(), n=1, cutoff=0.5)
-        if matches:
-            self.logger.info(f"🔍 Fuzzy match: '{text}' → '{matches[0]}'")
-            return matches[0]
-
-        # Fuzzy por palavra individual do texto
-        for word in text.split():
-            matches = difflib.get_close_matches(word, self.commands.keys(), n=1, cutoff=0.6)
-            if matches:
-                self.logger.info(f"🔍 Fuzzy word match: '{word}' → '{matches[0]}'")
-                return matches[0]
-
-        return None
-    
-    def _execute_command(self, command: str):
-        """Executa o comando correspondente"""
-        if command in self.commands:
-            self.logger.info(f"🚀 Executando comando: {command}")
+    def _execute_command(self, command: str, trace: Trace = None):
+        """Enfileira o comando no executor (ou roda na hora, se for imediato)"""
+        if command in self.immediate_commands:
+            self.logger.info(f"🚀 Executando comando imediato: {command}")
             try:
-                self.commands[command]()
-                self.logger.info(f"✅ Comando '{command}' executado com sucesso!")
+                self._timed_handler(command, trace)()
             except Exception as e:
                 self.logger.error(f"❌ Erro ao executar comando '{command}': {e}")
+        elif command in self.commands:
+            timeout = self.command_timeouts.get(command, DEFAULT_TIMEOUT)
+            if self.executor.submit(command, self._timed_handler(command, trace), timeout=timeout):
+                self.logger.info(f"🚀 Comando enfileirado: {command} (timeout {timeout:.0f}s)")
+            elif trace is not None:
+                # Fila cheia: o handler não roda, mas a ativação entra nos histogramas
+                self.latency.finish(trace, command)
         else:
             self.logger.warning(f"⚠️  Comando não reconhecido: {command}")
             self.logger.info("💡 Comandos disponíveis:")
             for cmd in sorted(self.commands.keys()):
                 print(f"   - {cmd}")
     
-    def _listen_for_command(self):
+    def _capture_command(self, start: int):
+        """Recorta o comando do stream contínuo até o VAD detectar o fim da fala
+
+        Com a especulação ativa, hipóteses parciais são casadas com os comandos
+        durante a fala. Retorna (áudio int16, comando decidido antecipadamente ou
+        None, resultado final do stream da gramática ou None).
+        """
+        self.vad.reset()
+        frame = self.vad.frame_size
+        pos = start
+
+        spec, stream, stop = None, None, None
+        self._partial = None
+        if self.speculative:
+            excluded = ambiguous_prefixes(self.commands)
+            if self.grammar_asr is not None:  # só é atribuído depois do load()
+                stream = self.grammar_asr.stream()
+                spec = StableHypothesis(self.grammar_stable_frames * frame, excluded=excluded)
+            elif self.asr is not None:
+                spec = StableHypothesis(int(self.speculative_hold * self.sample_rate),
+                                        excluded=excluded)
+                stop = threading.Event()
+                threading.Thread(target=self._speculate_with_asr,
+                                 args=(start, spec, stop), daemon=True).start()
+
+        while True:
+            if not self.audio_ring.wait_for(pos + frame, timeout=1.0):
+                self.logger.warning("⚠️  Stream de áudio parou durante a captura do comando")
+                break
+            chunk = self.audio_ring.view(pos, pos + frame)
+            done = self.vad.process(chunk)
+            pos += frame
+            if stream is not None:
+                # A confiança por palavra só chega com o Result(), depois de ~0.5 s de
+                # silêncio, quando o VAD já encerrou a captura. Durante a fala vale a
+                # parcial que é exatamente um comando, com fala detectada, estável por
+                # grammar_stable_frames (prefixos ambíguos ficam de fora)
+                text = normalize_text(stream.feed(chunk))
+                spec.update(text if self.vad.speech_started and text in self.commands else None, pos)
+            if spec is not None and spec.confirmed:
+                self.logger.info(f"⚡ Comando '{spec.confirmed}' decidido durante a fala")
+                break
+            if done:
+                break
+
+        if stop is not None:
+            with self._partial_lock:
+                stop.set()
+
+        self.logger.info(f"✂️  Comando capturado: {(pos - start) / self.sample_rate:.2f}s "
+                         f"(fala até {self.vad.speech_end / self.sample_rate:.2f}s)")
+        early = spec.confirmed if spec else None
+        grammar_result = stream.finish() if stream is not None and early is None else None
+        return self.audio_ring.read(start, pos), early, grammar_result
+
+    def _speculate_with_asr(self, start: int, spec: StableHypothesis, stop: threading.Event):
+        """Transcreve o buffer crescente em janelas sobrepostas enquanto a fala continua
+
+        Além das janelas periódicas, uma transcrição começa assim que o VAD vê
+        silêncio depois da fala: ela cobre o comando inteiro e, durante o
+        hangover, adianta a transcrição final. Uma janela que ainda esperava o
+        ASR quando a captura terminou sem cobrir a fala é descartada.
+        """
+        step = int(self.speculative_interval * self.sample_rate)
+        vad = self.vad
+        last = start
+        while spec.confirmed is None:
+            pos = self.audio_ring.position
+            speech_over = vad.speech_started and vad.silence_run > 0 and last - start < vad.speech_end
+            if not speech_over and (pos - last < step or not vad.speech_started):
+                if stop.wait(0.05):
+                    return
+                continue
+            future = Future()
+            with self._partial_lock:
+                if stop.is_set():
+                    return  # captura terminou: a vez é da transcrição final
+                self._partial = (pos - start, future)
+            last = pos
+            audio = self.audio_ring.read(start, pos).astype(np.float32) / 32768.0
+            with self._asr_lock:
+                if stop.is_set() and pos - start < vad.speech_end:
+                    future.set_result(None)  # obsoleta: não segura a transcrição final
+                    return
+                try:
+                    result = self.asr.transcribe(audio)
+                except Exception as e:
+                    future.set_result(None)
+                    self.logger.warning(f"⚠️  Erro na transcrição especulativa: {e}")
+                    return
+                future.set_result(result)
+            if stop.is_set():
+                return
+            text = normalize_text(result.text)
+            match = self.command_matcher.best(text)
+            spec.update(match.command if match and match.score >= SCORE_PHONETIC else None, pos)
+
+    def _listen_for_command(self, start: int, trace: Trace = None):
         """Escuta por comandos após detecção da hotword"""
         self.logger.info("🎤 Escutando comando...")
         self.is_processing_command = True
+        trace = trace or Trace(hotword=time.monotonic())
+        command = None
+        # Gestos cedem CPU enquanto o comando é capturado e transcrito
+        controller = self.gesture_controller
+        if controller is not None:
+            controller.set_busy(True)
 
         try:
-            # Grava até 5 segundos com detecção de silêncio
-            duration = 5
-            audio_data = sd.rec(int(duration * self.sample_rate),
-                               samplerate=self.sample_rate,
-                               channels=1,
-                               dtype=np.float32)
-            sd.wait()
-
-            audio_flat = audio_data.flatten()
-
-            # Corta o silêncio do final
-            silence_threshold = 0.01
-            non_silent = np.where(np.abs(audio_flat) > silence_threshold)[0]
-            if len(non_silent) > 0:
-                end = min(non_silent[-1] + int(self.sample_rate * 0.5), len(audio_flat))
-                audio_flat = audio_flat[:end]
+            # Usa o mesmo InputStream da hotword — sem reabrir o microfone
+            audio_int16, early_command, grammar_result = self._capture_command(start)
+            trace.mark("captura")
+            if self.capture_dir:
+                self._save_capture(audio_int16)
+            if early_command:
+                command = early_command
+                trace.mark("match")
+                self._execute_command(early_command, trace)
+                return
+            audio_flat = audio_int16.astype(np.float32) / 32768.0
 
-            recognized_text = self._recognize_speech(audio_flat)
+            recognized_text = self._recognize_speech(audio_flat, grammar_result, self.vad.speech_end)
+            trace.mark("asr")
 
             if recognized_text:
                 command = self._find_command(recognized_text)
+                trace.mark("match")
                 if command:
-                    self._execute_command(command)
+                    self._execute_command(command, trace)
                 else:
                     self.logger.info(f"❓ Comando não reconhecido: '{recognized_text}'")
                     self.logger.info(f"💡 Comandos: {', '.join(sorted(self.commands.keys()))}")
             else:
                 self.logger.info("❌ Não entendi o comando, tente novamente")
+        except Exception as e:
+            self.logger.error(f"❌ Erro ao processar comando: {e}")
         finally:
             self.is_processing_command = False
+            if controller is not None:
+                controller.set_busy(False)
+            if command not in self.commands:
+                # Ativação sem comando: registra só até onde chegou
+                self.latency.finish(trace)
+    
+    def _save_capture(self, audio_int16: np.ndarray):
+        """Grava o comando capturado para reavaliar modelos/limiares depois (modo lote)"""
+        try:
+            os.makedirs(self.capture_dir, exist_ok=True)
+            path = os.path.join(self.capture_dir, datetime.now().strftime("%Y%m%d-%H%M%S-%f.wav"))
+            with wave.open(path, "wb") as w:
+                w.setnchannels(1)
+                w.setsampwidth(2)
+                w.setframerate(self.sample_rate)
+                w.writeframes(audio_int16.tobytes())
+        except OSError as e:
+            self.logger.warning(f"⚠️  Não foi possível gravar o comando capturado: {e}")
     
     def start_listening(self):
         """Inicia o loop principal de escuta"""
         self.logger.info("🎧 Iniciando escuta contínua...")
         self.is_listening = True
+        frame_length = self.porcupine.frame_length if self.porcupine else 512
+        aligner = FrameAligner(self.audio_ring, frame_length)
         
         try:
             with sd.InputStream(
                 samplerate=self.sample_rate,
                 channels=1,
-                dtype=np.float32,
+                dtype=np.int16,
                 blocksize=self.chunk_size,
                 callback=self._audio_callback
             ):
+                blocks = deque(maxlen=64)  # (posição final, instante do callback)
+                self._last_stats_report = time.monotonic()
                 while self.is_listening:
                     try:
-                        audio_data = self.audio_queue.get(timeout=1.0)
-                        
-                        if self._detect_hotword(audio_data) and not self.is_processing_command:
-                            command_thread = threading.Thread(target=self._listen_for_command)
-                            command_thread.daemon = True
-                            command_thread.start()
-                        
+                        # A fila só sinaliza novos blocos; o áudio é lido do buffer circular
+                        self._consume_audio(aligner, blocks, self.audio_queue.drain(timeout=1.0))
                     except queue.Empty:
                         continue
                     except KeyboardInterrupt:
@@ -558,6 +869,32 @@ class JarvisFinal:
         finally:
             self.stop_listening()
     
+    def _consume_audio(self, aligner: FrameAligner, blocks: deque, fresh: list):
+        """Processa os blocos recém-chegados: hotword em lote e início da captura do comando"""
+        dequeued = time.monotonic()
+        for _, stamp in fresh:
+            self.latency.record("callback→fila", dequeued - stamp)
+        blocks.extend(fresh)
+        self._check_backlog(len(fresh), dequeued)
+        
+        # Processa em lote todos os frames pendentes
+        for frame, frame_end in aligner.frames():
+            if self._detect_hotword(frame, frame_end) and not self.is_processing_command:
+                # Instante do callback do bloco que completou o frame
+                stamp = next((t for end, t in blocks if end >= frame_end), blocks[-1][1])
+                trace = Trace(callback=stamp, fila=dequeued, hotword=time.monotonic())
+                self.is_processing_command = True
+                self.command_thread = threading.Thread(target=self._listen_for_command,
+                                                       args=(self.hotword_position, trace))
+                self.command_thread.daemon = True
+                self.command_thread.start()
+        
+        if aligner.skipped:
+            self.logger.warning(f"⚠️  Hotword atrasada: {aligner.skipped} amostras descartadas")
+            self.audio_stats.skipped_samples += aligner.skipped
+            aligner.skipped = 0
+        self._report_audio_stats(dequeued)
+    
     def stop_listening(self):
         """Para a escuta"""
         self.is_listening = False
@@ -573,7 +910,7 @@ class JarvisFinal:
         """Mostra a hora atual"""
         time_str = self._get_time_string()
         self.logger.info(f"🕐 Hora atual: {time_str}")
-        # self._speak(f"São {time_str}")  # TTS desabilitado
+        # self._speak(self._time_message())  # TTS desabilitado
     
     def _show_date(self):
         """Mostra a data atual"""
@@ -594,12 +931,13 @@ class JarvisFinal:
     
     def _greeting_command(self):
         """Comando de saudação personalizado"""
-        greeting = self._get_greeting()
-        time_str = self._get_time_string()
-        message = f"{greeting} {self.nome}, são {time_str}."
+        now = datetime.now()
+        greeting = self._get_greeting(now)
+        message = self._greeting_message(now)
         
         self.logger.info(f"👋 {message}")
-        self._speak(message, force_speak=True)  # Único comando que mantém fala ativa
+        segments = [f"{greeting} {self.nome},", f"são {now:%H} horas", f"e {now:%M} minutos."]
+        self._speak(message, force_speak=True, segments=segments)  # Único comando que mantém fala ativa
     
     def _show_help(self):
         """Mostra comandos disponíveis"""
@@ -618,6 +956,7 @@ class JarvisFinal:
             "musica": "Abre o Spotify",
             "ligar aura": "Toca Aura no Spotify",
             "desliga": "Desliga o computador completamente",
+            "cancela": "Cancela comandos pendentes (ex.: desligamento)",
             "fechar": "Encerra o Jarvis"
         }
         
@@ -626,43 +965,19 @@ class JarvisFinal:
             print(f"   - {command}: {description}")
     
     def _work_mode_command(self):
-        """Abre todos os aplicativos de trabalho"""
+        """Abre todos os aplicativos de trabalho em paralelo"""
         self.logger.info("💼 Iniciando modo de trabalho...")
         
-        # Tocar som de trabalho
-        try:
-            self.logger.info("🔊 Reproduzindo som de trabalho...")
-            pygame.mixer.music.load("muhehe.mp3")
-            pygame.mixer.music.play()
-            
-            # Aguardar a reprodução terminar
-            while pygame.mixer.music.get_busy():
-                pygame.time.wait(100)
-                
-            self.logger.info("✅ Som de trabalho reproduzido")
-        except Exception as e:
-            self.logger.warning(f"⚠️  Erro ao reproduzir som de trabalho: {e}")
-        
-        # Lista de aplicativos para abrir
-        apps = [
-            ("Slack", ["slack"]),
-            ("Spotify", ["spotify"]),
-            ("Cursor", ["cursor"]),
-            ("Navegador", ["google-chrome"])
-        ]
+        # Som toca enquanto os apps sobem
+        self.logger.info("🔊 Reproduzindo som de trabalho...")
+        self._play_sound("muhehe.mp3")
         
-        opened_apps = []
-        failed_apps = []
+        status = self.app_launcher.launch(WORK_APPS, sleep=self.executor.sleep)
+        if self.executor.cancelled():
+            self.logger.info("🚫 Modo de trabalho cancelado")
         
-        for app_name, command in apps:
-            try:
-                self.logger.info(f"🚀 Abrindo {app_name}...")
-                subprocess.Popen(command, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
-                opened_apps.append(app_name)
-                time.sleep(0.5)  # Pequena pausa entre aberturas
-            except Exception as e:
-                self.logger.warning(f"⚠️  Erro ao abrir {app_name}: {e}")
-                failed_apps.append(app_name)
+        opened_apps = [name for name, st in status.items() if st != "falhou"]
+        failed_apps = [name for name, st in status.items() if st == "falhou"]
         
         # Relatório final
         if opened_apps:
@@ -700,7 +1015,7 @@ class JarvisFinal:
                 result = os.system(cmd)
                 if result == 0:
                     self.logger.info("✅ Spotify aberto com os.system!")
-                    time.sleep(1)
+                    self.executor.sleep(1)
                     # Tentar focar a janela do Spotify
                     os.system("wmctrl -a 'Spotify' 2>/dev/null || true")
                     self.logger.info("🎉 Spotify aberto com sucesso!")
@@ -716,7 +1031,7 @@ class JarvisFinal:
                 process = subprocess.Popen(["spotify"], 
                                          stdout=subprocess.DEVNULL, 
                                          stderr=subprocess.DEVNULL)
-                time.sleep(2)
+                self.executor.sleep(2)
                 
                 if process.poll() is None:
                     self.logger.info("✅ Spotify aberto via subprocess!")
@@ -743,8 +1058,10 @@ class JarvisFinal:
         
         # Aguarda 5 segundos
         for i in range(5, 0, -1):
-            self.logger.info(f"⏰ Desligando em {i} segundos...")
-            time.sleep(1)
+            self.logger.info(f"⏰ Desligando em {i} segundos... (diga 'cancela' para abortar)")
+            if not self.executor.sleep(1):
+                self.logger.info("🚫 Desligamento cancelado")
+                return
         
         try:
             # Comando para desligar o sistema
@@ -757,6 +1074,14 @@ class JarvisFinal:
             self.logger.error(f"❌ Erro inesperado: {e}")
             self.logger.info("💡 Ocorreu um erro ao tentar desligar o computador.")
     
+    def _cancel_command(self):
+        """Cancela comandos pendentes e em execução (ex.: desligamento em contagem)"""
+        count = self.executor.cancel_all()
+        if count:
+            self.logger.info(f"🚫 {count} comando(s) cancelado(s)")
+        else:
+            self.logger.info("💡 Nenhum comando pendente para cancelar")
+    
     def _close_jarvis(self):
         """Fecha o Jarvis com som de despedida"""
         self.logger.info("👋 Comando de fechamento recebido...")
@@ -765,22 +1090,23 @@ class JarvisFinal:
         if self.gesture_controller:
             self.gesture_controller.stop()
 
+        # Encerrar o worker de ASR
+        if self.asr:
+            self.asr.close()
+
+        # Último resumo de latência antes de sair
+        self.latency.report()
+
+        # Parar a pré-renderização das respostas do relógio
+        if self.clock_prerenderer:
+            self.clock_prerenderer.stop()
+
         # Fechar cmatrix se estiver rodando
         self._stop_cmatrix()
         
-        # Tocar som de fechamento
-        try:
-            self.logger.info("🔊 Reproduzindo som de despedida...")
-            pygame.mixer.music.load("fechar.mp3")
-            pygame.mixer.music.play()
-            
-            # Aguardar a reprodução terminar
-            while pygame.mixer.music.get_busy():
-                pygame.time.wait(100)
-                
-            self.logger.info("✅ Som de despedida reproduzido")
-        except Exception as e:
-            self.logger.warning(f"⚠️  Erro ao reproduzir som de fechamento: {e}")
+        # Tocar som de fechamento (aguarda terminar antes de sair)
+        self.logger.info("🔊 Reproduzindo som de despedida...")
+        self._play_sound("fechar.mp3", wait=True, timeout=10)
         
         # Parar a escuta
         self.logger.info("🔌 Encerrando Jarvis...")
@@ -790,8 +1116,75 @@ class JarvisFinal:
         self.logger.info("✅ Jarvis encerrado com sucesso!")
         print("\n👋 Jarvis encerrado. Até logo!")
         
-        # Encerrar o programa
-        exit(0)
+        # Avisar a thread principal (painel ou join da escuta), que encerra o programa
+        self.shutdown_requested.set()
+
+
+def _collect_wavs(paths):
+    """WAVs dos caminhos informados (diretórios são percorridos recursivamente)"""
+    files = []
+    for path in paths:
+        if os.path.isdir(path):
+            for root, _dirs, names in os.walk(path):
+                files += [os.path.join(root, n) for n in names if n.endswith(".wav")]
+        elif path.endswith(".wav"):
+            files.append(path)
+    return sorted(files)
+
+
+def batch_main(argv=None):
+    """Modo lote: transcreve muitos comandos gravados com o Whisper em lotes preenchidos
+
+    Uso: python jarvis_final.py --batch capturas/ [--model small] [--batch-size 16] [--json saida.json]
+    """
+    parser = argparse.ArgumentParser(prog="jarvis_final.py --batch",
+                                     description="Reavalia comandos gravados em lote")
+    parser.add_argument("paths", nargs="+", help="WAVs ou diretórios (ex.: JARVIS_CAPTURE_DIR)")
+    parser.add_argument("--model", default=os.getenv("JARVIS_ASR_MODEL", "base"))
+    parser.add_argument("--threads", type=int, default=int(os.getenv("JARVIS_ASR_THREADS", "0")))
+    parser.add_argument("--batch-size", type=int, default=16)
+    parser.add_argument("--json", help="grava os resultados neste arquivo")
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.WARNING, format='%(asctime)s - %(levelname)s - %(message)s')
+    jarvis = JarvisFinal.headless()
+    files = _collect_wavs(args.paths)
+    if not files:
+        print("❌ Nenhum WAV encontrado")
+        sys.exit(1)
+
+    audios = []
+    for path in files:
+        with wave.open(path, "rb") as w:
+            pcm = np.frombuffer(w.readframes(w.getnframes()), dtype=np.int16)
+        audios.append(pcm.astype(np.float32) / 32768.0)
+    audio_s = sum(len(a) for a in audios) / jarvis.sample_rate
+
+    asr = create_backend("whisper", model=args.model, threads=args.threads,
+                         sample_rate=jarvis.sample_rate)
+    print(f"🔄 Carregando ASR {asr.describe()}...")
+    asr.load()
+    print(f"▶️  {len(files)} comandos ({audio_s:.0f}s de áudio) em lotes de {args.batch_size}")
+    t0 = time.perf_counter()
+    results = asr.transcribe_batch(audios, batch_size=args.batch_size)
+    elapsed = time.perf_counter() - t0
+
+    rows = []
+    for path, result in zip(files, results):
+        text = "" if result.no_speech_prob > 0.5 else normalize_text(result.text)
+        command = jarvis._find_command(text)
+        rows.append({"file": path, "text": text, "command": command,
+                     "no_speech_prob": round(result.no_speech_prob, 3)})
+        print(f"  {os.path.basename(path)}: '{text}' → {command}")
+
+    # WAVs vazios somam 0 s de áudio: sem RTF
+    rtf = f"{elapsed / audio_s:.3f}" if audio_s > 0 else "n/a"
+    rate = f"{len(files) / elapsed:.1f}" if elapsed > 0 else "n/a"
+    print(f"⏱️  {len(files)} comandos em {elapsed:.1f}s ({rate} comandos/s, RTF {rtf})")
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump({"model": asr.describe(), "batch_size": args.batch_size,
+                       "seconds": round(elapsed, 3), "results": rows}, f, ensure_ascii=False, indent=2)
 
 
 def main():
@@ -800,6 +1193,10 @@ def main():
     print("=" * 50)
     
     # Verificar argumentos
+    if len(sys.argv) > 1 and sys.argv[1] == "--batch":
+        batch_main(sys.argv[2:])
+        return
+    
     hotword = "jarvis"
     if len(sys.argv) > 1:
         hotword = sys.argv[1]
@@ -815,7 +1212,7 @@ def main():
         listen_thread = threading.Thread(target=jarvis.start_listening, daemon=True)
         listen_thread.start()
 
-        # GUI na thread principal
+        # GUI na thread principal; ambos retornam quando "fechar" pede o encerramento
         if jarvis.gui:
             jarvis.gui.run()
         else:
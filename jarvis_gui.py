@@ -28,9 +28,25 @@ COMMANDS_INFO = [
     ("música",       "Abre o Spotify"),
     ("ligar aura",   "Toca Aura no Spotify"),
     ("desliga",      "Desliga o computador (aguarda 5 s)"),
+    ("cancela",      "Cancela comandos pendentes (ex.: desligamento)"),
     ("fechar",       "Encerra o Jarvis"),
 ]
 
+COMPONENTS_INFO = [
+    ("hotword",   "Hotword"),
+    ("gramática", "Gramática"),
+    ("asr",       "ASR"),
+    ("gestos",    "Gestos"),
+    ("som",       "Som"),
+    ("voz",       "Voz"),
+]
+
+STATUS_STYLE = {
+    "pronto":     ("●", GREEN),
+    "carregando": ("◌", "#ffaa00"),
+    "falhou":     ("✕", RED),
+}
+
 GESTURES_INFO = [
     ("✊  Pinça",                             "Segura Alt + abre Alt+Tab para trocar janelas"),
     ("✊ →  Pinça + mover direita",           "Seta direita (navega no Alt+Tab)"),
@@ -49,6 +65,7 @@ class JarvisGUI:
         self.root.resizable(False, False)
         self._build()
         self._update_gesture_btn()
+        self._update_status()
 
     # ── Construção da UI ──────────────────────────────────────────────────────
 
@@ -65,6 +82,15 @@ class JarvisGUI:
                  bg=BG, fg="#555555").pack()
         tk.Frame(r, bg="#222", height=1).pack(fill="x", padx=16)
 
+        # Status de carregamento dos componentes
+        status = tk.Frame(r, bg=BG)
+        status.pack(fill="x", padx=16, pady=(8, 0))
+        self._status_labels = {}
+        for key, label in COMPONENTS_INFO:
+            widget = tk.Label(status, font=("Consolas", 9), bg=BG, fg="#555555")
+            widget.pack(side="left", padx=(0, 12))
+            self._status_labels[key] = (widget, label)
+
         # Seção: comandos de voz
         self._section_label(r, "COMANDOS DE VOZ")
         self._build_table(r, COMMANDS_INFO, col1_width=16, col1_color=GREEN)
@@ -134,6 +160,19 @@ class JarvisGUI:
             self._btn_gesture.config(text="○ INATIVO", fg=RED,   activeforeground=RED)
         self.root.after(1000, self._update_gesture_btn)
 
+    # ── Status dos componentes ────────────────────────────────────────────────
+
+    def _update_status(self):
+        if self.jarvis is not None and self.jarvis.shutdown_requested.is_set():
+            self.root.destroy()  # encerra o mainloop e devolve a thread principal ao main()
+            return
+        statuses = self.jarvis.component_status if self.jarvis is not None else {}
+        for key, (widget, label) in self._status_labels.items():
+            state = statuses.get(key, "carregando")
+            icon, color = STATUS_STYLE.get(state, STATUS_STYLE["carregando"])
+            widget.config(text=f"{icon} {label}", fg=color)
+        self.root.after(500, self._update_status)
+
     # ── Execução ──────────────────────────────────────────────────────────────
 
     def run(self):
@@ -0,0 +1,277 @@
+#!/usr/bin/env python3
+"""
+Landmarks da mão como arrays NumPy e classificação de gestos.
+
+Cada resultado do MediaPipe vira um array (21, 3) uma única vez e passa por
+um filtro One-Euro (OneEuroFilter), que dá posição e velocidade suavizadas
+de todos os landmarks, atualizadas no lugar em buffers pré-alocados.
+Distâncias e estados dos dedos são calculados vetorizados.
+
+A decisão "pinça / dois dedos / nada" é de um classificador trocável:
+  - ThresholdClassifier: as regras de limiar de sempre (padrão)
+  - KNNClassifier: k vizinhos mais próximos sobre landmarks normalizados,
+    treinado com gravações do JARVIS_GESTURE_RECORD
+
+Treino:
+  python landmarks.py train pinca.jsonl:pinça dois.jsonl:dois_dedos nada.jsonl:nenhum -o gestos.npz
+
+Configuração (.jarvis_config / variáveis de ambiente):
+  JARVIS_GESTURE_MODEL   modelo .npz do kNN (padrão: regras de limiar)
+"""
+
+import os
+import json
+import math
+import logging
+import argparse
+from typing import Iterable, Tuple
+import numpy as np
+
+logger = logging.getLogger("Landmarks")
+
+NUM_LANDMARKS = 21
+PINCH_DIST    = 0.08  # distância polegar-indicador da pinça (normalizada)
+
+EURO_MIN_CUTOFF = 1.0   # Hz: corte com a mão parada (remove tremor)
+EURO_BETA       = 10.0  # quanto a velocidade abre o corte
+EURO_D_CUTOFF   = 2.0   # Hz: corte da velocidade
+EURO_RESET_GAP  = 0.5   # s sem amostra (mão perdida, modo ocioso): recomeça
+
+WRIST, THUMB_TIP, INDEX_TIP, MIDDLE_MCP = 0, 4, 8, 9
+PALM = np.array([0, 5, 9, 13, 17])  # pulso + bases dos dedos: movem juntos com a mão
+PALM_WEIGHTS = np.zeros(NUM_LANDMARKS, dtype=np.float32)
+PALM_WEIGHTS[PALM] = 1.0 / len(PALM)  # PALM_WEIGHTS @ pontos = média da palma, sem fancy index
+FINGER_JOINTS = np.array([[8, 12, 16, 20],   # pontas: indicador, médio, anelar, mínimo
+                          [6, 10, 14, 18],   # articulações do meio (PIP)
+                          [5, 9, 13, 17]])   # bases (MCP)
+
+PINCH, TWO_UP, NONE = "pinça", "dois_dedos", "nenhum"
+LABELS = (PINCH, TWO_UP, NONE)
+
+
+def to_array(hand) -> np.ndarray:
+    """Landmarks do MediaPipe (ou listas [x, y, z]) → array (21, 3) float32"""
+    if isinstance(hand, np.ndarray):
+        return hand.astype(np.float32, copy=False)
+    if hand and hasattr(hand[0], "x"):
+        return np.array([(p.x, p.y, p.z) for p in hand], dtype=np.float32)
+    return np.asarray(hand, dtype=np.float32)
+
+
+def pinch_distance(lm: np.ndarray) -> np.ndarray:
+    """Distância (x, y) entre as pontas do polegar e do indicador; lm (..., 21, 3)"""
+    d = lm[..., THUMB_TIP, :2] - lm[..., INDEX_TIP, :2]
+    return np.sqrt((d * d).sum(axis=-1))
+
+
+def finger_states(lm: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """(estendidos, dobrados) (..., 4) para indicador, médio, anelar e mínimo"""
+    joints = lm[..., FINGER_JOINTS, 1]
+    tip, pip, mcp = joints[..., 0, :], joints[..., 1, :], joints[..., 2, :]
+    return (tip < pip) & (pip < mcp), tip > pip
+
+
+def is_pinch(lm: np.ndarray) -> np.ndarray:
+    return pinch_distance(lm) < PINCH_DIST
+
+
+def is_two_fingers_up(lm: np.ndarray) -> np.ndarray:
+    """Indicador + médio estendidos, anelar + mínimo dobrados."""
+    extended, folded = finger_states(lm)
+    return extended[..., :2].all(axis=-1) & folded[..., 2:].all(axis=-1)
+
+
+def features(lm: np.ndarray) -> np.ndarray:
+    """Vetor invariante a posição e escala: (x, y) relativos ao pulso, em
+    unidades do tamanho da mão (pulso → base do médio), + distância da pinça.
+    lm (..., 21, 3) → (..., 43)"""
+    xy = lm[..., :2] - lm[..., WRIST:WRIST + 1, :2]
+    scale = np.sqrt((xy[..., MIDDLE_MCP, :] ** 2).sum(axis=-1))
+    scale = np.where(scale > 0, scale, 1.0)[..., None]
+    flat = xy.reshape(*xy.shape[:-2], -1) / scale
+    return np.concatenate([flat, pinch_distance(lm)[..., None] / scale], axis=-1).astype(np.float32)
+
+
+class OneEuroFilter:
+    """Filtro One-Euro (Casiez et al., 2012) sobre os 21 landmarks de uma vez
+
+    Passa-baixa cujo corte sobe com a velocidade: parado, remove o tremor;
+    em movimento, acompanha sem atraso. A velocidade é a derivada das
+    amostras cruas, suavizada (a do artigo, sobre a posição já filtrada,
+    superestima a velocidade enquanto o filtro está atrasado).
+
+    Com smooth_position=False só a velocidade é filtrada (metade das ufuncs
+    por frame) e a posição devolvida é a última amostra crua.
+    """
+
+    def __init__(self, min_cutoff: float = EURO_MIN_CUTOFF, beta: float = EURO_BETA,
+                 d_cutoff: float = EURO_D_CUTOFF, smooth_position: bool = True):
+        self.min_cutoff = min_cutoff
+        self.beta       = beta
+        self.d_cutoff   = d_cutoff
+        self.smooth_position = smooth_position
+        self.position = np.zeros((NUM_LANDMARKS, 3), dtype=np.float32)
+        self.velocity = np.zeros((NUM_LANDMARKS, 3), dtype=np.float32)
+        self._raw     = np.zeros((NUM_LANDMARKS, 3), dtype=np.float32)
+        self._tmp     = np.zeros((NUM_LANDMARKS, 3), dtype=np.float32)  # rascunho sem alocar
+        self._gain    = np.zeros((NUM_LANDMARKS, 3), dtype=np.float32)
+        self.samples  = 0
+        self._t = None
+
+    def reset(self):
+        self.samples = 0
+        self._t = None
+
+    def update(self, t: float, lm: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """Nova amostra; retorna (posição, velocidade/s) suavizadas, atualizadas no lugar"""
+        if self._t is None or t - self._t > EURO_RESET_GAP:
+            self.position[:] = lm
+            self.velocity[:] = 0.0
+        elif t > self._t:
+            dt = t - self._t
+            tmp, gain = self._tmp, self._gain
+            # velocidade += α_d · ((x − x_anterior) / dt − velocidade)
+            x = 2 * math.pi * self.d_cutoff * dt
+            np.subtract(lm, self._raw, out=tmp)
+            tmp *= 1.0 / dt
+            tmp -= self.velocity
+            tmp *= x / (x + 1.0)
+            self.velocity += tmp
+            if self.smooth_position:
+                # α por elemento, com corte = min_cutoff + β·|velocidade|: α = c / (c + 1), c = 2π·corte·dt
+                np.abs(self.velocity, out=gain)
+                gain *= self.beta
+                gain += self.min_cutoff
+                gain *= 2 * math.pi * dt
+                np.add(gain, 1.0, out=tmp)
+                gain /= tmp
+                np.subtract(lm, self.position, out=tmp)
+                tmp *= gain
+                self.position += tmp
+        else:
+            return (self.position if self.smooth_position else self._raw), self.velocity
+        self._raw[:] = lm
+        self._t = t
+        self.samples += 1
+        return (self.position if self.smooth_position else self._raw), self.velocity
+
+
+class ThresholdClassifier:
+    """Regras de limiar: pinça tem prioridade sobre dois dedos
+
+    Para uma mão só, as 8 comparações saem mais baratas em floats Python
+    (um tolist()) do que em ufuncs sobre arrays de 21 pontos; is_pinch e
+    is_two_fingers_up são as mesmas regras vetorizadas para lotes de frames.
+    """
+
+    name = "limiar"
+
+    def predict(self, lm: np.ndarray) -> str:
+        p = lm.tolist()
+        dx, dy = p[THUMB_TIP][0] - p[INDEX_TIP][0], p[THUMB_TIP][1] - p[INDEX_TIP][1]
+        if dx * dx + dy * dy < PINCH_DIST * PINCH_DIST:
+            return PINCH
+        y = [q[1] for q in p]
+        if y[8] < y[6] < y[5] and y[12] < y[10] < y[9] and y[16] > y[14] and y[20] > y[18]:
+            return TWO_UP
+        return NONE
+
+
+class KNNClassifier:
+    """k vizinhos mais próximos sobre features() padronizadas"""
+
+    name = "knn"
+
+    def __init__(self, samples: np.ndarray, labels: np.ndarray, k: int = 5):
+        samples = np.asarray(samples, dtype=np.float32)
+        self.mean = samples.mean(axis=0)
+        self.std  = samples.std(axis=0) + 1e-6
+        self.samples = (samples - self.mean) / self.std
+        self._norms  = (self.samples ** 2).sum(axis=1)  # |s|², para distâncias com um produto
+        self.labels  = np.asarray(labels)
+        self.classes, self._codes = np.unique(self.labels, return_inverse=True)
+        self.k = min(k, len(samples))
+
+    def predict(self, lm: np.ndarray) -> str:
+        x = (features(lm) - self.mean) / self.std
+        d = self._norms - 2.0 * (self.samples @ x)  # |s − x|² sem o |x|², constante
+        nearest = np.argpartition(d, self.k - 1)[:self.k]
+        votes = np.bincount(self._codes[nearest], minlength=len(self.classes))
+        return str(self.classes[np.argmax(votes)])
+
+    def save(self, path: str):
+        np.savez_compressed(path, samples=self.samples * self.std + self.mean,
+                            labels=self.labels, k=self.k)
+
+    @classmethod
+    def load(cls, path: str) -> "KNNClassifier":
+        data = np.load(path)
+        return cls(data["samples"], data["labels"], int(data["k"]))
+
+
+def load_classifier(path: str = None):
+    """kNN do JARVIS_GESTURE_MODEL, se houver; senão as regras de limiar"""
+    path = path if path is not None else os.getenv("JARVIS_GESTURE_MODEL", "")
+    if path:
+        try:
+            classifier = KNNClassifier.load(path)
+            logger.info(f"🧠 Classificador de gestos kNN: {len(classifier.samples)} amostras, "
+                        f"classes {', '.join(classifier.classes)}")
+            return classifier
+        except (OSError, KeyError, ValueError) as e:
+            logger.warning(f"⚠️  Modelo de gestos inválido ({path}): {e}; usando limiares")
+    return ThresholdClassifier()
+
+
+def load_recording(path: str) -> np.ndarray:
+    """Mãos de uma gravação JSONL do JARVIS_GESTURE_RECORD: (frames com mão, 21, 3)
+
+    A gravação guarda os landmarks crus do MediaPipe, os mesmos que o
+    classificador recebe em tempo real (antes do filtro One-Euro).
+    """
+    hands = []
+    with open(path) as f:
+        for line in f:
+            if line.strip():
+                frame = json.loads(line)
+                hands.extend(frame["hands"][:1])
+    return np.asarray(hands, dtype=np.float32).reshape(-1, NUM_LANDMARKS, 3)
+
+
+def train(recordings: Iterable[Tuple[str, str]], k: int = 5,
+          max_per_label: int = 2000) -> KNNClassifier:
+    """Treina o kNN com [(gravação.jsonl, rótulo)]; limita amostras por rótulo"""
+    rng = np.random.default_rng(0)
+    samples, labels = [], []
+    for path, label in recordings:
+        feats = features(load_recording(path))
+        if len(feats) > max_per_label:
+            feats = feats[rng.choice(len(feats), max_per_label, replace=False)]
+        samples.extend(feats)
+        labels.extend([label] * len(feats))
+        print(f"  {label:12} {len(feats):6} amostras de {path}")
+    if not samples:
+        raise ValueError("Nenhuma mão nas gravações")
+    return KNNClassifier(np.array(samples), np.array(labels), k)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Classificador de gestos (kNN)")
+    sub = parser.add_subparsers(dest="cmd", required=True)
+    p_train = sub.add_parser("train", help="treina com gravações rotuladas")
+    p_train.add_argument("recordings", nargs="+", help="gravacao.jsonl:rótulo "
+                         f"(rótulos usados pelos gestos: {', '.join(LABELS)})")
+    p_train.add_argument("-o", "--output", default="gestos.npz")
+    p_train.add_argument("-k", type=int, default=5)
+    args = parser.parse_args()
+
+    recordings = [tuple(item.rsplit(":", 1)) for item in args.recordings]
+    if any(len(r) != 2 for r in recordings):
+        parser.error("use gravacao.jsonl:rótulo")
+    classifier = train(recordings, args.k)
+    classifier.save(args.output)
+    print(f"💾 Modelo gravado em {args.output} ({len(classifier.samples)} amostras)")
+
+
+if __name__ == "__main__":
+    main()
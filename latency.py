@@ -0,0 +1,239 @@
+#!/usr/bin/env python3
+"""
+Instrumentação de latência do caminho da hotword.
+
+Cada ativação ganha um Trace com marcas de tempo monotônicas por estágio:
+
+  callback → fila → hotword → captura → asr → match → handler
+
+Os intervalos entre marcas consecutivas vão para histogramas no estilo HDR
+(baldes log-lineares, ~1% de erro relativo, memória fixa), por estágio e por
+comando. Um resumo p50/p95/p99 é escrito no log periodicamente e num arquivo
+JSON, que pode ser lido de fora:
+
+  python latency.py            # tabela do último resumo
+  python latency.py --json     # resumo cru
+
+Configuração (.jarvis_config / variáveis de ambiente):
+  JARVIS_LATENCY_INTERVAL   segundos entre resumos no log (padrão: 300, 0 desliga)
+  JARVIS_LATENCY_FILE       arquivo do resumo (padrão: /tmp/jarvis_latency.json)
+"""
+
+import os
+import sys
+import json
+import time
+import logging
+import argparse
+import threading
+from typing import Dict, List, Optional
+import numpy as np
+
+logger = logging.getLogger("Latency")
+
+STAGES = ("callback", "fila", "hotword", "captura", "asr", "match", "handler")
+
+DEFAULT_INTERVAL = 300.0
+DEFAULT_FILE     = "/tmp/jarvis_latency.json"
+PERCENTILES      = (50, 95, 99)
+
+SUB_BUCKET_BITS = 8                       # 256 sub-baldes → 2 dígitos significativos
+SUB_BUCKETS     = 1 << SUB_BUCKET_BITS
+HALF_BUCKETS    = SUB_BUCKETS // 2
+MAX_VALUE_US    = 3600 * 1_000_000        # valores acima de 1 h são saturados
+
+
+class LatencyHistogram:
+    """Histograma log-linear de durações em microssegundos (estilo HdrHistogram)"""
+
+    def __init__(self, max_value_us: int = MAX_VALUE_US):
+        self.max_value = int(max_value_us)
+        self._counts = np.zeros(self._index(self.max_value) + 1, dtype=np.int64)
+        self.count = 0
+        self.total = 0
+        self.min = None
+        self.max = 0
+
+    @staticmethod
+    def _index(value: int) -> int:
+        bucket = max(0, value.bit_length() - SUB_BUCKET_BITS)
+        sub = value >> bucket
+        if bucket == 0:
+            return sub
+        return (bucket + 1) * HALF_BUCKETS + (sub - HALF_BUCKETS)
+
+    @staticmethod
+    def _value(index: int) -> int:
+        """Maior valor equivalente ao balde (limite superior, como no HDR)"""
+        if index < SUB_BUCKETS:
+            return index
+        bucket = index // HALF_BUCKETS - 1
+        sub = index % HALF_BUCKETS + HALF_BUCKETS
+        return ((sub + 1) << bucket) - 1
+
+    def record(self, seconds: float):
+        value = min(max(int(seconds * 1_000_000), 0), self.max_value)
+        self._counts[self._index(value)] += 1
+        self.count += 1
+        self.total += value
+        self.max = max(self.max, value)
+        self.min = value if self.min is None else min(self.min, value)
+
+    def percentile(self, p: float) -> float:
+        """Percentil em segundos (0 se vazio)"""
+        if not self.count:
+            return 0.0
+        target = max(1, int(np.ceil(p / 100.0 * self.count)))
+        index = int(np.searchsorted(np.cumsum(self._counts), target))
+        return min(self._value(index), self.max) / 1_000_000
+
+    def summary(self) -> Dict[str, float]:
+        """Contagem e percentis em milissegundos"""
+        data = {"n": self.count}
+        for p in PERCENTILES:
+            data[f"p{p}"] = round(self.percentile(p) * 1000, 2)
+        data["max"] = round(self.max / 1000, 2)
+        data["média"] = round(self.total / self.count / 1000, 2) if self.count else 0.0
+        return data
+
+
+class Trace:
+    """Marcas de tempo de uma ativação (time.monotonic)"""
+
+    def __init__(self, **marks: float):
+        self.marks: Dict[str, float] = {}
+        for stage in STAGES:
+            if stage in marks:
+                self.marks[stage] = marks[stage]
+
+    def mark(self, stage: str, t: float = None):
+        self.marks[stage] = time.monotonic() if t is None else t
+
+    def intervals(self) -> List[tuple]:
+        """[(de, até, segundos)] entre marcas consecutivas, na ordem dos estágios"""
+        present = [(s, self.marks[s]) for s in STAGES if s in self.marks]
+        return [(a, b, tb - ta) for (a, ta), (b, tb) in zip(present, present[1:])]
+
+    def total(self) -> float:
+        times = [self.marks[s] for s in STAGES if s in self.marks]
+        return times[-1] - times[0] if len(times) > 1 else 0.0
+
+
+class LatencyTracker:
+    """Histogramas por estágio e por comando, com resumo periódico no log"""
+
+    def __init__(self, interval: float = None, path: str = None):
+        self.interval = float(os.getenv("JARVIS_LATENCY_INTERVAL", DEFAULT_INTERVAL)
+                              if interval is None else interval)
+        self.path = path or os.getenv("JARVIS_LATENCY_FILE", DEFAULT_FILE)
+        self.stages: Dict[str, LatencyHistogram] = {}
+        self.commands: Dict[str, LatencyHistogram] = {}
+        self._lock = threading.Lock()
+        self._dirty = False
+        self._stop = threading.Event()
+
+    def record(self, stage: str, seconds: float):
+        """Registra uma duração avulsa (ex.: callback → fila de cada bloco)"""
+        with self._lock:
+            self._histogram(self.stages, stage).record(seconds)
+            self._dirty = True
+
+    def finish(self, trace: Trace, command: Optional[str] = None):
+        """Fecha a ativação: intervalos por estágio e total por comando"""
+        with self._lock:
+            for a, b, seconds in trace.intervals():
+                self._histogram(self.stages, f"{a}→{b}").record(seconds)
+            self._histogram(self.stages, "total").record(trace.total())
+            self._histogram(self.commands, command or "(nenhum)").record(trace.total())
+            self._dirty = True
+
+    @staticmethod
+    def _histogram(table: Dict[str, LatencyHistogram], key: str) -> LatencyHistogram:
+        histogram = table.get(key)
+        if histogram is None:
+            histogram = table[key] = LatencyHistogram()
+        return histogram
+
+    def summary(self) -> dict:
+        """Resumo atual: {"estágios": {...}, "comandos": {...}} em ms"""
+        with self._lock:
+            return {
+                "gerado_em": time.strftime("%Y-%m-%d %H:%M:%S"),
+                "estágios": {k: h.summary() for k, h in self.stages.items()},
+                "comandos": {k: h.summary() for k, h in sorted(self.commands.items())},
+            }
+
+    def format_summary(self, summary: dict = None) -> str:
+        return format_summary(summary or self.summary())
+
+    def dump(self, path: str = None) -> dict:
+        """Grava o resumo em JSON (escrita atômica)"""
+        summary = self.summary()
+        path = path or self.path
+        tmp = path + ".tmp"
+        with open(tmp, "w") as f:
+            json.dump(summary, f, ensure_ascii=False, indent=2)
+        os.replace(tmp, path)
+        return summary
+
+    # ── Resumo periódico ─────────────────────────────────────────────────────
+
+    def start(self):
+        if self.interval > 0:
+            threading.Thread(target=self._report_loop, name="jarvis-latency", daemon=True).start()
+
+    def stop(self):
+        self._stop.set()
+
+    def _report_loop(self):
+        while not self._stop.wait(self.interval):
+            self.report()
+
+    def report(self):
+        """Loga e grava o resumo se houve medições novas"""
+        if not self._dirty:
+            return
+        self._dirty = False
+        try:
+            summary = self.dump()
+        except OSError as e:
+            logger.warning(f"⚠️  Não foi possível gravar o resumo de latência: {e}")
+            summary = self.summary()
+        logger.info("⏱️  Latência do caminho da hotword:\n" + format_summary(summary))
+
+
+def format_summary(summary: dict) -> str:
+    """Tabela legível de um resumo"""
+    header = f"{'':28} {'n':>6} " + " ".join(f"{f'p{p}':>9}" for p in PERCENTILES) + f" {'max':>9}"
+    lines = [header]
+    for title, key in (("Estágios", "estágios"), ("Comandos", "comandos")):
+        rows = summary.get(key, {})
+        if not rows:
+            continue
+        lines.append(f"{title}:")
+        for name, data in rows.items():
+            values = " ".join(f"{data[f'p{p}']:>7.1f}ms" for p in PERCENTILES)
+            lines.append(f"  {name:26} {data['n']:>6} {values} {data['max']:>7.1f}ms")
+    return "\n".join(lines)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Mostra o resumo de latência do Jarvis")
+    parser.add_argument("path", nargs="?", default=os.getenv("JARVIS_LATENCY_FILE", DEFAULT_FILE))
+    parser.add_argument("--json", action="store_true", help="imprime o JSON cru")
+    args = parser.parse_args()
+
+    if not os.path.exists(args.path):
+        print(f"❌ Nenhum resumo em {args.path} (o Jarvis grava a cada JARVIS_LATENCY_INTERVAL s)")
+        sys.exit(1)
+    with open(args.path) as f:
+        summary = json.load(f)
+    if args.json:
+        print(json.dumps(summary, ensure_ascii=False, indent=2))
+    else:
+        print(f"📊 Resumo de {summary.get('gerado_em', '?')}")
+        print(format_summary(summary))
+
+
+if __name__ == "__main__":
+    main()
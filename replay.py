@@ -0,0 +1,373 @@
+#!/usr/bin/env python3
+"""
+Replay offline do caminho da hotword, mais rápido que o tempo real.
+
+Alimenta o mesmo pipeline do start_listening (buffer circular → hotword →
+captura com VAD → _recognize_speech → _find_command) a partir de WAVs, sem
+microfone, câmera ou chave do Picovoice. Os handlers não são executados: o
+comando decidido só é registrado, junto com a latência de cada estágio.
+
+Uso:
+  python replay.py gravacoes/                         # hotword e ASR simulados
+  python replay.py gravacoes/ --asr whisper --model base --grammar
+  python replay.py sessao.wav --hotword porcupine     # precisa PORCUPINE_ACCESS_KEY
+  python replay.py gravacoes/ --json resultado.json
+
+Entradas (WAV PCM 16-bit mono 16 kHz):
+  - diretório: um WAV por comando (texto esperado em labels.json ou no
+    prefixo do nome, como em benchmarks.asr_backends). Cada arquivo vira um
+    trecho da sessão: hotword simulada no início, o áudio e silêncio.
+  - sessão longa: um WAV e, opcionalmente, sessao.json ao lado com
+    {"hotword": [segundos, ...], "commands": ["hora", ...]}.
+"""
+
+import os
+import sys
+import json
+import time
+import wave
+import logging
+import argparse
+from collections import deque
+from dataclasses import dataclass, asdict
+from typing import Callable, List, Optional
+import numpy as np
+
+from audio_buffer import AudioRingBuffer, FrameAligner
+from asr import ASRBackend, ASRResult, BACKENDS, create_backend
+from command_matcher import fold
+from latency import LatencyTracker, format_summary
+from jarvis_final import JarvisFinal
+
+SAMPLE_RATE = 16000
+LEAD_IN     = 0.5   # s de silêncio antes do primeiro trecho
+GAP         = 1.5   # s de silêncio entre trechos (deixa o VAD encerrar a captura)
+MARK_LEAD   = 0.1   # s entre a hotword simulada e o início do WAV
+
+
+@dataclass
+class Utterance:
+    name: str
+    start: int                 # amostra da hotword (marca ou início do trecho)
+    end: int                   # fim do trecho
+    expected: Optional[str] = None
+
+
+@dataclass
+class Activation:
+    position: float            # s no stream em que a hotword disparou
+    utterance: Optional[str] = None
+    expected: Optional[str] = None
+    text: Optional[str] = None
+    command: Optional[str] = None
+    correct: Optional[bool] = None
+
+
+def _read_pcm(path: str) -> np.ndarray:
+    with wave.open(path, "rb") as w:
+        if w.getsampwidth() != 2 or w.getnchannels() != 1 or w.getframerate() != SAMPLE_RATE:
+            raise ValueError(f"{path}: esperado PCM 16-bit mono {SAMPLE_RATE} Hz")
+        return np.frombuffer(w.readframes(w.getnframes()), dtype=np.int16)
+
+
+def load_directory(directory: str):
+    """Monta uma sessão com um trecho por WAV; retorna (áudio int16, [Utterance])"""
+    labels = {}
+    labels_path = os.path.join(directory, "labels.json")
+    if os.path.exists(labels_path):
+        with open(labels_path) as f:
+            labels = json.load(f)
+
+    parts = [np.zeros(int(LEAD_IN * SAMPLE_RATE), dtype=np.int16)]
+    utterances = []
+    pos = len(parts[0])
+    for name in sorted(os.listdir(directory)):
+        if not name.endswith(".wav"):
+            continue
+        pcm = _read_pcm(os.path.join(directory, name))
+        expected = labels.get(name, name[:-4].split("_")[0])
+        mark = pos - int(MARK_LEAD * SAMPLE_RATE)
+        utterances.append(Utterance(name, mark, pos + len(pcm), expected))
+        gap = np.zeros(int(GAP * SAMPLE_RATE), dtype=np.int16)
+        parts += [pcm, gap]
+        pos += len(pcm) + len(gap)
+    return np.concatenate(parts), utterances
+
+
+def load_session(path: str):
+    """WAV longo + marcas opcionais em <arquivo>.json; retorna (áudio int16, [Utterance])"""
+    pcm = _read_pcm(path)
+    marks_path = os.path.splitext(path)[0] + ".json"
+    utterances = []
+    if os.path.exists(marks_path):
+        with open(marks_path) as f:
+            marks = json.load(f)
+        starts = [int(s * SAMPLE_RATE) for s in marks.get("hotword", [])]
+        commands = marks.get("commands", [])
+        for i, start in enumerate(starts):
+            end = starts[i + 1] if i + 1 < len(starts) else len(pcm)
+            expected = commands[i] if i < len(commands) else None
+            utterances.append(Utterance(f"{os.path.basename(path)}@{start / SAMPLE_RATE:.1f}s",
+                                        start, end, expected))
+    # Silêncio no fim para a última captura terminar
+    tail = np.zeros(int(GAP * SAMPLE_RATE), dtype=np.int16)
+    return np.concatenate([pcm, tail]), utterances
+
+
+class PacedRing(AudioRingBuffer):
+    """Buffer que anota até onde a captura do comando já pediu áudio
+
+    Sem microfone, o escritor é infinitamente mais rápido que o leitor; com
+    um comando em andamento, o replay só escreve quando a captura está
+    esperando por mais amostras, como aconteceria em tempo real.
+    """
+
+    def __init__(self, capacity: int, dtype=np.int16):
+        super().__init__(capacity, dtype)
+        self.demand = 0
+
+    def wait_for(self, position: int, timeout: float = None) -> bool:
+        with self._cond:
+            self.demand = max(self.demand, position)
+            self._cond.notify_all()
+        return super().wait_for(position, timeout)
+
+    def wait_demand(self, timeout: float) -> bool:
+        """Espera um leitor pedir amostras além do que já foi escrito"""
+        with self._cond:
+            return self._cond.wait_for(lambda: self.demand > self.position, timeout)
+
+
+class ScheduledHotword:
+    """Porcupine simulado: dispara no frame que alcança cada marca da sessão"""
+
+    def __init__(self, positions: List[int], frame_length: int = 512):
+        self.frame_length = frame_length
+        self._marks = sorted(positions)
+        self._next = 0
+        self._pos = 0
+
+    def process(self, frame) -> int:
+        self._pos += len(frame)
+        hit = False
+        while self._next < len(self._marks) and self._marks[self._next] < self._pos:
+            self._next += 1
+            hit = True
+        return 0 if hit else -1
+
+    def delete(self):
+        pass
+
+
+class ScriptedASR(ASRBackend):
+    """ASR simulado: devolve o texto esperado do trecho atual (com atraso opcional)"""
+
+    name = "roteiro"
+
+    def __init__(self, text_for: Callable[[], str], delay: float = 0.0, **options):
+        super().__init__(**options)
+        self.text_for = text_for
+        self.delay = delay
+
+    def load(self):
+        pass
+
+    def transcribe(self, audio_float32: np.ndarray) -> ASRResult:
+        if self.delay:
+            time.sleep(self.delay)
+        return ASRResult(self.text_for() or "")
+
+    def describe(self) -> str:
+        return f"{self.name} (atraso {self.delay * 1000:.0f} ms)"
+
+
+class ReplayJarvis(JarvisFinal):
+    """JarvisFinal sem dispositivos: recebe o áudio do replay e só registra os comandos"""
+
+    def __init__(self, speculative: bool = False):
+        self._init_state("jarvis")
+        self.logger = logging.getLogger("Replay")
+        self.latency = LatencyTracker(interval=0)
+        self.speculative = speculative
+        self._init_command_mapping()
+        self.audio_ring = PacedRing(self.audio_ring.capacity)
+        self.utterances: List[Utterance] = []
+        self.activations: List[Activation] = []
+        self.current: Optional[Activation] = None
+
+    @property
+    def current_expected(self) -> Optional[str]:
+        return self.current.expected if self.current else None
+
+    def _utterance_at(self, position: int) -> Optional[Utterance]:
+        for utterance in self.utterances:
+            if utterance.start <= position <= utterance.end:
+                return utterance
+        return None
+
+    # ── Ganchos no pipeline ──────────────────────────────────────────────────
+
+    def _detect_hotword(self, frame: np.ndarray, frame_end: int = 0) -> bool:
+        hit = super()._detect_hotword(frame, frame_end)
+        if hit and not self.is_processing_command:
+            utterance = self._utterance_at(frame_end)
+            self.current = Activation(round(frame_end / self.sample_rate, 3),
+                                      utterance.name if utterance else None,
+                                      utterance.expected if utterance else None)
+            self.activations.append(self.current)
+        return hit
+
+    def _recognize_speech(self, audio_float32: np.ndarray, grammar_result: ASRResult = None,
+                          speech_end: int = None) -> str:
+        text = super()._recognize_speech(audio_float32, grammar_result, speech_end)
+        if self.current is not None:
+            self.current.text = text
+        return text
+
+    def _execute_command(self, command: str, trace=None):
+        """Registra o comando em vez de executá-lo"""
+        if self.current is not None:
+            self.current.command = command
+            if self.current.expected is not None:
+                self.current.correct = fold(command) == fold(self.current.expected)
+        if trace is not None:
+            trace.mark("handler")
+            self.latency.finish(trace, command)
+
+    # ── Alimentação do stream ────────────────────────────────────────────────
+
+    def replay(self, audio: np.ndarray, utterances: List[Utterance]) -> float:
+        """Roda a sessão o mais rápido possível; retorna o tempo de parede em s"""
+        self.utterances = utterances
+        frame_length = self.porcupine.frame_length if self.porcupine else 512
+        aligner = FrameAligner(self.audio_ring, frame_length)
+        blocks = deque(maxlen=64)
+
+        t0 = time.perf_counter()
+        for i in range(0, len(audio), self.chunk_size):
+            self._wait_for_capture()
+            self._feed(audio[i:i + self.chunk_size], aligner, blocks)
+
+        # Fim do áudio: silêncio enquanto a última captura pedir amostras
+        silence = np.zeros(self.chunk_size, dtype=np.int16)
+        while self.is_processing_command:
+            self._wait_for_capture()
+            if self.is_processing_command:
+                self._feed(silence, aligner, blocks)
+        return time.perf_counter() - t0
+
+    def _feed(self, block: np.ndarray, aligner: FrameAligner, blocks: deque):
+        self._audio_callback(block[:, None], len(block), None, None)
+        self._consume_audio(aligner, blocks, self.audio_queue.drain(timeout=0))
+
+    def _wait_for_capture(self):
+        """Com um comando em andamento, só segue quando a captura pede mais áudio ou termina"""
+        while self.is_processing_command:
+            if self.audio_ring.wait_demand(timeout=0.005):
+                return
+            if self.command_thread is not None and not self.command_thread.is_alive():
+                return
+
+
+def build_report(jarvis: ReplayJarvis, audio_s: float, wall_s: float) -> dict:
+    activations = jarvis.activations
+    detected = {a.utterance for a in activations if a.utterance}
+    scored = [a for a in activations if a.correct is not None]
+    labelled = [u for u in jarvis.utterances if u.expected is not None]
+    return {
+        "áudio_s": round(audio_s, 2),
+        "parede_s": round(wall_s, 3),
+        "velocidade": round(audio_s / wall_s, 1) if wall_s else None,
+        "trechos": len(jarvis.utterances),
+        "detecções": len(activations),
+        "trechos_detectados": len(detected),
+        "falsas_ativações": sum(1 for a in activations if a.utterance is None and jarvis.utterances),
+        "comandos_corretos": sum(1 for a in scored if a.correct),
+        "acerto": round(sum(1 for a in scored if a.correct) / len(labelled), 4) if labelled else None,
+        "ativações": [asdict(a) for a in activations],
+        "latência": jarvis.latency.summary(),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Replay offline do pipeline do Jarvis")
+    parser.add_argument("source", help="diretório de WAVs ou WAV de uma sessão longa")
+    parser.add_argument("--hotword", choices=["stub", "porcupine"], default="stub",
+                        help="stub dispara nas marcas da sessão (padrão)")
+    parser.add_argument("--asr", choices=["stub", *BACKENDS], default="stub",
+                        help="stub devolve o texto esperado (padrão)")
+    parser.add_argument("--model", default="base")
+    parser.add_argument("--threads", type=int, default=0)
+    parser.add_argument("--stub-delay", type=float, default=0.0,
+                        help="atraso simulado do ASR stub, em ms")
+    parser.add_argument("--grammar", action="store_true", help="ativa o caminho rápido (Vosk)")
+    parser.add_argument("--speculative", action="store_true", help="decisão durante a fala")
+    parser.add_argument("--json", help="grava o relatório neste arquivo")
+    parser.add_argument("-v", "--verbose", action="store_true", help="log do pipeline")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO if args.verbose else logging.WARNING,
+                        format="%(asctime)s - %(levelname)s - %(message)s")
+
+    if os.path.isdir(args.source):
+        audio, utterances = load_directory(args.source)
+    else:
+        audio, utterances = load_session(args.source)
+    if not len(audio):
+        print(f"❌ Nenhum áudio em {args.source}")
+        sys.exit(1)
+
+    jarvis = ReplayJarvis(speculative=args.speculative)
+    if args.hotword == "porcupine":
+        jarvis._init_porcupine()
+        if jarvis.porcupine is None:
+            sys.exit(1)
+    elif not utterances:
+        print("❌ Sessão sem marcas de hotword: crie o .json ao lado do WAV ou use --hotword porcupine")
+        sys.exit(1)
+    else:
+        jarvis.porcupine = ScheduledHotword([u.start for u in utterances])
+
+    if args.asr == "stub":
+        jarvis.asr = ScriptedASR(lambda: jarvis.current_expected, delay=args.stub_delay / 1000,
+                                 sample_rate=SAMPLE_RATE)
+    else:
+        jarvis.asr = create_backend(args.asr, model=args.model, threads=args.threads,
+                                    sample_rate=SAMPLE_RATE)
+    print(f"🔄 Carregando ASR {jarvis.asr.describe()}...")
+    jarvis.asr.load()
+    if args.grammar:
+        jarvis._init_grammar()
+
+    audio_s = len(audio) / SAMPLE_RATE
+    print(f"▶️  Replay de {audio_s:.1f}s de áudio ({len(utterances)} trechos)")
+    wall_s = jarvis.replay(audio, utterances)
+    report = build_report(jarvis, audio_s, wall_s)
+
+    print()
+    for a in jarvis.activations:
+        mark = {True: "✅", False: "❌", None: "➖"}[a.correct]
+        print(f"  {mark} {a.position:8.2f}s {a.utterance or '(falsa ativação)':<28} "
+              f"texto='{a.text or ''}' comando={a.command} esperado={a.expected}")
+    missed = [u.name for u in utterances if u.name not in {a.utterance for a in jarvis.activations}]
+    for name in missed:
+        print(f"  🔇 hotword não detectada: {name}")
+
+    print()
+    print(f"⏱️  {report['áudio_s']}s de áudio em {report['parede_s']}s "
+          f"({report['velocidade']}x tempo real)")
+    print(f"🔥 Detecções: {report['detecções']} ({report['trechos_detectados']}/{report['trechos']} trechos, "
+          f"{report['falsas_ativações']} falsas)")
+    if report["acerto"] is not None:
+        print(f"🎯 Comandos corretos: {report['comandos_corretos']} ({report['acerto']:.0%})")
+    print(format_summary(report["latência"]))
+
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(report, f, ensure_ascii=False, indent=2)
+
+    jarvis.asr.close()
+
+
+if __name__ == "__main__":
+    main()
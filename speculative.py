@@ -0,0 +1,49 @@
+#!/usr/bin/env python3
+"""
+Transcrição especulativa: decide o comando enquanto o usuário ainda fala.
+
+Hipóteses parciais (PartialResult do Vosk ou Whisper sobre o buffer que
+cresce) são casadas com os comandos à medida que chegam. Um comando só é
+confirmado quando a hipótese fica estável por um tempo mínimo de áudio, para
+não disparar com uma palavra pela metade.
+"""
+
+from typing import Iterable, Optional
+
+
+def ambiguous_prefixes(phrases: Iterable[str]) -> set:
+    """Frases que são início de outra frase ("ligar" vs "ligar aura")
+
+    Esses comandos só podem ser decididos depois do fim da fala.
+    """
+    phrases = list(phrases)
+    return {p for p in phrases
+            if any(o != p and o.startswith(p + " ") for o in phrases)}
+
+
+class StableHypothesis:
+    """Confirma um comando quando as hipóteses parciais concordam por tempo suficiente"""
+
+    def __init__(self, hold_samples: int, excluded: Iterable[str] = ()):
+        self.hold_samples = hold_samples
+        self.excluded     = set(excluded)
+        self.reset()
+
+    def reset(self):
+        self.command   = None
+        self.since     = 0
+        self.confirmed = None
+
+    def update(self, command: Optional[str], position: int) -> Optional[str]:
+        """Registra o comando da hipótese atual na posição (amostras) informada"""
+        if self.confirmed is not None:
+            return self.confirmed
+        if command is None or command in self.excluded:
+            self.command = None
+            return None
+        if command != self.command:
+            self.command = command
+            self.since   = position
+        elif position - self.since >= self.hold_samples:
+            self.confirmed = command
+        return self.confirmed
@@ -0,0 +1,30 @@
+import os
+import sys
+
+import numpy as np
+import pytest
+
+# Os módulos do Jarvis ficam na raiz do repositório, sem pacote
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+def synthetic_hand(wrist_x: float, wrist_y: float, pinch: bool = False,
+                   two_up: bool = False) -> np.ndarray:
+    """Mão sintética (21, 3) com os landmarks do MediaPipe em coordenadas normalizadas"""
+    pts = [[wrist_x + 0.02 * (i % 5), wrist_y - 0.03 * (i // 4), 0.0] for i in range(21)]
+    pts[0] = [wrist_x, wrist_y, 0.0]
+    pts[4] = [wrist_x + 0.10, wrist_y - 0.10, 0.0]          # ponta do polegar
+    pts[8] = [wrist_x + 0.25, wrist_y - 0.25, 0.0]          # ponta do indicador
+    if pinch:
+        pts[8] = [pts[4][0] + 0.02, pts[4][1], 0.0]
+    if two_up:
+        for tip, pip, mcp in ((8, 6, 5), (12, 10, 9)):     # indicador e médio erguidos
+            pts[mcp][1], pts[pip][1], pts[tip][1] = wrist_y - 0.10, wrist_y - 0.18, wrist_y - 0.26
+        for tip, pip in ((16, 14), (20, 18)):               # anelar e mínimo dobrados
+            pts[pip][1], pts[tip][1] = wrist_y - 0.12, wrist_y - 0.05
+    return np.asarray(pts, dtype=np.float32)
+
+
+@pytest.fixture
+def make_hand():
+    return synthetic_hand
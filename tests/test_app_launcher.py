@@ -0,0 +1,36 @@
+from app_launcher import parse_window_classes, split_wm_class
+
+# Saída real do `wmctrl -lx`: id, desktop, WM_CLASS, host, título (com espaços)
+WMCTRL = """\
+0x02a00003  0 slack.Slack           notebook Slack | geral | Empresa
+0x03c00007  0 google-chrome.Google-chrome  notebook Spotify – Web Player: Music for everyone - Google Chrome
+0x04200001  0 web.whatsapp.com.Google-chrome  notebook WhatsApp
+0x04400004  0 org.gnome.Nautilus.Org.gnome.Nautilus  notebook Downloads
+0x01e00002 -1 N/A                   notebook Desktop
+"""
+
+
+def test_titles_do_not_count():
+    classes = parse_window_classes(WMCTRL)
+    assert "spotify" not in classes
+    assert {"slack", "google-chrome"} <= classes
+
+
+def test_wm_class_with_dots():
+    classes = parse_window_classes(WMCTRL)
+    assert {"web.whatsapp.com", "org.gnome.nautilus"} <= classes
+    assert "whatsapp" not in classes and "gnome" not in classes
+
+
+def test_malformed_lines_are_ignored():
+    output = WMCTRL + "wmctrl: não consegue abrir o display\n0x05000001  0\n\n   \n"
+    assert parse_window_classes(output) == parse_window_classes(WMCTRL)
+    assert "n/a" not in parse_window_classes(WMCTRL)
+
+
+def test_split_wm_class():
+    assert split_wm_class("slack.Slack") == {"slack"}
+    assert split_wm_class("cursor.Cursor") == {"cursor"}
+    assert split_wm_class("crx_abc.Google-chrome") == {"crx_abc", "google-chrome"}
+    assert split_wm_class("xterm") == {"xterm"}
+    assert split_wm_class("") == set()
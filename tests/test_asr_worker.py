@@ -0,0 +1,56 @@
+import time
+
+import numpy as np
+import pytest
+
+import asr_worker
+from asr import ASRBackend, ASRResult
+from asr_worker import ASRWorker, parse_cpus
+
+
+class EchoBackend(ASRBackend):
+    """Devolve o número de amostras e a média; dorme quando a primeira amostra é > 0.5"""
+
+    name = "eco"
+
+    def load(self):
+        pass
+
+    def transcribe(self, audio_float32):
+        if len(audio_float32) and audio_float32[0] > 0.5:
+            time.sleep(2.0)
+        return ASRResult(f"{len(audio_float32)} {audio_float32.mean():.2f}")
+
+
+@pytest.fixture
+def worker():
+    worker = ASRWorker(EchoBackend(), max_seconds=1)
+    worker.load()
+    yield worker
+    worker.close()
+
+
+def test_parse_cpus():
+    assert parse_cpus("2,3") == [2, 3]
+    assert parse_cpus("1-3, 6") == [1, 2, 3, 6]
+    assert parse_cpus("") == []
+
+
+def test_transcribe_through_shared_memory(worker):
+    assert worker.transcribe(np.full(800, 0.25, dtype=np.float32)).text == "800 0.25"
+    assert worker.transcribe(np.full(1600, -0.5, dtype=np.float32)).text == "1600 -0.50"
+
+
+def test_audio_longer_than_buffer_is_rejected(worker):
+    with pytest.raises(ValueError):
+        worker.transcribe(np.zeros(worker.capacity + 1, dtype=np.float32))
+
+
+def test_timeout_restarts_worker_and_ignores_late_reply(worker, monkeypatch):
+    monkeypatch.setattr(asr_worker, "REQUEST_TIMEOUT", 0.3)
+    pid = worker._process.pid
+    with pytest.raises(TimeoutError):
+        worker.transcribe(np.full(800, 0.9, dtype=np.float32))
+    # O pedido seguinte sobe um processo novo e recebe a própria resposta
+    assert worker.transcribe(np.full(400, 0.1, dtype=np.float32)).text == "400 0.10"
+    assert worker._process.pid != pid
@@ -0,0 +1,123 @@
+import queue
+
+import numpy as np
+import pytest
+
+from audio_buffer import AudioRingBuffer, BlockQueue, FrameAligner
+
+
+def _ramp(start, n):
+    return np.arange(start, start + n, dtype=np.float32)
+
+
+def test_read_returns_written_samples():
+    ring = AudioRingBuffer(16)
+    ring.write(_ramp(0, 10))
+    assert ring.position == 10
+    np.testing.assert_array_equal(ring.read(2, 7), _ramp(2, 5))
+
+
+def test_read_across_wraparound():
+    ring = AudioRingBuffer(16)
+    ring.write(_ramp(0, 12))
+    ring.write(_ramp(12, 10))  # posições 16..21 caem no início do buffer
+    assert ring.position == 22
+    np.testing.assert_array_equal(ring.read(10, 22), _ramp(10, 12))
+
+
+def test_view_is_copy_free_unless_it_wraps():
+    ring = AudioRingBuffer(16)
+    ring.write(_ramp(0, 20))
+    inside = ring.view(8, 12)
+    assert np.shares_memory(inside, ring._buf)
+    np.testing.assert_array_equal(inside, _ramp(8, 4))
+    wrapped = ring.view(14, 18)
+    assert not np.shares_memory(wrapped, ring._buf)
+    np.testing.assert_array_equal(wrapped, _ramp(14, 4))
+
+
+def test_overrun_clamps_to_oldest_available_sample():
+    ring = AudioRingBuffer(16)
+    ring.write(_ramp(0, 40))
+    # Só as últimas 16 amostras sobrevivem; o pedido é recortado a elas
+    np.testing.assert_array_equal(ring.read(0, 40), _ramp(24, 16))
+    assert len(ring.read(0, 20)) == 0
+
+
+def test_block_larger_than_capacity_keeps_tail_at_right_positions():
+    ring = AudioRingBuffer(16)
+    ring.write(_ramp(0, 5))
+    ring.write(_ramp(5, 37))
+    assert ring.position == 42
+    np.testing.assert_array_equal(ring.read(26, 42), _ramp(26, 16))
+
+
+def test_read_past_writer_is_truncated():
+    ring = AudioRingBuffer(16)
+    ring.write(_ramp(0, 8))
+    np.testing.assert_array_equal(ring.read(4, 100), _ramp(4, 4))
+    assert not ring.wait_for(9, timeout=0.01)
+    assert ring.wait_for(8, timeout=0.01)
+
+
+def _frames(aligner):
+    return [(frame.copy(), end) for frame, end in aligner.frames()]
+
+
+def test_aligner_carries_leftover_across_blocks():
+    ring = AudioRingBuffer(64)
+    aligner = FrameAligner(ring, 8)
+    ring.write(_ramp(0, 5))
+    assert _frames(aligner) == []
+    ring.write(_ramp(5, 14))  # 19 amostras: 2 frames, sobram 3
+    frames = _frames(aligner)
+    assert [end for _, end in frames] == [8, 16]
+    np.testing.assert_array_equal(frames[1][0], _ramp(8, 8))
+    ring.write(_ramp(19, 5))
+    (frame, end), = _frames(aligner)
+    assert end == 24
+    np.testing.assert_array_equal(frame, _ramp(16, 8))
+    assert aligner.skipped == 0
+
+
+def test_aligner_frames_are_views_when_capacity_is_a_multiple():
+    ring = AudioRingBuffer(32)
+    aligner = FrameAligner(ring, 8)
+    for start in range(0, 96, 12):
+        ring.write(_ramp(start, 12))
+        for frame, end in aligner.frames():
+            assert np.shares_memory(frame, ring._buf)
+            np.testing.assert_array_equal(frame, _ramp(end - 8, 8))
+
+
+def test_aligner_skips_ahead_when_lagging():
+    ring = AudioRingBuffer(64)
+    aligner = FrameAligner(ring, 8)
+    ring.write(_ramp(0, 40))  # atraso 40 > capacity // 2
+    frames = _frames(aligner)
+    # Pula para ficar ~capacity // 4 atrás do escritor, alinhado ao frame
+    assert aligner.skipped == 24
+    assert [end for _, end in frames] == [32, 40]
+    np.testing.assert_array_equal(frames[0][0], _ramp(24, 8))
+
+
+def test_block_queue_drops_oldest_when_full():
+    q = BlockQueue(maxsize=3)
+    for i in range(5):
+        q.put(i)
+    assert q.dropped == 2
+    assert q.max_depth == 3
+    assert q.drain(timeout=0) == [2, 3, 4]
+    assert q.qsize() == 0
+
+
+def test_block_queue_get_and_empty():
+    q = BlockQueue(maxsize=2)
+    with pytest.raises(queue.Empty):
+        q.get(timeout=0.01)
+    with pytest.raises(queue.Empty):
+        q.drain(timeout=0.01)
+    q.put("a")
+    q.put("b")
+    assert q.get(timeout=0) == "a"
+    assert q.drain(timeout=0) == ["b"]
@@ -0,0 +1,63 @@
+import numpy as np
+import pytest
+
+pytest.importorskip("cv2")
+
+from camera import POOL_SIZE, Camera  # noqa: E402
+
+
+class FakeCapture:
+    """read(buf) escreve um contador no buffer, como o cv2.VideoCapture"""
+
+    def __init__(self, shape=(4, 6, 3)):
+        self.shape = shape
+        self.count = 0
+
+    def read(self, image=None):
+        self.count += 1
+        if image is None:
+            image = np.empty(self.shape, dtype=np.uint8)
+        image[:] = self.count % 256
+        return True, image
+
+    def release(self):
+        pass
+
+
+def _camera():
+    cap = FakeCapture()
+    camera = Camera(0, size=(6, 4), fps=30)
+    _, first = cap.read()
+    camera._attach(cap, first)
+    return camera
+
+
+def test_leased_frame_is_not_overwritten_by_later_reads():
+    camera = _camera()
+    held = camera.read()
+    value = int(held[0, 0, 0])
+    for _ in range(3 * POOL_SIZE):
+        camera.recycle(camera.read())
+    assert (held == value).all()
+
+
+def test_recycled_buffers_are_reused():
+    camera = _camera()
+    seen = set()
+    for _ in range(20):
+        frame = camera.read()
+        seen.add(id(frame))
+        camera.recycle(frame)
+    assert len(seen) == 1
+    assert len(camera._pool) == POOL_SIZE
+
+
+def test_pool_grows_when_consumer_holds_every_buffer():
+    camera = _camera()
+    frames = [camera.read() for _ in range(POOL_SIZE + 2)]
+    assert len({id(f) for f in frames}) == POOL_SIZE + 2
+    assert len(camera._pool) == POOL_SIZE + 2
+    for frame in frames:
+        camera.recycle(frame)
+        camera.recycle(frame)  # devolver duas vezes não duplica o buffer
+    assert len(camera._free) == POOL_SIZE + 2
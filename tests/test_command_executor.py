@@ -0,0 +1,86 @@
+import threading
+import time
+
+import pytest
+
+from command_executor import CommandExecutor
+
+
+@pytest.fixture
+def executor():
+    return CommandExecutor(max_workers=2, max_pending=2)
+
+
+def test_running_task_sees_cancel_all(executor):
+    started, seen = threading.Event(), []
+
+    def handler():
+        started.set()
+        seen.append(executor.sleep(5))
+        seen.append(executor.cancelled())
+
+    task = executor.submit("desliga", handler)
+    assert started.wait(1)
+    assert executor.cancel_all() == 1
+    assert task.wait(1)
+    assert seen == [False, True]
+    assert task.state == "cancelado"
+    assert executor.active() == []
+
+
+def _occupy_workers(executor, gate, count=2):
+    """Ocupa os workers com comandos que esperam o gate"""
+    running = threading.Semaphore(0)
+
+    def blocker():
+        running.release()
+        gate.wait(2)
+
+    tasks = [executor.submit(f"lento{i}", blocker) for i in range(count)]
+    for _ in range(count):
+        assert running.acquire(timeout=1)
+    return tasks
+
+
+def test_pending_task_cancelled_before_start(executor):
+    gate, ran = threading.Event(), []
+    blockers = _occupy_workers(executor, gate)
+    pending = executor.submit("trabalho", lambda: ran.append(True))
+    executor.cancel_all()
+    gate.set()
+    assert pending.wait(1) and all(t.wait(1) for t in blockers)
+    assert ran == []
+
+
+def test_task_past_timeout_expires(executor):
+    seen = []
+    task = executor.submit("música", lambda: seen.append(executor.sleep(5)), timeout=0.1)
+    t0 = time.monotonic()
+    assert task.wait(2)
+    assert time.monotonic() - t0 < 1
+    assert seen == [False]
+    assert task.state == "timeout"
+
+
+def test_full_queue_rejects_and_errors_are_recorded(executor):
+    gate = threading.Event()
+    blockers = _occupy_workers(executor, gate)
+    queued = [executor.submit(f"c{i}", lambda: None) for i in range(3)]
+    assert queued[-1] is None  # 2 rodando + 2 na fila
+    gate.set()
+    assert all(t.wait(1) for t in blockers + queued[:2])
+    failed = executor.submit("erro", lambda: 1 / 0)
+    assert failed.wait(1)
+    assert failed.state == "erro" and isinstance(failed.error, ZeroDivisionError)
+
+
+def test_immediate_commands_bypass_the_pool():
+    jarvis_final = pytest.importorskip("jarvis_final")
+    jarvis = jarvis_final.JarvisFinal.headless()
+    ran_on = []
+    jarvis.commands["cancela"] = lambda: ran_on.append(threading.current_thread())
+    submitted = []
+    jarvis.executor.submit = lambda *args, **kwargs: submitted.append(args)
+    jarvis._execute_command("cancela")
+    assert ran_on == [threading.current_thread()]
+    assert submitted == []
@@ -0,0 +1,73 @@
+import pytest
+
+from command_matcher import (FUZZY_CUTOFF, SCORE_EXACT, SCORE_FUZZY, AhoCorasick, CommandMatcher,
+                             fold, phonetic)
+
+# Mesmas frases de JarvisFinal._init_command_mapping
+COMMANDS = ["teste", "hora", "data", "ajuda", "navegador", "status", "olá", "ola",
+            "trabalho", "música", "musica", "ligar aura", "desliga", "cancela", "fechar"]
+
+
+@pytest.fixture(scope="module")
+def matcher():
+    return CommandMatcher(COMMANDS)
+
+
+def test_fold_and_phonetic_keys():
+    assert fold("  Música, POR favor! ") == "musica por favor"
+    assert phonetic("fechar") == phonetic("fexar")
+    assert phonetic("hora") == phonetic("ora")
+
+
+def test_aho_corasick_finds_overlapping_patterns():
+    automaton = AhoCorasick(["he", "she", "hers"])
+    assert sorted(automaton.find("ushers")) == ["he", "hers", "she"]
+
+
+def test_exact_tier(matcher):
+    match = matcher.best("status")
+    assert (match.command, match.method, match.score) == ("status", "exato", SCORE_EXACT)
+
+
+def test_substring_tier_needs_whole_words(matcher):
+    match = matcher.best("jarvis ligar aura por favor")
+    assert (match.command, match.method) == ("ligar aura", "substring")
+    assert all(m.method != "substring" for m in matcher.match("agora"))
+
+
+def test_longer_substring_wins(matcher):
+    matches = matcher.match("teste de ajuda")
+    assert matches[0].command == "teste"  # "teste" é mais longa que "ajuda"
+    assert {m.command for m in matches} == {"teste", "ajuda"}
+
+
+def test_phonetic_tier(matcher):
+    match = matcher.best("fexar")
+    assert (match.command, match.method) == ("fechar", "fonético")
+
+
+def test_fuzzy_tier(matcher):
+    match = matcher.best("navgador")
+    assert (match.command, match.method) == ("navegador", "fuzzy")
+    assert matcher.best("que horas são").command == "hora"
+
+
+def test_fuzzy_cutoff_boundary():
+    # 10 letras cada; similaridade do difflib = 2·iguais / 20
+    matcher = CommandMatcher(["abcdefghij"])
+    above, below = "abcdefghyz", "abcdefgxyz"  # 8 iguais → 0.80, 7 iguais → 0.70
+    assert 0.70 < FUZZY_CUTOFF < 0.80
+    match = matcher.best(above)
+    assert (match.method, match.score) == ("fuzzy", round(SCORE_FUZZY * 0.8, 4))
+    assert matcher.best(below) is None
+
+
+@pytest.mark.parametrize("text", ["tá", "tá bom", "dá", "nada não", "agora", "bom dia gente",
+                                  "hum acho que não", "", "!!!"])
+def test_short_or_unrelated_speech_does_not_match(matcher, text):
+    assert matcher.best(text) is None
+
+
+def test_duplicate_folded_phrases_keep_first(matcher):
+    assert matcher.best("musica").command == "música"
+    assert len(matcher) == len(COMMANDS) - 2  # "ola" e "musica" dobram para frases já vistas
@@ -0,0 +1,153 @@
+import json
+
+import numpy as np
+import pytest
+
+from landmarks import (EURO_RESET_GAP, NONE, PINCH, TWO_UP, KNNClassifier, OneEuroFilter,
+                       ThresholdClassifier, features, is_pinch, is_two_fingers_up,
+                       load_classifier, train)
+
+
+def _jitter(hand, rng, scale=0.003):
+    return hand + rng.normal(0, scale, hand.shape).astype(np.float32)
+
+
+def test_threshold_classifier_labels(make_hand):
+    classifier = ThresholdClassifier()
+    assert classifier.predict(make_hand(0.5, 0.6)) == NONE
+    assert classifier.predict(make_hand(0.5, 0.6, pinch=True)) == PINCH
+    assert classifier.predict(make_hand(0.5, 0.6, two_up=True)) == TWO_UP
+    both = make_hand(0.5, 0.6, two_up=True)
+    both[4] = both[8] + np.float32([0.02, 0.0, 0.0])  # polegar encostado no indicador erguido
+    assert classifier.predict(both) == PINCH  # pinça tem prioridade
+
+
+def test_scalar_rules_match_batched_rules(make_hand):
+    rng = np.random.default_rng(0)
+    hands = np.stack([_jitter(make_hand(0.5, 0.6, pinch=i % 3 == 0, two_up=i % 2 == 0), rng, 0.03)
+                      for i in range(300)])
+    pinch, two_up = is_pinch(hands), is_two_fingers_up(hands)
+    expected = np.where(pinch, PINCH, np.where(two_up, TWO_UP, NONE))
+    classifier = ThresholdClassifier()
+    assert [classifier.predict(hand) for hand in hands] == expected.tolist()
+    assert pinch.any() and two_up.any() and not (pinch | two_up).all()
+
+
+def test_features_are_translation_and_scale_invariant(make_hand):
+    hand = make_hand(0.3, 0.7, two_up=True)
+    moved = (hand - hand[0]) * 1.7 + np.float32([0.2, -0.1, 0.0])
+    assert features(hand).shape == (43,)
+    np.testing.assert_allclose(features(hand), features(moved), atol=1e-5)
+    batch = features(np.stack([hand, moved]))
+    assert batch.shape == (2, 43)
+    np.testing.assert_allclose(batch[0], features(hand))
+
+
+def _recording(path, hands):
+    with open(path, "w") as f:
+        for i, hand in enumerate(hands):
+            f.write(json.dumps({"t": i / 30, "hands": [hand.tolist()]}) + "\n")
+            f.write(json.dumps({"t": i / 30, "hands": []}) + "\n")  # frames sem mão são ignorados
+    return str(path)
+
+
+@pytest.fixture
+def knn(tmp_path, make_hand):
+    rng = np.random.default_rng(1)
+    kinds = {PINCH: {"pinch": True}, TWO_UP: {"two_up": True}, NONE: {}}
+    recordings = []
+    for label, kind in kinds.items():
+        hands = [_jitter(make_hand(rng.uniform(0.2, 0.8), rng.uniform(0.4, 0.8), **kind), rng)
+                 for _ in range(40)]
+        recordings.append((_recording(tmp_path / f"{label}.jsonl", hands), label))
+    return train(recordings, k=3)
+
+
+def test_knn_predicts_trained_labels(knn, make_hand):
+    rng = np.random.default_rng(2)
+    assert len(knn.samples) == 120
+    for _ in range(10):
+        x, y = rng.uniform(0.2, 0.8), rng.uniform(0.4, 0.8)
+        assert knn.predict(_jitter(make_hand(x, y, pinch=True), rng)) == PINCH
+        assert knn.predict(_jitter(make_hand(x, y, two_up=True), rng)) == TWO_UP
+        assert knn.predict(_jitter(make_hand(x, y), rng)) == NONE
+
+
+def test_knn_save_and_load(knn, tmp_path, monkeypatch, make_hand):
+    path = str(tmp_path / "gestos.npz")
+    knn.save(path)
+    monkeypatch.setenv("JARVIS_GESTURE_MODEL", path)
+    loaded = load_classifier()
+    assert isinstance(loaded, KNNClassifier) and loaded.k == knn.k
+    hand = make_hand(0.5, 0.6, two_up=True)
+    assert loaded.predict(hand) == knn.predict(hand) == TWO_UP
+
+
+def test_load_classifier_falls_back_to_thresholds(tmp_path, monkeypatch):
+    monkeypatch.delenv("JARVIS_GESTURE_MODEL", raising=False)
+    assert isinstance(load_classifier(), ThresholdClassifier)
+    assert isinstance(load_classifier(str(tmp_path / "nao_existe.npz")), ThresholdClassifier)
+
+
+def _euro_reference(samples, min_cutoff=1.0, beta=10.0, d_cutoff=2.0):
+    """One-Euro escalar, direto das fórmulas (velocidade das amostras cruas)"""
+    def alpha(cutoff, dt):
+        c = 2 * np.pi * cutoff * dt
+        return c / (c + 1)
+
+    out, (t0, x0), v = [], samples[0], 0.0
+    position = x0
+    for t, x in samples[1:]:
+        dt = t - t0
+        v += alpha(d_cutoff, dt) * ((x - x0) / dt - v)
+        position += alpha(min_cutoff + beta * abs(v), dt) * (x - position)
+        out.append((position, v))
+        t0, x0 = t, x
+    return out
+
+
+def test_one_euro_matches_scalar_reference(make_hand):
+    rng = np.random.default_rng(3)
+    times = np.cumsum(rng.uniform(0.025, 0.045, 60))
+    hands = [_jitter(make_hand(0.3 + 0.4 * t / times[-1], 0.6), rng, 0.005) for t in times]
+    euro = OneEuroFilter()
+    results = [tuple(a.copy() for a in euro.update(t, hand)) for t, hand in zip(times, hands)]
+    for point, axis in ((0, 0), (8, 1), (17, 2)):
+        expected = _euro_reference([(t, float(h[point, axis])) for t, h in zip(times, hands)])
+        for (position, velocity), (ref_position, ref_velocity) in zip(results[1:], expected):
+            assert position[point, axis] == pytest.approx(ref_position, abs=1e-5)
+            assert velocity[point, axis] == pytest.approx(ref_velocity, abs=1e-4)
+
+
+def test_one_euro_smooths_jitter_and_tracks_motion(make_hand):
+    rng = np.random.default_rng(4)
+    euro = OneEuroFilter()
+    base = make_hand(0.5, 0.6)
+    still = []
+    for i in range(60):
+        position, _ = euro.update(i / 30, _jitter(base, rng, 0.005))
+        still.append(position[0, 0])
+    assert np.std(still[10:]) < 0.005 / 3
+
+    for i in range(60, 90):  # 0.5 unidades/s para a direita
+        position, velocity = euro.update(i / 30, base + np.float32([0.5 * (i - 59) / 30, 0, 0]))
+    assert velocity[0, 0] == pytest.approx(0.5, rel=0.05)
+    assert position[0, 0] == pytest.approx(base[0, 0] + 0.5, abs=0.02)  # atraso pequeno em movimento
+
+
+def test_one_euro_resets_after_gap_and_can_skip_position(make_hand):
+    euro = OneEuroFilter()
+    euro.update(0.0, make_hand(0.2, 0.6))
+    euro.update(0.033, make_hand(0.21, 0.6))
+    far = make_hand(0.8, 0.3)
+    position, velocity = euro.update(0.033 + EURO_RESET_GAP + 0.1, far)
+    np.testing.assert_array_equal(position, far)
+    assert not velocity.any()
+
+    smooth, raw_only = OneEuroFilter(), OneEuroFilter(smooth_position=False)
+    for i in range(10):
+        hand = make_hand(0.2 + 0.01 * i, 0.6)
+        _, v_smooth = smooth.update(i / 30, hand)
+        position, v_raw = raw_only.update(i / 30, hand)
+        np.testing.assert_array_equal(position, hand)
+    np.testing.assert_allclose(v_raw, v_smooth)
@@ -0,0 +1,84 @@
+import json
+
+import numpy as np
+import pytest
+
+from latency import LatencyHistogram, LatencyTracker, Trace
+
+
+def test_empty_histogram():
+    histogram = LatencyHistogram()
+    assert histogram.percentile(99) == 0.0
+    assert histogram.summary()["n"] == 0
+
+
+def test_small_values_are_exact():
+    histogram = LatencyHistogram()
+    for us in range(1, 101):
+        histogram.record(us / 1e6)
+    assert histogram.percentile(50) == pytest.approx(50e-6)
+    assert histogram.percentile(99) == pytest.approx(99e-6)
+    assert histogram.percentile(100) == pytest.approx(100e-6)
+
+
+@pytest.mark.parametrize("p", [50, 90, 95, 99, 99.9])
+def test_percentiles_within_one_percent(p):
+    rng = np.random.default_rng(0)
+    samples = rng.lognormal(mean=np.log(0.05), sigma=1.0, size=20000)  # ~50 ms, cauda longa
+    histogram = LatencyHistogram()
+    for s in samples:
+        histogram.record(s)
+    # Percentil exato no mesmo critério (posto ⌈p·n⌉), em microssegundos inteiros
+    exact = np.sort((samples * 1e6).astype(np.int64))[int(np.ceil(p / 100 * len(samples))) - 1] / 1e6
+    assert histogram.percentile(p) == pytest.approx(exact, rel=0.01)
+
+
+def test_percentile_never_exceeds_max_and_saturates():
+    histogram = LatencyHistogram(max_value_us=1_000_000)
+    histogram.record(0.123456)
+    assert histogram.percentile(100) == pytest.approx(0.123456)
+    histogram.record(50.0)  # acima do máximo: saturado
+    assert histogram.max == 1_000_000
+    assert histogram.percentile(100) == pytest.approx(1.0, rel=0.01)
+
+
+def test_summary_in_milliseconds():
+    histogram = LatencyHistogram()
+    for s in (0.010, 0.020, 0.030):
+        histogram.record(s)
+    summary = histogram.summary()
+    assert summary["n"] == 3
+    assert summary["p50"] == pytest.approx(20.0, rel=0.01)
+    assert summary["max"] == pytest.approx(30.0, rel=0.01)
+    assert summary["média"] == pytest.approx(20.0, rel=0.01)
+
+
+def test_trace_intervals_follow_stage_order():
+    trace = Trace(callback=1.0, hotword=1.1)
+    trace.mark("asr", 1.5)
+    trace.mark("fila", 1.02)
+    intervals = [(a, b, round(s, 6)) for a, b, s in trace.intervals()]
+    assert intervals == [("callback", "fila", 0.02), ("fila", "hotword", 0.08), ("hotword", "asr", 0.4)]
+    assert trace.total() == pytest.approx(0.5)
+
+
+def test_tracker_dump(tmp_path):
+    tracker = LatencyTracker(interval=0, path=str(tmp_path / "latency.json"))
+    tracker.finish(Trace(callback=0.0, hotword=0.01, handler=0.2), "hora")
+    tracker.finish(Trace(callback=0.0, hotword=0.01), None)
+    summary = tracker.dump()
+    with open(tmp_path / "latency.json") as f:
+        assert json.load(f) == summary
+    assert summary["estágios"]["total"]["n"] == 2
+    assert set(summary["comandos"]) == {"hora", "(nenhum)"}
+
+
+def test_rejected_command_still_finishes_trace():
+    jarvis_final = pytest.importorskip("jarvis_final")
+    jarvis = jarvis_final.JarvisFinal.headless()
+    jarvis.latency = LatencyTracker(interval=0)
+    jarvis.executor.submit = lambda *args, **kwargs: None  # fila cheia
+    jarvis._execute_command("hora", Trace(callback=0.0, hotword=0.01, match=0.3))
+    summary = jarvis.latency.summary()
+    assert summary["comandos"]["hora"]["n"] == 1
+    assert summary["estágios"]["total"]["n"] == 1
@@ -0,0 +1,33 @@
+from speculative import StableHypothesis, ambiguous_prefixes
+
+
+def test_ambiguous_prefixes_need_whole_words():
+    phrases = ["ligar", "ligar aura", "liga", "hora", "horário"]
+    assert ambiguous_prefixes(phrases) == {"ligar"}
+
+
+def test_confirms_after_hold():
+    spec = StableHypothesis(hold_samples=3200)
+    assert spec.update("hora", 1000) is None
+    assert spec.update("hora", 3000) is None
+    assert spec.update("hora", 4200) == "hora"
+    assert spec.update("data", 5000) == "hora"  # confirmado não muda mais
+
+
+def test_changing_or_missing_hypothesis_restarts_hold():
+    spec = StableHypothesis(hold_samples=3200)
+    spec.update("hora", 0)
+    spec.update("data", 3000)
+    assert spec.update("data", 5000) is None
+    spec.update(None, 6000)
+    assert spec.update("data", 7000) is None
+    assert spec.update("data", 10200) == "data"
+
+
+def test_excluded_commands_are_never_confirmed():
+    spec = StableHypothesis(hold_samples=100, excluded={"ligar"})
+    for position in range(0, 1000, 100):
+        assert spec.update("ligar", position) is None
+    spec.reset()
+    spec.update("hora", 0)
+    assert spec.update("hora", 100) == "hora"
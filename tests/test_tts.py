@@ -0,0 +1,82 @@
+import os
+
+import numpy as np
+import pytest
+
+from tts import SEGMENT_GAP, PhraseCache, TextToSpeech, TTSEngine
+
+RATE = 8000
+
+
+class FakeEngine(TTSEngine):
+    """Cada frase vira len(texto) amostras com o valor do primeiro caractere"""
+
+    name = "falso"
+
+    def __init__(self):
+        self.calls = []
+
+    def synthesize(self, text):
+        self.calls.append(text)
+        return np.full(len(text), ord(text[0]), dtype=np.int16), RATE
+
+
+@pytest.fixture
+def tts(tmp_path):
+    return TextToSpeech(FakeEngine(), PhraseCache(str(tmp_path), max_items=2))
+
+
+def _wavs(tmp_path):
+    return sorted(name for name in os.listdir(tmp_path) if name.endswith(".wav"))
+
+
+def test_memory_lru_evicts_least_recently_used(tmp_path):
+    cache = PhraseCache(str(tmp_path), max_items=2)
+    audio = (np.zeros(4, dtype=np.int16), RATE)
+    cache.put("a", audio, persist=False)
+    cache.put("b", audio, persist=False)
+    assert cache.get("a") is not None  # "a" passa a ser o mais recente
+    cache.put("c", audio, persist=False)
+    assert not cache.contains("b")
+    assert cache.contains("a") and cache.contains("c")
+
+
+def test_persist_false_writes_nothing(tts, tmp_path):
+    tts.render("três e vinte", persist=False)
+    tts.prerender(["três e vinte e um"], persist=False)
+    assert _wavs(tmp_path) == []
+    tts.render("bom dia")
+    assert _wavs(tmp_path) == [f"{tts.digest('bom dia')}.wav"]
+
+
+def test_disk_serves_after_memory_eviction(tts):
+    first, _ = tts.render("bom dia")
+    tts.render("boa tarde")
+    tts.render("boa noite")  # "bom dia" sai da memória, mas está em disco
+    again, rate = tts.render("bom dia")
+    np.testing.assert_array_equal(again, first)
+    assert rate == RATE
+    assert tts.engine.calls.count("bom dia") == 1
+
+
+def test_render_best_concatenates_cached_segments(tts):
+    tts.prerender(["são", "dez horas"])
+    tts.engine.calls.clear()
+    pcm, rate = tts.render_best("são dez horas", ["são", "dez horas"])
+    gap = int(SEGMENT_GAP * RATE)
+    assert tts.engine.calls == []
+    assert len(pcm) == len("são") + gap + len("dez horas")
+    assert (pcm[:3] == ord("s")).all()
+    assert not pcm[3:3 + gap].any()
+    assert (pcm[3 + gap:] == ord("d")).all()
+
+
+def test_render_best_prefers_whole_phrase_and_synthesizes_when_segments_missing(tts):
+    pcm, _ = tts.render_best("são dez horas", ["são", "dez horas"])
+    assert tts.engine.calls == ["são dez horas"]  # segmentos fora do cache: frase inteira
+    assert len(pcm) == len("são dez horas")
+    tts.prerender(["são", "dez horas"])
+    tts.engine.calls.clear()
+    again, _ = tts.render_best("são dez horas", ["são", "dez horas"])
+    np.testing.assert_array_equal(again, pcm)  # frase inteira em cache tem prioridade
+    assert tts.engine.calls == []
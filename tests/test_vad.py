@@ -0,0 +1,72 @@
+import numpy as np
+
+from vad import VoiceActivityEndpointer
+
+RATE = 16000
+FRAME = 320  # 20 ms
+
+
+def _tone(amplitude=0.1, freq=200.0):
+    t = np.arange(FRAME) / RATE
+    return (amplitude * np.sin(2 * np.pi * freq * t)).astype(np.float32)
+
+
+def _silence():
+    return np.zeros(FRAME, dtype=np.float32)
+
+
+def _run(vad, frames):
+    """Índice (1-based) do frame em que o endpointer sinalizou o fim, ou None"""
+    for i, frame in enumerate(frames, 1):
+        if vad.process(frame):
+            return i
+    return None
+
+
+def test_end_fires_after_hangover_of_silence():
+    vad = VoiceActivityEndpointer(sample_rate=RATE, hangover_ms=300)
+    frames = [_tone()] * 25 + [_silence()] * 50
+    assert _run(vad, frames) == 25 + 15  # 300 ms / 20 ms
+    assert vad.speech_end == 25 * FRAME
+
+
+def test_pause_shorter_than_hangover_does_not_end_command():
+    vad = VoiceActivityEndpointer(sample_rate=RATE, hangover_ms=300)
+    frames = [_tone()] * 10 + [_silence()] * 10 + [_tone()] * 10 + [_silence()] * 20
+    assert _run(vad, frames) == 30 + 15
+    assert vad.speech_end == 30 * FRAME
+
+
+def test_int16_frames_are_accepted():
+    vad = VoiceActivityEndpointer(sample_rate=RATE, hangover_ms=100)
+    speech = (_tone() * 32767).astype(np.int16)
+    frames = [speech] * 5 + [np.zeros(FRAME, dtype=np.int16)] * 10
+    assert _run(vad, frames) == 5 + 5
+
+
+def test_blip_shorter_than_min_speech_waits_for_start_timeout():
+    vad = VoiceActivityEndpointer(sample_rate=RATE, min_speech_ms=60, start_timeout=1.0)
+    frames = [_tone()] * 2 + [_silence()] * 100
+    assert _run(vad, frames) == 50
+    assert not vad.speech_started
+
+
+def test_fricative_counts_as_speech():
+    vad = VoiceActivityEndpointer(sample_rate=RATE)
+    rng = np.random.default_rng(0)
+    hiss = rng.uniform(-0.01, 0.01, FRAME).astype(np.float32)  # RMS ≈ 0.006, ZCR alta
+    assert not vad.is_speech(_tone(amplitude=0.008))
+    assert vad.is_speech(hiss)
+
+
+def test_max_length_caps_continuous_speech():
+    vad = VoiceActivityEndpointer(sample_rate=RATE, max_length=1.0)
+    assert _run(vad, [_tone()] * 100) == 50
+
+
+def test_reset_starts_a_new_command():
+    vad = VoiceActivityEndpointer(sample_rate=RATE, hangover_ms=100)
+    _run(vad, [_tone()] * 5 + [_silence()] * 5)
+    vad.reset()
+    assert vad.frames == 0 and not vad.speech_started
+    assert _run(vad, [_tone()] * 5 + [_silence()] * 5) == 10
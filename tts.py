@@ -0,0 +1,272 @@
+#!/usr/bin/env python3
+"""
+Síntese de voz offline com cache de frases.
+
+Engines locais (CPU, sem rede):
+  - espeak  → espeak-ng (pt-br), leve e sempre disponível nas distros
+  - piper   → Piper (voz neural ONNX), mais natural
+
+O áudio sintetizado (PCM int16 mono) fica num cache endereçado por conteúdo:
+LRU em memória + WAVs em disco, com chave sha1(engine + voz + texto). Frases
+estáveis são pré-renderizadas e respostas repetidas tocam na hora.
+
+Configuração (.jarvis_config / variáveis de ambiente):
+  JARVIS_TTS_ENGINE    espeak (padrão) ou piper
+  JARVIS_TTS_VOICE     voz do espeak-ng (padrão: pt-br)
+  JARVIS_PIPER_MODEL   caminho do modelo .onnx do Piper
+  JARVIS_TTS_CACHE     diretório do cache em disco
+"""
+
+import os
+import io
+import json
+import time
+import wave
+import hashlib
+import logging
+import threading
+import subprocess
+from collections import OrderedDict
+from datetime import datetime, timedelta
+from typing import Iterable, List, Optional, Tuple
+import numpy as np
+
+logger = logging.getLogger("TTS")
+
+DEFAULT_CACHE_DIR = os.path.expanduser("~/.cache/jarvis/tts")
+MEMORY_ITEMS      = 256
+SEGMENT_GAP       = 0.08  # s de silêncio entre segmentos concatenados
+
+Audio = Tuple[np.ndarray, int]  # (PCM int16 mono, taxa de amostragem)
+
+
+class TTSEngine:
+    """Interface dos engines de síntese"""
+
+    name = "base"
+
+    def key(self) -> str:
+        """Identifica engine + voz (faz parte da chave do cache)"""
+        return self.name
+
+    def synthesize(self, text: str) -> Audio:
+        raise NotImplementedError
+
+
+class EspeakEngine(TTSEngine):
+    """espeak-ng via linha de comando (WAV no stdout)"""
+
+    name = "espeak"
+
+    def __init__(self, voice: str = "pt-br", speed: int = 165):
+        self.voice = voice
+        self.speed = speed
+
+    def key(self) -> str:
+        return f"{self.name}:{self.voice}:{self.speed}"
+
+    def synthesize(self, text: str) -> Audio:
+        result = subprocess.run(
+            ["espeak-ng", "-v", self.voice, "-s", str(self.speed), "--stdout", text],
+            capture_output=True, check=True
+        )
+        return _read_wav(result.stdout)
+
+
+class PiperEngine(TTSEngine):
+    """Piper (voz neural) via linha de comando (PCM cru no stdout)"""
+
+    name = "piper"
+
+    def __init__(self, model_path: str):
+        self.model_path = model_path
+        with open(model_path + ".json") as f:
+            self.sample_rate = json.load(f)["audio"]["sample_rate"]
+
+    def key(self) -> str:
+        return f"{self.name}:{os.path.basename(self.model_path)}"
+
+    def synthesize(self, text: str) -> Audio:
+        result = subprocess.run(
+            ["piper", "--model", self.model_path, "--output_raw"],
+            input=text.encode("utf-8"), capture_output=True, check=True
+        )
+        return np.frombuffer(result.stdout, dtype=np.int16).copy(), self.sample_rate
+
+
+def _read_wav(data: bytes) -> Audio:
+    with wave.open(io.BytesIO(data), "rb") as w:
+        pcm = np.frombuffer(w.readframes(w.getnframes()), dtype=np.int16)
+        if w.getnchannels() > 1:
+            pcm = pcm.reshape(-1, w.getnchannels())[:, 0]
+        return pcm.copy(), w.getframerate()
+
+
+def _write_wav(path: str, pcm: np.ndarray, sample_rate: int):
+    tmp = path + ".tmp"
+    with wave.open(tmp, "wb") as w:
+        w.setnchannels(1)
+        w.setsampwidth(2)
+        w.setframerate(sample_rate)
+        w.writeframes(pcm.astype(np.int16).tobytes())
+    os.replace(tmp, path)
+
+
+class PhraseCache:
+    """Cache endereçado por conteúdo: LRU em memória + WAVs em disco"""
+
+    def __init__(self, directory: str = DEFAULT_CACHE_DIR, max_items: int = MEMORY_ITEMS):
+        self.directory = directory
+        self.max_items = max_items
+        self._memory: "OrderedDict[str, Audio]" = OrderedDict()
+        self._lock = threading.Lock()
+        os.makedirs(directory, exist_ok=True)
+
+    @staticmethod
+    def digest(engine_key: str, text: str) -> str:
+        return hashlib.sha1(f"{engine_key}\n{text}".encode("utf-8")).hexdigest()
+
+    def _path(self, digest: str) -> str:
+        return os.path.join(self.directory, f"{digest}.wav")
+
+    def get(self, digest: str) -> Optional[Audio]:
+        with self._lock:
+            audio = self._memory.get(digest)
+            if audio is not None:
+                self._memory.move_to_end(digest)
+                return audio
+        path = self._path(digest)
+        if os.path.exists(path):
+            with open(path, "rb") as f:
+                audio = _read_wav(f.read())
+            self._remember(digest, audio)
+            return audio
+        return None
+
+    def contains(self, digest: str) -> bool:
+        return digest in self._memory or os.path.exists(self._path(digest))
+
+    def put(self, digest: str, audio: Audio, persist: bool = True):
+        """Guarda na memória e, com persist, também em disco (o disco não tem despejo)"""
+        self._remember(digest, audio)
+        if not persist:
+            return
+        try:
+            _write_wav(self._path(digest), *audio)
+        except OSError as e:
+            logger.warning(f"⚠️  Não foi possível gravar o cache de voz: {e}")
+
+    def _remember(self, digest: str, audio: Audio):
+        with self._lock:
+            self._memory[digest] = audio
+            self._memory.move_to_end(digest)
+            while len(self._memory) > self.max_items:
+                self._memory.popitem(last=False)
+
+
+class TextToSpeech:
+    """Fachada: sintetiza com o engine configurado e reaproveita o cache"""
+
+    def __init__(self, engine: TTSEngine, cache: PhraseCache = None):
+        self.engine = engine
+        self.cache = cache or PhraseCache()
+
+    def digest(self, text: str) -> str:
+        return PhraseCache.digest(self.engine.key(), text)
+
+    def is_cached(self, text: str) -> bool:
+        return self.cache.contains(self.digest(text))
+
+    def render(self, text: str, persist: bool = True) -> Audio:
+        """PCM da frase (do cache, ou sintetizado e guardado; persist=False: só em memória)"""
+        digest = self.digest(text)
+        audio = self.cache.get(digest)
+        if audio is None:
+            audio = self.engine.synthesize(text)
+            self.cache.put(digest, audio, persist)
+        return audio
+
+    def render_best(self, text: str, segments: List[str] = None) -> Audio:
+        """Frase inteira se estiver em cache; senão segmentos pré-renderizados; senão sintetiza"""
+        if self.is_cached(text) or not segments:
+            return self.render(text)
+        if all(self.is_cached(s) for s in segments):
+            parts = [self.render(s) for s in segments]
+            sample_rate = parts[0][1]
+            gap = np.zeros(int(SEGMENT_GAP * sample_rate), dtype=np.int16)
+            pcm = np.concatenate([x for p, _ in parts for x in (p, gap)][:-1])
+            return pcm, sample_rate
+        return self.render(text)
+
+    def prerender(self, texts: Iterable[str], persist: bool = True) -> int:
+        """Sintetiza o que ainda não está no cache; retorna quantas frases foram geradas"""
+        generated = 0
+        for text in texts:
+            if not self.is_cached(text):
+                self.render(text, persist)
+                generated += 1
+        return generated
+
+
+def create_tts(engine: str = None) -> TextToSpeech:
+    """Monta o TTS a partir da configuração do ambiente"""
+    engine = (engine or os.getenv("JARVIS_TTS_ENGINE", "espeak")).lower()
+    if engine == "piper":
+        model = os.getenv("JARVIS_PIPER_MODEL", "")
+        if not model:
+            raise ValueError("JARVIS_PIPER_MODEL não configurado")
+        tts_engine = PiperEngine(model)
+    elif engine == "espeak":
+        tts_engine = EspeakEngine(voice=os.getenv("JARVIS_TTS_VOICE", "pt-br"))
+    else:
+        raise ValueError(f"Engine de voz desconhecido: '{engine}' (opções: espeak, piper)")
+    cache = PhraseCache(os.getenv("JARVIS_TTS_CACHE", DEFAULT_CACHE_DIR))
+    return TextToSpeech(tts_engine, cache)
+
+
+class ClockPrerenderer:
+    """Renderiza as respostas do próximo minuto pouco antes do relógio virar
+
+    `phrases_for(datetime)` devolve as frases que dependem do horário; elas
+    vão para o cache `lead` segundos antes do minuto começar, então a resposta
+    já está pronta quando o comando chega. Ficam só no LRU em memória: valem
+    por um minuto e iriam acumular milhares de WAVs por dia no disco.
+    """
+
+    def __init__(self, tts: TextToSpeech, phrases_for, lead: float = 5.0):
+        self.tts = tts
+        self.phrases_for = phrases_for
+        self.lead = lead
+        self._stop = threading.Event()
+        self._thread = None
+
+    def start(self):
+        self._thread = threading.Thread(target=self._run, name="jarvis-tts-clock", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+
+    def _render(self, when):
+        try:
+            t0 = time.perf_counter()
+            generated = self.tts.prerender(self.phrases_for(when), persist=False)
+            if generated:
+                logger.debug(f"🕐 {generated} frases de {when:%H:%M} pré-renderizadas "
+                             f"em {(time.perf_counter() - t0) * 1000:.0f} ms")
+        except Exception as e:
+            logger.warning(f"⚠️  Erro ao pré-renderizar {when:%H:%M}: {e}")
+
+    def _run(self):
+        self._render(datetime.now())
+        while not self._stop.is_set():
+            now = datetime.now()
+            next_minute = now.replace(second=0, microsecond=0) + timedelta(minutes=1)
+            wait = (next_minute - now).total_seconds() - self.lead
+            if wait > 0 and self._stop.wait(wait):
+                break
+            self._render(next_minute)
+            # Garante que o próximo ciclo mire o minuto seguinte
+            remaining = (next_minute - datetime.now()).total_seconds()
+            if remaining > 0 and self._stop.wait(remaining):
+                break
@@ -0,0 +1,85 @@
+#!/usr/bin/env python3
+"""
+Endpointer de atividade de voz (VAD) por energia + taxa de cruzamento por zero.
+
+Classifica frames curtos (20 ms) como fala ou silêncio e sinaliza o fim do
+comando quando o silêncio dura mais que o hangover configurado, permitindo
+que a transcrição comece ~300 ms depois que o usuário para de falar.
+
+Regras por frame (estilo Rabiner/Sambur):
+  - Vozeado   → RMS acima do limiar
+  - Fricativa → RMS acima de metade do limiar e ZCR alta ("s", "ch", "f")
+O limiar acompanha o piso de ruído medido nos frames de silêncio.
+"""
+
+import numpy as np
+
+
+class VoiceActivityEndpointer:
+    """Detecta início e fim de fala em um stream de frames de áudio"""
+
+    def __init__(self, sample_rate: int = 16000,
+                 frame_ms: int = 20,
+                 energy_threshold: float = 0.01,
+                 zcr_threshold: float = 0.25,
+                 hangover_ms: int = 300,
+                 min_speech_ms: int = 60,
+                 start_timeout: float = 2.0,
+                 max_length: float = 5.0):
+        self.sample_rate      = sample_rate
+        self.frame_size       = int(sample_rate * frame_ms / 1000)
+        self.energy_threshold = energy_threshold
+        self.zcr_threshold    = zcr_threshold
+        self.hangover_frames  = max(1, hangover_ms // frame_ms)
+        self.min_speech_frames = max(1, min_speech_ms // frame_ms)
+        self.start_timeout_frames = int(start_timeout * 1000 / frame_ms)
+        self.max_frames       = int(max_length * 1000 / frame_ms)
+        self.reset()
+
+    def reset(self):
+        """Prepara o endpointer para um novo comando"""
+        self.noise_floor    = self.energy_threshold / 3
+        self.frames         = 0
+        self.speech_frames  = 0
+        self.silence_run    = 0
+        self.speech_started = False
+        self.speech_end     = 0  # amostras desde o início até o último frame de fala
+
+    def _features(self, frame: np.ndarray):
+        if np.issubdtype(frame.dtype, np.integer):
+            frame = frame.astype(np.float32) / 32768.0
+        rms = float(np.sqrt(np.mean(np.square(frame, dtype=np.float32))))
+        signs = np.signbit(frame)
+        zcr = float(np.count_nonzero(signs[1:] != signs[:-1])) / max(1, len(frame) - 1)
+        return rms, zcr
+
+    def is_speech(self, frame: np.ndarray) -> bool:
+        """Classifica um único frame como fala ou silêncio"""
+        rms, zcr = self._features(frame)
+        threshold = max(self.energy_threshold, self.noise_floor * 3)
+        speech = rms >= threshold or (rms >= threshold * 0.5 and zcr >= self.zcr_threshold)
+        if not speech:
+            # Piso de ruído segue o silêncio lentamente
+            self.noise_floor = 0.95 * self.noise_floor + 0.05 * rms
+        return speech
+
+    def process(self, frame: np.ndarray) -> bool:
+        """Consome um frame; retorna True quando o comando terminou"""
+        self.frames += 1
+
+        if self.is_speech(frame):
+            self.speech_frames += 1
+            self.silence_run = 0
+            if self.speech_frames >= self.min_speech_frames:
+                self.speech_started = True
+            self.speech_end = self.frames * self.frame_size
+        else:
+            self.silence_run += 1
+            if not self.speech_started:
+                self.speech_frames = 0
+
+        if self.frames >= self.max_frames:
+            return True
+        if not self.speech_started:
+            return self.frames >= self.start_timeout_frames
+        return self.silence_run >= self.hangover_frames